@@ -1,5 +1,5 @@
 """
-logging.py - アプリケーション分析・説明ユーティリティモジュール
+app_analyzer.py - アプリケーション分析・説明ユーティリティモジュール
 
 このモジュールは、READMEファイルと全プロジェクトファイルを読み取り、
 アプリケーションの性質と機能を詳細に説明する機能を提供します。
@@ -166,7 +166,7 @@ class ApplicationAnalyzer:
             "data_exporter.py": "データ出力・CSV書き出し",
             "address_splitter.py": "住所分割処理",
             "utils.py": "共通ユーティリティ関数",
-            "logging.py": "アプリケーション分析・ログ機能"
+            "app_analyzer.py": "アプリケーション分析・説明機能"
         }
         
         return purposes.get(filename, "用途不明")
@@ -0,0 +1,179 @@
+"""
+支店別一括処理モジュール
+
+複数支店の案件取込用レポートを支店ごとのワーカープロセスで並列に変換する。
+ContractListの引継番号は一度だけ読み込み、各ワーカーで読み取り専用で共有する。
+"""
+import os
+import time
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, FrozenSet, List, Optional
+from data_loader import DataLoader
+from data_validator import DataValidator
+from data_transformer import DataTransformer
+from data_exporter import DataExporter
+from encoding_check import apply_unencodable_policy
+from error_sink import ErrorSink, capture_errors
+from event_log import get_event_log
+
+
+# ワーカープロセスで共有するContractListの引継番号
+_contract_keys: FrozenSet[str] = frozenset()
+
+
+def _init_worker(contract_keys: FrozenSet[str]):
+    """ワーカープロセスの初期化（引継番号の集合を受け取る）"""
+    global _contract_keys
+    _contract_keys = contract_keys
+
+
+def process_branch(branch: str, report_path: str, output_dir: str,
+                   encoding: str = "cp932", skip_report: bool = False,
+                   contract_keys: Optional[FrozenSet[str]] = None,
+                   transformer: Optional[DataTransformer] = None) -> Dict[str, Any]:
+    """
+    1支店分のレポートを変換して出力
+    
+    Args:
+        branch: 支店名
+        report_path: 案件取込用レポートのパス
+        output_dir: 支店別の出力ディレクトリ
+        encoding: 入出力のエンコーディング
+        skip_report: 処理レポートの生成をスキップする場合True
+        contract_keys: ContractListの引継番号（Noneの場合はワーカーの共有値）
+        transformer: 再利用する変換器（Noneの場合は新規作成）
+    
+    Returns:
+        支店ごとの処理結果
+    """
+    start_time = time.perf_counter()
+    result = {
+        "branch": branch,
+        "report_path": report_path,
+        "output_path": None,
+        "original_count": 0,
+        "duplicate_count": 0,
+        "excluded_count": 0,
+        "output_count": 0,
+        "error": None
+    }
+    
+    # エラーは支店ごとの出力ディレクトリのJSON Linesファイルに逐次書き込む
+    error_log_path = None
+    if not skip_report:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        error_log_path = os.path.join(output_dir, f"error_log_{timestamp}.jsonl")
+    error_sink = ErrorSink(error_log_path)
+    
+    try:
+        with capture_errors(error_sink):
+            print(f"[{branch}] 処理開始: {os.path.basename(report_path)}")
+            # レコード単位の詳細の表示件数は1件のレポートごとに数える
+            get_event_log().reset()
+            report_df = DataLoader(encoding=encoding).load_csv(report_path)
+            
+            validator = DataValidator()
+            validated_df, validation_summary = validator.validate_all(
+                report_df, _contract_keys if contract_keys is None else contract_keys
+            )
+            result["original_count"] = validation_summary["original_count"]
+            result["duplicate_count"] = validation_summary["duplicate_count"]
+            result["excluded_count"] = validation_summary["excluded_count"]
+            
+            if len(validated_df) > 0:
+                output_df = (transformer or DataTransformer()).transform_dataframe(validated_df)
+                output_df, _ = apply_unencodable_policy(output_df, encoding=encoding)
+                
+                exporter = DataExporter(encoding=encoding)
+                result["output_path"] = exporter.export_to_csv(output_df, output_dir=output_dir)
+                result["output_count"] = len(output_df)
+                
+                if not skip_report:
+                    exporter.export_error_log(error_sink)
+                    exporter.create_summary_report(output_df, validation_summary, output_dir=output_dir)
+            else:
+                print(f"[{branch}] 有効なレコードがありません。")
+    
+    except Exception as e:
+        result["error"] = str(e)
+    finally:
+        error_sink.close()
+    
+    result["elapsed_seconds"] = time.perf_counter() - start_time
+    print(f"[{branch}] 処理終了: {result['elapsed_seconds']:.1f}秒")
+    return result
+
+
+def run_batch(patterns: List[str],
+              downloads_dir: str,
+              output_dir: str,
+              contract_list_path: Optional[str] = None,
+              contract_list_glob: Optional[str] = None,
+              encoding: str = "cp932",
+              skip_report: bool = False,
+              max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    支店別レポートを検出し、支店ごとに並列で変換
+    
+    Args:
+        patterns: 支店別レポートのファイル名パターンのリスト
+        downloads_dir: ダウンロードディレクトリ
+        output_dir: 出力ディレクトリ（支店ごとにサブディレクトリを作成）
+        contract_list_path: ContractListのパス（Noneの場合は自動検索）
+        contract_list_glob: 指定した場合は一致するすべてのContractListを使用
+        encoding: 入出力のエンコーディング
+        skip_report: 支店別の処理レポートの生成をスキップする場合True
+        max_workers: ワーカープロセス数（Noneの場合は支店数とCPU数の小さい方）
+    
+    Returns:
+        支店ごとの処理結果のリスト
+    """
+    loader = DataLoader(encoding=encoding)
+    
+    branch_reports = loader.find_branch_reports(patterns, downloads_dir)
+    if not branch_reports:
+        raise FileNotFoundError(
+            f"支店別の案件取込用レポートが見つかりません。{downloads_dir}に配置してください。"
+        )
+    print(f"支店別レポートを{len(branch_reports)}件検出しました")
+    for branch, path in branch_reports.items():
+        print(f"  - {branch}: {os.path.basename(path)}")
+    
+    # ContractListの引継番号は一度だけ読み込んで全支店で共有
+    if contract_list_glob is not None:
+        contract_list_paths = loader.find_contract_lists(contract_list_glob, downloads_dir)
+    else:
+        if contract_list_path is None:
+            contract_list_path = loader.find_latest_file("ContractList_*.csv", downloads_dir)
+            if contract_list_path is None:
+                raise FileNotFoundError(
+                    f"ContractListが見つかりません。{downloads_dir}に配置してください。"
+                )
+        contract_list_paths = [contract_list_path]
+    contract_keys = frozenset(loader.load_contract_keys(contract_list_paths))
+    print(f"ContractList引継番号（重複除去後）: {len(contract_keys)}件")
+    
+    if max_workers is None:
+        max_workers = min(len(branch_reports), os.cpu_count() or 1)
+    
+    results = []
+    with ProcessPoolExecutor(max_workers=max_workers,
+                             initializer=_init_worker,
+                             initargs=(contract_keys,)) as executor:
+        futures = [
+            executor.submit(
+                process_branch,
+                branch,
+                path,
+                os.path.join(output_dir, branch),
+                encoding,
+                skip_report
+            )
+            for branch, path in branch_reports.items()
+        ]
+        for future in as_completed(futures):
+            results.append(future.result())
+    
+    results.sort(key=lambda r: r["branch"])
+    return results
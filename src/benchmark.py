@@ -0,0 +1,317 @@
+"""
+ベンチマークモジュール
+
+合成データ（synthetic_data.py）を使用して、指定サイズごとに各ステップと全体の
+処理時間を計測し、結果を履歴ファイル（JSON）に追記する。
+基準となる過去の計測結果より閾値を超えて遅くなったステップを性能劣化として報告する。
+
+使用例:
+    python src/benchmark.py --rows 1000 --rows 10000
+    python src/benchmark.py --rows 100000 --baseline   # 今回の結果を基準として記録
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import pandas as pd
+from data_loader import DataLoader
+from data_validator import DataValidator
+from data_transformer import DataTransformer
+from data_exporter import DataExporter
+from error_sink import ErrorSink, capture_errors
+from metrics import MetricsRecorder
+from synthetic_data import generate_dataset
+
+
+# 計測するステップ（MetricsRecorderのステップ識別子）
+BENCHMARK_STAGES = ["load", "validate", "transform", "export", "report"]
+
+# 基準からの劣化とみなす処理時間の増加率（0.2 = 20%）
+DEFAULT_REGRESSION_THRESHOLD = 0.2
+
+# これより短い処理時間は誤差が大きいため劣化判定の対象外（秒）
+MIN_COMPARABLE_SECONDS = 0.05
+
+# 履歴ファイルのデフォルトパス
+DEFAULT_HISTORY_FILE = "benchmark_history.json"
+
+
+def run_pipeline_once(report_path: str, contract_list_path: str,
+                      output_dir: str, encoding: str = "cp932") -> Dict[str, Any]:
+    """
+    通常実行と同じ手順で1回処理し、ステップごとの処理時間を計測
+    
+    Args:
+        report_path: 案件取込用レポートのパス
+        contract_list_path: ContractListのパス
+        output_dir: 出力ディレクトリ
+        encoding: 文字エンコーディング
+    
+    Returns:
+        {"stages": {ステップ識別子: 秒}, "total_seconds": 秒, "output_count": 件数}
+    """
+    metrics = MetricsRecorder()
+    seconds = {}
+    # エラーは処理中に逐次書き込むため、書き込み時間は検証・変換の各ステップに含まれる
+    error_sink = ErrorSink(os.path.join(
+        output_dir, f"error_log_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+    ))
+    
+    # 各処理の標準出力は計測結果の表示の妨げになるため破棄
+    with contextlib.redirect_stdout(io.StringIO()), capture_errors(error_sink):
+        with metrics.stage("load", key="load"):
+            loader = DataLoader(encoding=encoding)
+            report_df, contract_list_df = loader.load_input_files(
+                report_path=report_path,
+                contract_list_path=contract_list_path
+            )
+        
+        with metrics.stage("validate", key="validate"):
+            validated_df, validation_summary = DataValidator().validate_all(report_df, contract_list_df)
+        
+        # ContractListは合成レポートの契約番号に0を付与して作成しているため、必ず重複が検出される
+        # （検出されない場合は引継番号の先頭の0が失われており、計測結果も実運用と異なる）
+        if len(contract_list_df) and not validation_summary["duplicate_count"]:
+            raise RuntimeError("合成データのContractListとの重複が検出されませんでした（引継番号の読み込みを確認してください）")
+        
+        with metrics.stage("transform", key="transform"):
+            output_df = DataTransformer().transform_dataframe(validated_df)
+        
+        with metrics.stage("export", key="export"):
+            exporter = DataExporter(encoding=encoding)
+            exporter.export_to_csv(output_df, output_dir=output_dir)
+        
+        with metrics.stage("report", key="report"):
+            exporter.export_error_log(error_sink)
+            exporter.create_summary_report(output_df, validation_summary, output_dir=output_dir)
+    error_sink.close()
+    
+    for record in metrics.stages:
+        seconds[record["name"]] = record["wall_seconds"]
+    
+    return {
+        "stages": seconds,
+        "total_seconds": sum(seconds.values()),
+        "output_count": len(output_df)
+    }
+
+
+def benchmark_size(rows: int, data_dir: str, repeat: int = 1,
+                   seed: int = 0, encoding: str = "cp932") -> Dict[str, Any]:
+    """
+    1つのサイズについて計測（複数回実行した場合はステップごとの最小値を採用）
+    
+    Args:
+        rows: レポートの行数
+        data_dir: 合成データの保存ディレクトリ
+        repeat: 実行回数
+        seed: 合成データの乱数シード
+        encoding: 文字エンコーディング
+    
+    Returns:
+        計測結果
+    """
+    report_path, contract_list_path = generate_dataset(data_dir, rows, seed, encoding=encoding)
+    
+    runs = []
+    for _ in range(repeat):
+        output_dir = tempfile.mkdtemp(prefix="ark_benchmark_")
+        try:
+            runs.append(run_pipeline_once(report_path, contract_list_path, output_dir, encoding))
+        finally:
+            shutil.rmtree(output_dir, ignore_errors=True)
+    
+    stages = {stage: min(run["stages"][stage] for run in runs) for stage in BENCHMARK_STAGES}
+    total_seconds = min(run["total_seconds"] for run in runs)
+    return {
+        "rows": rows,
+        "repeat": repeat,
+        "stages": stages,
+        "total_seconds": total_seconds,
+        "rows_per_second": rows / total_seconds if total_seconds > 0 else None,
+        "output_count": runs[0]["output_count"]
+    }
+
+
+def load_history(history_path: str) -> List[Dict[str, Any]]:
+    """履歴ファイルを読み込む（存在しない場合は空のリスト）"""
+    if not os.path.exists(history_path):
+        return []
+    with open(history_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_history(history_path: str, history: List[Dict[str, Any]]):
+    """履歴ファイルを保存（書き込み途中で中断しても既存の履歴を壊さない）"""
+    os.makedirs(os.path.dirname(history_path) or ".", exist_ok=True)
+    temp_path = history_path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(history, f, ensure_ascii=False, indent=2)
+    os.replace(temp_path, history_path)
+
+
+def find_baseline(history: List[Dict[str, Any]], rows: int) -> Optional[Dict[str, Any]]:
+    """
+    指定サイズの比較基準を取得（基準として記録した最新の結果、なければ直近の結果）
+    
+    Args:
+        history: 履歴
+        rows: レポートの行数
+    
+    Returns:
+        比較基準の計測結果（該当がない場合はNone）
+    """
+    candidates = [entry for entry in history if str(rows) in entry["results"]]
+    marked = [entry for entry in candidates if entry.get("baseline")]
+    if marked:
+        return marked[-1]["results"][str(rows)]
+    if candidates:
+        return candidates[-1]["results"][str(rows)]
+    return None
+
+
+def find_regressions(result: Dict[str, Any], baseline: Dict[str, Any],
+                     threshold: float) -> List[Dict[str, Any]]:
+    """
+    基準より閾値を超えて遅くなったステップを抽出
+    
+    Args:
+        result: 今回の計測結果
+        baseline: 比較基準の計測結果
+        threshold: 劣化とみなす増加率
+    
+    Returns:
+        劣化したステップのリスト
+    """
+    regressions = []
+    timings = dict(result["stages"], total=result["total_seconds"])
+    baseline_timings = dict(baseline["stages"], total=baseline["total_seconds"])
+    
+    for stage, seconds in timings.items():
+        previous = baseline_timings.get(stage)
+        if previous is None or max(seconds, previous) < MIN_COMPARABLE_SECONDS:
+            continue
+        if seconds > previous * (1 + threshold):
+            regressions.append({
+                "stage": stage,
+                "seconds": seconds,
+                "baseline_seconds": previous,
+                "ratio": seconds / previous if previous > 0 else None
+            })
+    return regressions
+
+
+def print_result(result: Dict[str, Any], baseline: Optional[Dict[str, Any]]):
+    """1サイズ分の計測結果を表示"""
+    print(f"\n【{result['rows']:,}行】（{result['repeat']}回実行の最小値）")
+    timings = dict(result["stages"], total=result["total_seconds"])
+    baseline_timings = dict(baseline["stages"], total=baseline["total_seconds"]) if baseline else {}
+    for stage, seconds in timings.items():
+        line = f"  {stage:<10}{seconds:>10.3f}秒"
+        previous = baseline_timings.get(stage)
+        if previous:
+            line += f"（基準 {previous:.3f}秒、{(seconds / previous - 1) * 100:+.1f}%）"
+        print(line)
+    if result["rows_per_second"]:
+        print(f"  スループット: {result['rows_per_second']:,.0f}件/秒")
+
+
+def run_benchmarks(sizes: List[int], data_dir: str,
+                   history_path: str = DEFAULT_HISTORY_FILE,
+                   repeat: int = 1,
+                   threshold: float = DEFAULT_REGRESSION_THRESHOLD,
+                   mark_baseline: bool = False,
+                   label: Optional[str] = None,
+                   seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    指定サイズのベンチマークを実行して履歴に追記
+    
+    Args:
+        sizes: レポートの行数のリスト
+        data_dir: 合成データの保存ディレクトリ
+        history_path: 履歴ファイルのパス
+        repeat: サイズごとの実行回数
+        threshold: 劣化とみなす増加率
+        mark_baseline: Trueの場合は今回の結果を以降の比較基準として記録
+        label: 履歴に記録する任意のラベル（変更内容など）
+        seed: 合成データの乱数シード
+    
+    Returns:
+        性能劣化のリスト（サイズごと）
+    """
+    history = load_history(history_path)
+    entry = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "label": label,
+        "baseline": mark_baseline,
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "threshold": threshold,
+        "results": {}
+    }
+    
+    all_regressions = []
+    for rows in sizes:
+        result = benchmark_size(rows, data_dir, repeat, seed)
+        baseline = find_baseline(history, rows)
+        print_result(result, baseline)
+        
+        if baseline is not None:
+            regressions = find_regressions(result, baseline, threshold)
+            for regression in regressions:
+                print(f"  ※性能劣化: {regression['stage']} "
+                      f"{regression['baseline_seconds']:.3f}秒 → {regression['seconds']:.3f}秒")
+            if regressions:
+                all_regressions.append({"rows": rows, "regressions": regressions})
+        
+        entry["results"][str(rows)] = result
+    
+    entry["regressions"] = all_regressions
+    history.append(entry)
+    save_history(history_path, history)
+    print(f"\n計測結果を履歴に追記しました: {history_path}")
+    return all_regressions
+
+
+def main():
+    """メイン関数 - ベンチマークを実行（性能劣化を検出した場合は終了コード1）"""
+    parser = argparse.ArgumentParser(description="合成データによる処理性能のベンチマーク")
+    parser.add_argument("--rows", help="レポートの行数（複数指定可、例: 1000 10000 100000 1000000）",
+                        type=int, action="append", default=None)
+    parser.add_argument("--data-dir", help="合成データの保存ディレクトリ（生成済みのデータは再利用）",
+                        default="synthetic_data")
+    parser.add_argument("--history", help="履歴ファイルのパス", default=DEFAULT_HISTORY_FILE)
+    parser.add_argument("--repeat", help="サイズごとの実行回数", type=int, default=1)
+    parser.add_argument("--threshold", help="劣化とみなす処理時間の増加率（0.2 = 20%%）",
+                        type=float, default=DEFAULT_REGRESSION_THRESHOLD)
+    parser.add_argument("--baseline", help="今回の結果を以降の比較基準として記録", action="store_true")
+    parser.add_argument("--label", help="履歴に記録するラベル", default=None)
+    parser.add_argument("--seed", help="合成データの乱数シード", type=int, default=0)
+    args = parser.parse_args()
+    
+    regressions = run_benchmarks(
+        sizes=args.rows or [1000, 10000],
+        data_dir=args.data_dir,
+        history_path=args.history,
+        repeat=args.repeat,
+        threshold=args.threshold,
+        mark_baseline=args.baseline,
+        label=args.label,
+        seed=args.seed
+    )
+    if regressions:
+        print("\n性能劣化を検出しました。")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+"""
+バイト列CSV出力モジュール
+
+DataExporterの既定の書き込み方式。csv.writerと同一のバイト列（カンマ区切り、
+必要な場合のみダブルクォートで囲む、改行はCRLF）を出力する。
+
+- 値がすべて同じカラム（固定値・空欄・処理日など）はエンコードを1回のみ行う
+- その他のカラムはカラム単位で文字列化し、同じ値のエンコード結果を再利用する
+- 行はbytearrayにまとめ、指定サイズごとにファイルへ書き込む
+"""
+import itertools
+from typing import BinaryIO, Dict, Iterator, List, Union
+import pandas as pd
+from pandas.api.types import infer_dtype
+from config import DEFAULT_WRITE_BUFFER_SIZE
+
+
+# csv.writer（excel方言）でダブルクォートが必要になる文字
+QUOTE_TRIGGER_CHARS = frozenset(',"\r\n')
+
+# 区切り文字・改行（csv.writerのexcel方言と同一）
+DELIMITER = b","
+LINE_TERMINATOR = b"\r\n"
+
+
+def quote_cell(text: str) -> str:
+    """csv.writer（QUOTE_MINIMAL）と同じ規則で必要な場合のみダブルクォートで囲む"""
+    if QUOTE_TRIGGER_CHARS.isdisjoint(text):
+        return text
+    return '"' + text.replace('"', '""') + '"'
+
+
+def cell_text(value) -> str:
+    """
+    セルの値を出力する文字列に変換（従来の書き込み処理と同一の規則）
+    
+    欠損値・None・空文字は空文字、判定できない値（配列など）も空文字とする。
+    """
+    try:
+        if pd.isna(value) or value is None or value == "":
+            return ""
+        return str(value)
+    except (TypeError, ValueError, AttributeError):
+        return ""
+
+
+def has_single_value(series: pd.Series) -> bool:
+    """
+    カラムの値がすべて同じ文字列になるか
+    
+    1・True・1.0 のように等しいと判定されるが文字列が異なる値が混在する場合はFalseとする。
+    """
+    if series.nunique(dropna=False) > 1:
+        return False
+    if series.dtype != object:
+        return True
+    return not infer_dtype(series, skipna=False).startswith("mixed")
+
+
+def column_texts(df: pd.DataFrame, headers: List[str]) -> List[Union[str, List[str]]]:
+    """
+    ヘッダーのカラム順に、各行のセルの文字列を取得（CSV以外の出力形式と共用）
+    
+    DataFrameにないカラム、およびDataFrame内で名前が重複するカラムは
+    従来の書き込み処理と同様に空欄とする。
+    
+    Args:
+        df: 出力するDataFrame
+        headers: 出力するヘッダー（テンプレートのカラム順、重複を含む）
+    
+    Returns:
+        カラムごとの値。値がすべて同じカラムは文字列1つ、その他は行ごとの文字列のリスト
+    """
+    counts = pd.Series(df.columns).value_counts()
+    positions: Dict[str, int] = {}
+    for position, column in enumerate(df.columns):
+        positions.setdefault(column, position)
+    
+    columns = []
+    for header in headers:
+        position = positions.get(header)
+        if position is None or counts[header] > 1:
+            columns.append("")
+            continue
+        
+        series = df.iloc[:, position]
+        if has_single_value(series):
+            columns.append(cell_text(series.iloc[0]) if len(series) else "")
+        elif series.dtype == object:
+            # 文字列の値はそのまま使用し、その他の値（欠損値・数値など）のみ規則に従って変換
+            columns.append([value if type(value) is str else cell_text(value) for value in series.tolist()])
+        elif isinstance(series.dtype, pd.StringDtype):
+            # 文字列型のカラムは欠損値を空文字に置き換えるだけでよい
+            columns.append(series.fillna("").tolist())
+        else:
+            # 型が揃ったカラム（文字列・数値）は欠損値以外をそのまま文字列化（cell_textと同一の結果）
+            missing = series.isna().tolist()
+            columns.append(["" if is_missing else str(value)
+                            for value, is_missing in zip(series.tolist(), missing)])
+    return columns
+
+
+class ByteCsvWriter:
+    """固定ヘッダーのCSVをバイト列として組み立てるクラス"""
+    
+    def __init__(self, headers: List[str], encoding: str = "cp932",
+                 buffer_size: int = DEFAULT_WRITE_BUFFER_SIZE):
+        """
+        初期化
+        
+        Args:
+            headers: 出力するヘッダー（テンプレートのカラム順、重複を含む）
+            encoding: 文字エンコーディング
+            buffer_size: ファイルへまとめて書き込むサイズ（バイト）
+        """
+        self.headers = headers
+        self.encoding = encoding
+        self.buffer_size = max(1, buffer_size)
+    
+    def encode_header(self) -> bytes:
+        """ヘッダー行をエンコード"""
+        cells = [quote_cell(str(header)).encode(self.encoding) for header in self.headers]
+        return DELIMITER.join(cells) + LINE_TERMINATOR
+    
+    def _column_cells(self, df: pd.DataFrame) -> List[Iterator[bytes]]:
+        """ヘッダーのカラム順に、各行のエンコード済みセルを返すイテレーターを作成"""
+        columns = []
+        for texts in column_texts(df, self.headers):
+            if isinstance(texts, str):
+                # 値がすべて同じカラム（空欄を含む）は1回のみエンコード
+                columns.append(itertools.repeat(quote_cell(texts).encode(self.encoding)))
+                continue
+            
+            encoded: Dict[str, bytes] = {}
+            cells = []
+            for text in texts:
+                cell = encoded.get(text)
+                if cell is None:
+                    cell = encoded[text] = quote_cell(text).encode(self.encoding)
+                cells.append(cell)
+            columns.append(iter(cells))
+        return columns
+    
+    def iter_rows(self, df: pd.DataFrame) -> Iterator[bytes]:
+        """
+        データ行を1行ずつエンコードして返す（ファイル分割時の行サイズの計算用）
+        
+        Args:
+            df: 出力するDataFrame
+        
+        Yields:
+            エンコード済みのデータ行（改行を含む）
+        """
+        for cells in itertools.islice(zip(*self._column_cells(df)), len(df)):
+            yield DELIMITER.join(cells) + LINE_TERMINATOR
+    
+    def iter_row_blocks(self, df: pd.DataFrame) -> Iterator[bytearray]:
+        """
+        データ行をバッファサイズごとのバイト列にまとめて返す
+        
+        Args:
+            df: 出力するDataFrame
+        
+        Yields:
+            エンコード済みのデータ行（複数行）
+        """
+        buffer = bytearray()
+        for cells in itertools.islice(zip(*self._column_cells(df)), len(df)):
+            buffer += DELIMITER.join(cells)
+            buffer += LINE_TERMINATOR
+            if len(buffer) >= self.buffer_size:
+                yield buffer
+                buffer = bytearray()
+        if buffer:
+            yield buffer
+    
+    def encode(self, df: pd.DataFrame, write_header: bool = True) -> bytes:
+        """
+        DataFrameをCSVのバイト列に変換
+        
+        Args:
+            df: 出力するDataFrame
+            write_header: Falseの場合はデータ行のみ
+        
+        Returns:
+            エンコード済みのCSVバイト列
+        """
+        output = bytearray(self.encode_header() if write_header else b"")
+        for block in self.iter_row_blocks(df):
+            output += block
+        return bytes(output)
+    
+    def write(self, df: pd.DataFrame, stream: BinaryIO, write_header: bool = True) -> int:
+        """
+        DataFrameをバイナリストリームに書き込み
+        
+        Args:
+            df: 出力するDataFrame
+            stream: 書き込み先（バイナリモードで開いたファイルなど）
+            write_header: Falseの場合はデータ行のみ（チャンクの追記用）
+        
+        Returns:
+            書き込んだバイト数
+        """
+        written = 0
+        if write_header:
+            written += stream.write(self.encode_header())
+        for block in self.iter_row_blocks(df):
+            written += stream.write(block)
+        return written
@@ -0,0 +1,403 @@
+"""
+チェックポイントモジュール
+
+案件取込用レポートをチャンク単位で変換し、変換済みのチャンクを一時ディレクトリ
+（スピルディレクトリ）にCSVの断片として保存する。処理が途中で失敗した場合は
+--resume で再実行すると、入力内容が変わっていない完了済みチャンクをスキップし、
+残りのチャンクのみを変換する。全チャンクの完了後に断片を連結し、リネームで出力を確定する。
+チャンクごとのエラーも断片（JSON Lines）として保存し、確定時にチャンクの順にエラーログへ書き込む。
+"""
+import hashlib
+import json
+import os
+import shutil
+from contextlib import nullcontext
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
+import pandas as pd
+from config import get_config, DEFAULT_UNENCODABLE_POLICY
+from data_exporter import DataExporter, get_template_headers
+from data_loader import DataLoader
+from data_transformer import DataTransformer
+from error_sink import capture_errors, get_error_sink, read_error_log
+from memory_budget import AdaptiveChunkSizer
+from metrics import MetricsRecorder
+from pipeline import PipelineOptions, merge_validation_summaries, run_pipeline
+from pipelined_executor import PipelinedExecutor
+from run_cache import hash_file, hash_source_code
+from utils import get_today_formatted
+
+
+# チェックポイント形式のバージョン（形式を変更した場合は更新する）
+CHECKPOINT_FORMAT_VERSION = 2
+
+# マニフェストのファイル名
+MANIFEST_FILENAME = "manifest.json"
+
+# チャンク行数の指定がない場合の既定値
+DEFAULT_CHECKPOINT_CHUNK_SIZE = 10000
+
+
+def hash_chunk(df: pd.DataFrame) -> str:
+    """チャンクの入力内容（カラム名と値）のハッシュを計算"""
+    digest = hashlib.sha256()
+    digest.update(json.dumps(list(map(str, df.columns)), ensure_ascii=False).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return digest.hexdigest()
+
+
+def _to_json_value(value: Any) -> Any:
+    """numpyの数値などJSONで直接扱えない値を変換"""
+    return value.item() if hasattr(value, "item") else str(value)
+
+
+class ChunkCheckpoint:
+    """変換済みチャンクの保存と再開を管理するクラス"""
+    
+    def __init__(self, spill_dir: str, run_key: str, chunk_size: Optional[int] = None):
+        """
+        初期化
+        
+        Args:
+            spill_dir: 変換済みチャンクの保存ディレクトリ
+            run_key: 変換結果に影響する条件（ContractList・設定・変換ロジック・実行日など）のキー
+            chunk_size: 1チャンクの行数（Noneの場合は再開時は前回の行数、それ以外は既定値）
+        """
+        self.spill_dir = spill_dir
+        self.run_key = run_key
+        self.chunk_size = chunk_size
+        self.manifest = None
+    
+    def _new_manifest(self) -> Dict[str, Any]:
+        """空のマニフェストを作成"""
+        return {
+            "version": CHECKPOINT_FORMAT_VERSION,
+            "run_key": self.run_key,
+            "chunk_size": self.chunk_size,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "chunks": {}
+        }
+    
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.spill_dir, MANIFEST_FILENAME)
+    
+    def start(self, resume: bool) -> int:
+        """
+        チェックポイントを開始
+        
+        Args:
+            resume: Trueの場合は既存のチェックポイントを引き継ぐ（条件が異なる場合は破棄）
+        
+        Returns:
+            引き継いだ完了済みチャンク数
+        """
+        if resume:
+            manifest = self._load_manifest()
+            if manifest is not None and self.chunk_size is None:
+                self.chunk_size = manifest.get("chunk_size")
+            if manifest is None:
+                print("再開できるチェックポイントがないため、最初から処理します。")
+            elif manifest.get("version") != CHECKPOINT_FORMAT_VERSION or \
+                    manifest.get("run_key") != self.run_key:
+                print("ContractList・設定などが前回と異なるため、最初から処理します。")
+            else:
+                # 完了済みのチャンクは記録した行数で読み込むため、未処理分の行数のみ更新
+                manifest["chunk_size"] = self.chunk_size
+                self.manifest = manifest
+                return len(manifest["chunks"])
+        
+        self.chunk_size = self.chunk_size or DEFAULT_CHECKPOINT_CHUNK_SIZE
+        self.manifest = self._new_manifest()
+        shutil.rmtree(self.spill_dir, ignore_errors=True)
+        os.makedirs(self.spill_dir, exist_ok=True)
+        self._save_manifest()
+        return 0
+    
+    def _load_manifest(self) -> Optional[Dict[str, Any]]:
+        """マニフェストを読み込む（存在しない・破損時はNone）"""
+        if not os.path.exists(self.manifest_path):
+            return None
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def _save_manifest(self):
+        """マニフェストを保存（書き込み途中で中断しても既存のマニフェストを壊さない）"""
+        temp_path = self.manifest_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, ensure_ascii=False, indent=2, default=_to_json_value)
+        os.replace(temp_path, self.manifest_path)
+    
+    def _part_path(self, chunk_index: int) -> str:
+        return os.path.join(self.spill_dir, f"part_{chunk_index:06d}.csv")
+    
+    def _errors_path(self, chunk_index: int) -> str:
+        return os.path.join(self.spill_dir, f"errors_{chunk_index:06d}.jsonl")
+    
+    def completed(self, chunk_index: int, chunk_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        入力内容が同一の完了済みチャンクの記録を取得
+        
+        Returns:
+            完了済みの場合はチャンクの記録、未完了・入力変更時はNone
+        """
+        entry = self.manifest["chunks"].get(str(chunk_index))
+        if entry is None or entry["input_sha256"] != chunk_hash:
+            return None
+        if not os.path.exists(self._part_path(chunk_index)):
+            return None
+        if entry.get("error_count") and not os.path.exists(self._errors_path(chunk_index)):
+            return None
+        return entry
+    
+    def saved_input_rows(self, chunk_index: int) -> Optional[int]:
+        """完了済みチャンクの入力行数を取得（未完了の場合はNone）"""
+        entry = self.manifest["chunks"].get(str(chunk_index))
+        return entry["input_rows"] if entry is not None else None
+    
+    def save_chunk(self, chunk_index: int, chunk_hash: str, input_rows: int, data: bytes,
+                   row_count: int, validation_summary: Dict[str, Any], errors: bytes = b"",
+                   error_count: int = 0):
+        """
+        変換済みチャンクを保存してマニフェストに記録
+        
+        Args:
+            chunk_index: チャンク番号（0始まり）
+            chunk_hash: チャンクの入力内容のハッシュ
+            input_rows: チャンクの入力行数（再開時に同じ範囲で読み込むため記録）
+            data: エンコード済みのCSVデータ行（ヘッダーなし）
+            row_count: 出力レコード数
+            validation_summary: チャンクの検証結果サマリー
+            errors: チャンクのエラー（JSON Lines）
+            error_count: エラー件数
+        """
+        paths = [(self._part_path(chunk_index), data)]
+        if error_count:
+            paths.append((self._errors_path(chunk_index), errors))
+        for path, content in paths:
+            temp_path = path + ".tmp"
+            with open(temp_path, "wb") as f:
+                f.write(content)
+            os.replace(temp_path, path)
+        
+        self.manifest["chunks"][str(chunk_index)] = {
+            "input_sha256": chunk_hash,
+            "input_rows": input_rows,
+            "row_count": row_count,
+            "error_count": error_count,
+            "validation_summary": validation_summary
+        }
+        self._save_manifest()
+    
+    def iter_errors(self, chunk_count: int) -> Iterator[Dict[str, Any]]:
+        """
+        保存したチャンクのエラーをチャンクの順に読み込む
+        
+        Args:
+            chunk_count: チャンク数
+        
+        Yields:
+            エラー1件の辞書（行番号はチャンク内の行番号）
+        """
+        for chunk_index in range(chunk_count):
+            if self.manifest["chunks"][str(chunk_index)].get("error_count"):
+                yield from read_error_log(self._errors_path(chunk_index))
+    
+    def finalize(self, output_path: str, header: bytes, chunk_count: int) -> int:
+        """
+        保存したチャンクを連結して出力ファイルを確定し、スピルディレクトリを削除
+        
+        Args:
+            output_path: 出力ファイルのパス
+            header: エンコード済みのヘッダー行
+            chunk_count: チャンク数
+        
+        Returns:
+            出力レコード数
+        """
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        temp_path = output_path + ".tmp"
+        row_count = 0
+        with open(temp_path, "wb") as output:
+            output.write(header)
+            for chunk_index in range(chunk_count):
+                with open(self._part_path(chunk_index), "rb") as part:
+                    shutil.copyfileobj(part, output)
+                row_count += self.manifest["chunks"][str(chunk_index)]["row_count"]
+        # 完成した出力のみが参照されるようにリネームで確定
+        os.replace(temp_path, output_path)
+        
+        shutil.rmtree(self.spill_dir, ignore_errors=True)
+        return row_count
+
+
+def compute_run_key(contract_list_paths: List[str], options: Dict[str, Any]) -> str:
+    """
+    チャンクの変換結果に影響する条件（レポート以外）のキーを計算
+    
+    Args:
+        contract_list_paths: ContractListのパスのリスト
+        options: 出力内容に影響する実行オプション
+    
+    Returns:
+        キー（16進文字列）
+    """
+    fingerprint = {
+        "contract_lists": [hash_file(path) for path in contract_list_paths],
+        "config": get_config(),
+        "template_headers": get_template_headers(),
+        "source_code": hash_source_code(),
+        "today": get_today_formatted(),
+        "options": options
+    }
+    serialized = json.dumps(fingerprint, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+# 変換ステージの状態（プロセスプールでは各プロセスで初期化）
+_chunk_worker = {}
+
+
+def init_chunk_worker(contract_keys: Union[pd.DataFrame, Set[str]], exporter: DataExporter,
+                      verbose: bool = True,
+                      unencodable: str = DEFAULT_UNENCODABLE_POLICY) -> Dict[str, Any]:
+    """
+    チャンクの変換に使用する変換器・出力処理を初期化
+    
+    Args:
+        contract_keys: ContractListのDataFrame、または引継番号の集合
+        exporter: CSVのエンコードに使用するDataExporter
+        verbose: Falseの場合はチャンクごとの進捗表示を破棄（別プロセスで変換する場合）
+        unencodable: 出力の文字エンコーディングで表現できない文字の扱い
+    
+    Returns:
+        変換ステージの状態
+    """
+    _chunk_worker.update(
+        contract_keys=contract_keys,
+        exporter=exporter,
+        options=PipelineOptions(verbose=verbose, transformer=DataTransformer(),
+                                encoding=exporter.encoding, unencodable=unencodable)
+    )
+    return _chunk_worker
+
+
+def convert_chunk(item: Tuple[int, str, pd.DataFrame]) -> Tuple[int, str, int, bytes, int, Dict[str, Any], bytes, int]:
+    """
+    1チャンクを検証・変換してCSVのデータ行にエンコード
+    
+    Args:
+        item: (チャンク番号, 入力内容のハッシュ, チャンクのDataFrame)
+    
+    Returns:
+        (チャンク番号, 入力内容のハッシュ, 入力行数, エンコード済みのデータ行, 出力レコード数,
+         検証結果サマリー, エラー（JSON Lines）, エラー件数)
+    """
+    chunk_index, chunk_hash, chunk = item
+    print(f"\n--- チャンク {chunk_index + 1}（{len(chunk)}件） ---")
+    # エラーはチャンクごとに収集し、チェックポイントに保存してから確定時にエラーログへ書き込む
+    with capture_errors() as captured:
+        # チャンクのインデックスはファイル先頭からの行番号のまま渡し、エラーログの index とする
+        result = run_pipeline(chunk, _chunk_worker["contract_keys"], options=_chunk_worker["options"])
+        # 表現できない文字は変換時に置換・除外済み。その他の書き込みエラーはここで失敗し、
+        # それまでのチャンクは保存済みのまま残る
+        data = _chunk_worker["exporter"].to_csv_bytes(result.output_df, write_header=False)
+    return (chunk_index, chunk_hash, len(chunk), data, len(result.output_df), result.validation_summary,
+            captured.to_jsonl_bytes(), captured.total)
+
+
+def convert_with_checkpoints(loader: DataLoader,
+                             report_path: str,
+                             contract_keys: Union[pd.DataFrame, Set[str]],
+                             output_path: str,
+                             checkpoint: ChunkCheckpoint,
+                             exporter: DataExporter,
+                             metrics: Optional[MetricsRecorder] = None,
+                             sizer: Optional[AdaptiveChunkSizer] = None,
+                             executor: Optional[PipelinedExecutor] = None,
+                             unencodable: str = DEFAULT_UNENCODABLE_POLICY) -> Tuple[str, int, Dict[str, Any]]:
+    """
+    チャンク単位で変換し、チャンクごとにチェックポイントを保存して出力を確定
+    
+    完了済みで入力内容が同一のチャンクは変換せずに保存済みの結果を使用する。
+    完了済みのチャンクは前回と同じ行数で読み込むため、チャンク行数を変更して再開できる。
+    
+    Args:
+        loader: レポートの読み込みに使用するDataLoader
+        report_path: 案件取込用レポートのパス
+        contract_keys: ContractListのDataFrame、または引継番号の集合
+        output_path: 出力ファイルのパス
+        checkpoint: チェックポイント（start済み）
+        exporter: CSVのエンコードに使用するDataExporter
+        metrics: 内部処理の累計時間を記録するMetricsRecorder
+        sizer: 指定した場合はメモリ上限に応じて未処理のチャンク行数を調整
+        executor: 指定した場合は読み込み・変換・書き込みを並行に実行（sizerとは併用不可）
+        unencodable: 出力の文字エンコーディングで表現できない文字の扱い
+    
+    Returns:
+        (出力ファイルのパス, 出力レコード数, 全チャンクの検証結果サマリー)
+    """
+    if executor is not None and executor.use_processes:
+        executor.initializer = init_chunk_worker
+        executor.initargs = (contract_keys, exporter, False, unencodable)
+    else:
+        # チャンクごとのステップは計測せず（呼び出し側で全体を計測）、内部処理の累計時間のみ記録
+        worker = init_chunk_worker(contract_keys, exporter, unencodable=unencodable)
+        if metrics is not None:
+            metrics.instrument_transformer(worker["options"].transformer)
+    
+    summaries = {}
+    skipped = 0
+    chunk_count = 0
+    
+    def next_size() -> int:
+        saved_rows = checkpoint.saved_input_rows(chunk_count)
+        if saved_rows is not None:
+            return saved_rows
+        return sizer.chunk_size if sizer is not None else checkpoint.chunk_size
+    
+    def pending_chunks():
+        """未完了のチャンクを (チャンク番号, ハッシュ, DataFrame) で返す"""
+        nonlocal skipped, chunk_count
+        for chunk in loader.iter_csv_chunks(report_path, checkpoint.chunk_size, next_size=next_size):
+            chunk_index = chunk_count
+            chunk_count += 1
+            chunk_hash = hash_chunk(chunk)
+            entry = checkpoint.completed(chunk_index, chunk_hash)
+            if entry is not None:
+                summaries[chunk_index] = entry["validation_summary"]
+                skipped += 1
+                continue
+            yield chunk_index, chunk_hash, chunk
+    
+    def save(converted: Tuple[int, str, int, bytes, int, Dict[str, Any], bytes, int]):
+        chunk_index, chunk_hash, input_rows, data, row_count, validation_summary, errors, error_count = converted
+        checkpoint.save_chunk(chunk_index, chunk_hash, input_rows, data, row_count, validation_summary,
+                              errors, error_count)
+        summaries[chunk_index] = validation_summary
+    
+    if executor is not None:
+        executor.run(pending_chunks(), convert_chunk, save)
+    else:
+        chunks = pending_chunks()
+        while True:
+            # 1件あたりのメモリはチャンクの読み込みからエンコードまでを含めて計測
+            with sizer.measure() if sizer is not None else nullcontext({}) as measurement:
+                item = next(chunks, None)
+                if item is None:
+                    break
+                save(convert_chunk(item))
+                measurement["rows"] = len(item[2])
+            if sizer is not None:
+                sizer.record(len(item[2]))
+    
+    if skipped:
+        print(f"\n完了済みの{skipped}チャンクをスキップしました（全{chunk_count}チャンク）")
+    
+    # 再開時にスキップしたチャンクを含め、エラーは入力の順にエラーログへ書き込む
+    get_error_sink().write_all(checkpoint.iter_errors(chunk_count))
+    row_count = checkpoint.finalize(output_path, exporter.header_bytes(), chunk_count)
+    return output_path, row_count, merge_validation_summaries(summaries[index] for index in sorted(summaries))
@@ -218,6 +218,61 @@ VALIDATION_RULES = {
     "duplicate_check_column": "引継番号"
 }
 
+# 差分処理（--incremental）の状態ストアファイル名（出力ディレクトリに作成）
+STATE_DB_FILENAME = "ark_import_state.sqlite3"
+
+# 実行結果キャッシュのディレクトリ名（出力ディレクトリに作成）
+RUN_CACHE_DIRNAME = ".ark_run_cache"
+
+# チェックポイント（--chunk-size・--resume）のスピルディレクトリ名（出力ディレクトリに作成）
+CHECKPOINT_DIRNAME = ".ark_checkpoint"
+
+# CSVの書き込み方式（bytes: 定数セルを事前エンコードするバイト列出力、csv: csv.writerで1行ずつ出力）
+CSV_WRITERS = ("bytes", "csv")
+
+# bytes方式でファイルへまとめて書き込むサイズの既定値（バイト）
+DEFAULT_WRITE_BUFFER_SIZE = 4 * 1024 * 1024
+
+# 出力形式（--output-format）。xlsxはxlsxwriterがインストールされている場合のみ使用可能
+OUTPUT_FORMATS = ("csv", "xlsx")
+
+# 出力の文字エンコーディング（cp932）で書き込む出力形式（表現できない文字の置換・除外の対象）
+# xlsxはUnicodeで保存するため対象外。--sqlite は主出力（CSV・xlsx）と同じデータを書き込む
+ENCODED_OUTPUT_FORMATS = ("csv",)
+
+# 照合用のSQLite出力（--sqlite）のファイル名（パスの指定がない場合は出力ディレクトリに作成）
+EXPORT_DB_FILENAME = "ark_registrations.sqlite3"
+
+# 出力の文字エンコーディングで表現できない文字の扱い（--unencodable）
+# substitute: 置換表の文字に置き換え（置換表にない文字は"?"）、question: "?"に置き換え、reject: レコードを除外
+UNENCODABLE_POLICIES = ("substitute", "question", "reject")
+DEFAULT_UNENCODABLE_POLICY = "substitute"
+
+# cp932で表現できない文字の置換表（substitute）
+CP932_SUBSTITUTIONS = {
+    "\u00a0": " ",   # ノーブレークスペース
+    "\u200b": "",    # ゼロ幅スペース
+    "\ufeff": "",    # BOM
+    "\u2011": "-",   # ノーブレークハイフン
+    "\u2012": "-",   # 数字幅ダッシュ
+    "\u2013": "-",   # enダッシュ
+    "\u2014": "―",   # emダッシュ
+    "\u2043": "-",   # ハイフン記号
+    "\u2022": "・",  # 中黒（ビュレット）
+    "\u00e9": "e",
+    "\u00fc": "u",
+    "\u00f1": "n",
+    "\u014d": "o",
+    "\U00020bb7": "吉",  # 𠮷（つちよし）
+    "\U0002123d": "土",  # 𡈽
+    "\u69d7": "橋",  # 槗
+}
+
+# 一括処理（--batch）で検出する支店別案件取込用レポートのパターン
+BATCH_REPORT_PATTERNS = [
+    "【*】①案件取込用レポート*.csv"
+]
+
 # 都道府県リスト
 PREFECTURES = [
     "北海道", "青森県", "岩手県", "宮城県", "秋田県", "山形県", "福島県",
@@ -0,0 +1,255 @@
+"""
+変換サービスモジュール
+
+ローカルHTTPサービスとして変換処理を提供する（標準ライブラリのhttp.serverのみ使用）。
+変換器（ワーカースレッドごと）・テンプレートヘッダー・ContractListの引継番号インデックスは
+リクエスト間で常駐保持し、同時に実行する変換の数はワーカープールで制限する。
+
+エンドポイント:
+    GET  /health   サービスの状態（JSON）
+    POST /convert  案件取込用レポートを変換
+        - Content-Type: text/csv の場合は本文をレポートのCSVとして扱う
+        - Content-Type: application/json の場合は {"path": "共有ドライブ上のパス"} を読み込む
+        - 既定では変換後のCSV（cp932）を返し、処理サマリーを X-Conversion-Summary ヘッダー（JSON）に格納
+        - ?format=json の場合は {"summary": ..., "csv_base64": ...} を返す
+"""
+import base64
+import json
+import os
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+from data_loader import DataLoader, ContractKeyIndex
+from data_transformer import DataTransformer
+from data_exporter import DataExporter, get_template_headers
+from error_sink import capture_errors
+from utils import get_output_filename
+from event_log import capture_events
+from pipeline import PipelineOptions, run_pipeline
+
+
+# アップロードを受け付ける最大サイズ
+MAX_UPLOAD_BYTES = 512 * 1024 * 1024
+
+# 新しいContractListの配置を確認する間隔（秒、リクエストとは別のスレッドで確認）
+CONTRACT_INDEX_REFRESH_SECONDS = 5.0
+
+
+class ConversionService:
+    """常駐キャッシュを保持して変換を実行するクラス"""
+    
+    def __init__(self, contract_list_dir: str,
+                 contract_list_glob: Optional[str] = None,
+                 encoding: str = "cp932",
+                 max_workers: int = 2,
+                 refresh_interval: float = CONTRACT_INDEX_REFRESH_SECONDS):
+        self.encoding = encoding
+        self.refresh_interval = refresh_interval
+        self.loader = DataLoader(encoding=encoding)
+        # 変換器はスレッド間で共有せず、ワーカースレッドごとに作成して再利用する
+        self._local = threading.local()
+        self.exporter = DataExporter(encoding=encoding)
+        self.contract_index = ContractKeyIndex(self.loader, contract_list_dir, contract_list_glob)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.max_workers = max_workers
+    
+    def warm_up(self):
+        """テンプレートヘッダーとContractListのインデックスを事前に読み込み、インデックスの定期更新を開始"""
+        get_template_headers()
+        self.contract_index.load()
+        self.contract_index.start_refresh(self.refresh_interval)
+    
+    def get_transformer(self) -> DataTransformer:
+        """実行中のワーカースレッドの変換器を取得（初回のみ作成）"""
+        transformer = getattr(self._local, "transformer", None)
+        if transformer is None:
+            transformer = self._local.transformer = DataTransformer()
+        return transformer
+    
+    def convert(self, report_bytes: Optional[bytes] = None,
+                report_path: Optional[str] = None) -> Tuple[bytes, Dict[str, Any]]:
+        """
+        レポートを変換（ワーカープールで実行し、完了まで待機）
+        
+        Args:
+            report_bytes: レポートCSVのバイト列
+            report_path: レポートCSVのパス（report_bytesがNoneの場合に使用）
+        
+        Returns:
+            (変換後のCSVバイト列, 処理サマリー)
+        """
+        return self.executor.submit(self._convert, report_bytes, report_path).result()
+    
+    def _convert(self, report_bytes: Optional[bytes],
+                 report_path: Optional[str]) -> Tuple[bytes, Dict[str, Any]]:
+        """変換処理本体"""
+        if report_bytes is not None:
+            report_df = self.loader.load_csv_bytes(report_bytes)
+        else:
+            report_df = self.loader.load_csv(report_path)
+        
+        # 標準出力のリダイレクトはスレッド間で共有されるため、進捗表示はそのまま出力する
+        options = PipelineOptions(verbose=True, transformer=self.get_transformer(),
+                                  encoding=self.exporter.encoding)
+        
+        # エラーと処理ログの件数はリクエストごとに収集し、エラーはレスポンスに含める
+        # （インデックスは別スレッドで更新されるため、リクエスト時点の集合を参照するのみ）
+        with capture_errors() as captured, capture_events():
+            result = run_pipeline(report_df, self.contract_index.keys, options=options)
+            csv_bytes = self.exporter.to_csv_bytes(result.output_df)
+        
+        validation_summary = result.validation_summary
+        summary = {
+            "output_filename": get_output_filename(),
+            "original_count": validation_summary["original_count"],
+            "validated_count": validation_summary["validated_count"],
+            "excluded_count": validation_summary["excluded_count"],
+            "duplicate_count": validation_summary["duplicate_count"],
+            "output_count": len(result.output_df),
+            "error_log": captured.records
+        }
+        return csv_bytes, summary
+    
+    def shutdown(self):
+        """ワーカープールとインデックスの定期更新を停止"""
+        self.executor.shutdown(wait=True)
+        self.contract_index.stop_refresh()
+
+
+class ConversionRequestHandler(BaseHTTPRequestHandler):
+    """変換サービスのリクエストハンドラー"""
+    
+    server_version = "ArkConversionService/1.0"
+    
+    @property
+    def service(self) -> ConversionService:
+        return self.server.service
+    
+    def _send_json(self, status: int, payload: Dict[str, Any]):
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def do_GET(self):
+        if urlparse(self.path).path != "/health":
+            self._send_json(404, {"error": "not found"})
+            return
+        self._send_json(200, {
+            "status": "ok",
+            "contract_keys": len(self.service.contract_index.keys),
+            "max_workers": self.service.max_workers
+        })
+    
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != "/convert":
+            self._send_json(404, {"error": "not found"})
+            return
+        
+        length = int(self.headers.get("Content-Length", 0))
+        if length <= 0:
+            self._send_json(400, {"error": "リクエスト本文が空です"})
+            return
+        if length > MAX_UPLOAD_BYTES:
+            self._send_json(413, {"error": "アップロードサイズが上限を超えています"})
+            return
+        body = self.rfile.read(length)
+        
+        try:
+            if self.headers.get("Content-Type", "").startswith("application/json"):
+                report_path = json.loads(body.decode("utf-8")).get("path")
+                if not report_path:
+                    self._send_json(400, {"error": "pathを指定してください"})
+                    return
+                csv_bytes, summary = self.service.convert(report_path=report_path)
+            else:
+                csv_bytes, summary = self.service.convert(report_bytes=body)
+        except FileNotFoundError as e:
+            self._send_json(404, {"error": str(e)})
+            return
+        except Exception as e:
+            self._send_json(500, {"error": f"変換エラー: {e}"})
+            return
+        
+        if parse_qs(url.query).get("format") == ["json"]:
+            self._send_json(200, {
+                "summary": summary,
+                "csv_base64": base64.b64encode(csv_bytes).decode("ascii")
+            })
+            return
+        
+        # ヘッダーはASCIIのみ許可されるため、サマリーは\uエスケープしたJSONで格納
+        summary_header = json.dumps(
+            {key: value for key, value in summary.items() if key != "error_log"},
+            ensure_ascii=True
+        )
+        self.send_response(200)
+        self.send_header("Content-Type", f"text/csv; charset={self.service.encoding}")
+        self.send_header("Content-Length", str(len(csv_bytes)))
+        self.send_header("X-Conversion-Summary", summary_header)
+        self.end_headers()
+        self.wfile.write(csv_bytes)
+
+
+def run_server(host: str, port: int, service: ConversionService):
+    """
+    変換サービスを起動（Ctrl+Cで終了）
+    
+    Args:
+        host: 待ち受けアドレス
+        port: 待ち受けポート
+        service: 変換サービス
+    """
+    service.warm_up()
+    httpd = ThreadingHTTPServer((host, port), ConversionRequestHandler)
+    httpd.service = service
+    print(f"変換サービスを起動しました: http://{host}:{httpd.server_port}/（Ctrl+Cで終了）")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\n変換サービスを終了しました。")
+    finally:
+        httpd.server_close()
+        service.shutdown()
+
+
+def request_conversion(url: str, report_path: str, output_path: str,
+                       by_path: bool = False) -> Dict[str, Any]:
+    """
+    変換サービスに変換を依頼して結果を保存（動作確認用クライアント）
+    
+    Args:
+        url: サービスのURL（例: "http://127.0.0.1:8765"）
+        report_path: 案件取込用レポートのパス
+        output_path: 変換結果の保存先
+        by_path: Trueの場合はファイル内容ではなくパスを送信（共有ドライブ用）
+    
+    Returns:
+        処理サマリー
+    """
+    if by_path:
+        data = json.dumps({"path": os.path.abspath(report_path)}).encode("utf-8")
+        content_type = "application/json"
+    else:
+        with open(report_path, "rb") as f:
+            data = f.read()
+        content_type = "text/csv"
+    
+    request = urllib.request.Request(
+        url.rstrip("/") + "/convert?format=json",
+        data=data,
+        headers={"Content-Type": content_type},
+        method="POST"
+    )
+    with urllib.request.urlopen(request) as response:
+        payload = json.loads(response.read().decode("utf-8"))
+    
+    with open(output_path, "wb") as f:
+        f.write(base64.b64decode(payload["csv_base64"]))
+    return payload["summary"]
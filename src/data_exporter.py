@@ -2,15 +2,35 @@
 データ出力モジュール
 """
 import pandas as pd
+import io
 import os
 import csv
+import sqlite3
+import time
 from datetime import datetime
-from typing import Optional
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+from byte_csv_writer import ByteCsvWriter
+from config import CSV_WRITERS, DEFAULT_WRITE_BUFFER_SIZE
+from error_sink import ErrorSink, summarize_error_log
+from metrics import format_bytes
+from output_splitter import write_parts
+from report_stats import ReportStats, SUMMARY_AMOUNT_COLUMNS
+from sqlite_export import SqliteExporter
+from xlsx_export import XlsxWriter
 from utils import get_output_filename
 
+
 # テンプレートファイルから直接ヘッダーを読み取る
 def get_template_headers():
     """テンプレートファイルから正確なヘッダーを取得（Unnamedカラムを空文字に変換）"""
+    # 呼び出し側での変更がキャッシュに影響しないようコピーを返す
+    return list(_load_template_headers())
+
+
+@lru_cache(maxsize=1)
+def _load_template_headers():
+    """テンプレートファイルのヘッダーを読み込む（プロセス内で1回のみ）"""
     template_path = r"C:\Users\user04\Downloads\ContractInfoSample（final） (2).csv"
     try:
         df = pd.read_csv(template_path, encoding='cp932', nrows=0)
@@ -35,8 +55,24 @@ def get_template_headers():
 class DataExporter:
     """データの出力を管理するクラス"""
     
-    def __init__(self, encoding: str = "cp932"):
+    def __init__(self, encoding: str = "cp932", writer: str = "bytes",
+                 buffer_size: int = DEFAULT_WRITE_BUFFER_SIZE):
+        """
+        初期化
+        
+        Args:
+            encoding: 出力の文字エンコーディング
+            writer: CSVの書き込み方式（"bytes" または "csv"、出力内容は同一）
+            buffer_size: bytes方式でファイルへまとめて書き込むサイズ（バイト）
+        """
+        if writer not in CSV_WRITERS:
+            raise ValueError(f"不明な書き込み方式です: {writer}")
         self.encoding = encoding
+        self.writer = writer
+        self.buffer_size = buffer_size
+    
+    def _byte_writer(self) -> ByteCsvWriter:
+        return ByteCsvWriter(get_template_headers(), self.encoding, self.buffer_size)
     
     def export_to_csv(self, df: pd.DataFrame, 
                      output_path: Optional[str] = None,
@@ -80,6 +116,124 @@ class DataExporter:
         except Exception as e:
             raise Exception(f"ファイル出力エラー: {e}")
     
+    def export_to_xlsx(self, df: pd.DataFrame,
+                       output_path: Optional[str] = None,
+                       output_dir: str = ".") -> str:
+        """
+        DataFrameをExcelブック（.xlsx）に出力（固定ヘッダー、全セルを文字列として書き込み）
+        
+        Args:
+            df: 出力するDataFrame
+            output_path: 出力ファイルパス（Noneの場合は自動生成）
+            output_dir: 出力ディレクトリ
+            
+        Returns:
+            出力したファイルのパス
+        """
+        if output_path is None:
+            output_path = os.path.join(output_dir, get_output_filename(".xlsx"))
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        
+        try:
+            xlsx_writer = XlsxWriter(output_path, get_template_headers())
+            try:
+                xlsx_writer.write(df)
+            finally:
+                xlsx_writer.close()
+        except ImportError:
+            raise
+        except Exception as e:
+            raise Exception(f"ファイル出力エラー: {e}")
+        
+        print(f"\nファイルを出力しました: {output_path}")
+        print(f"レコード数: {len(df)}件")
+        print(f"カラム数: {len(get_template_headers())}列")
+        print(f"ファイルサイズ: {format_bytes(os.path.getsize(output_path))}")
+        return output_path
+    
+    def export_to_csv_parts(self, df: pd.DataFrame,
+                            output_path: Optional[str] = None,
+                            output_dir: str = ".",
+                            max_rows: Optional[int] = None,
+                            max_bytes: Optional[int] = None,
+                            workers: Optional[int] = None) -> Tuple[List[str], str]:
+        """
+        DataFrameを行数・サイズの上限ごとの連番CSVファイルに分割して出力
+        
+        各ファイルにテンプレートのヘッダーを付与し、書き込みはスレッドプールで並行に行う。
+        ファイル名・行の範囲・チェックサムはマニフェスト（JSON）に出力する。
+        
+        Args:
+            df: 出力するDataFrame
+            output_path: 分割しない場合の出力ファイルパス（Noneの場合は自動生成）
+            output_dir: 出力ディレクトリ
+            max_rows: 1ファイルあたりのデータ行数の上限
+            max_bytes: 1ファイルあたりのバイト数の上限（ヘッダーを含む）
+            workers: 書き込みのスレッド数
+            
+        Returns:
+            (出力したファイルのパスのリスト, マニフェストのパス)
+        """
+        if output_path is None:
+            output_path = os.path.join(output_dir, get_output_filename())
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        
+        try:
+            # 行ごとのサイズが必要なため、書き込み方式によらずバイト列出力で行単位にエンコード
+            # （エンコードしながらファイルを区切り、全行のバイト列は保持しない）
+            byte_writer = self._byte_writer()
+            parts, manifest_path = write_parts(
+                output_path, byte_writer.encode_header(), byte_writer.iter_rows(df),
+                max_rows=max_rows, max_bytes=max_bytes, workers=workers, encoding=self.encoding
+            )
+        except Exception as e:
+            raise Exception(f"ファイル出力エラー: {e}")
+        
+        print(f"\nファイルを{len(parts)}件に分割して出力しました:")
+        for part in parts:
+            print(f"  {part['file']}: {part['rows']}件（{format_bytes(part['bytes'])}）")
+        print(f"レコード数: {len(df)}件")
+        print(f"カラム数: {len(get_template_headers())}列")
+        print(f"マニフェスト: {manifest_path}")
+        
+        part_dir = os.path.dirname(output_path)
+        return [os.path.join(part_dir, part["file"]) for part in parts], manifest_path
+    
+    def export_to_sqlite(self, df: pd.DataFrame, db_path: str,
+                         run_id: Optional[str] = None,
+                         output_filename: Optional[str] = None) -> str:
+        """
+        DataFrameを照合用のSQLiteファイルに書き込み（テンプレートのヘッダーでテーブルを作成）
+        
+        Args:
+            df: 出力するDataFrame
+            db_path: SQLiteファイルのパス
+            run_id: 実行ID（Noneの場合は実行日時、同じIDの既存の行は置き換え）
+            output_filename: 同時に出力したCSVのファイル名（実行の記録用。分割出力の場合は
+                分割したファイル名のカンマ区切り）
+            
+        Returns:
+            実行ID
+        """
+        if run_id is None:
+            run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        
+        start = time.perf_counter()
+        sqlite_exporter = SqliteExporter(db_path, get_template_headers())
+        try:
+            row_count = sqlite_exporter.insert(df, run_id, output_filename)
+        except sqlite3.Error as e:
+            raise Exception(f"SQLite出力エラー: {e}")
+        finally:
+            sqlite_exporter.close()
+        elapsed = time.perf_counter() - start
+        
+        print(f"\nSQLiteに出力しました: {db_path}（実行ID: {run_id}）")
+        rate = f"、{row_count / elapsed:,.0f}件/秒" if elapsed > 0 else ""
+        print(f"レコード数: {row_count}件（{elapsed:.2f}秒{rate}）")
+        return run_id
+    
     def _write_csv_with_fixed_header(self, df: pd.DataFrame, output_path: str):
         """
         固定ヘッダーを使用してCSVファイルを書き込み（テンプレートから直接取得）
@@ -88,127 +242,302 @@ class DataExporter:
             df: 出力するDataFrame
             output_path: 出力ファイルパス
         """
-        # テンプレートから正確なヘッダーを取得
-        template_headers = get_template_headers()
+        if self.writer == "bytes":
+            with open(output_path, 'wb') as f:
+                self._byte_writer().write(df, f)
+            return
         
         with open(output_path, 'w', newline='', encoding=self.encoding) as csvfile:
-            writer = csv.writer(csvfile)
+            self._write_csv_rows(df, csvfile)
+    
+    def to_csv_bytes(self, df: pd.DataFrame, write_header: bool = True) -> bytes:
+        """
+        DataFrameをファイルと同一形式のCSVバイト列に変換（固定ヘッダーを使用）
+        
+        Args:
+            df: 出力するDataFrame
+            write_header: Falseの場合はデータ行のみを変換する（チャンクの連結用）
             
-            # テンプレートの正確なヘッダーを書き込み
-            writer.writerow(template_headers)
+        Returns:
+            エンコード済みのCSVバイト列
+        """
+        if self.writer == "bytes":
+            return self._byte_writer().encode(df, write_header=write_header)
+        
+        buffer = io.StringIO(newline='')
+        self._write_csv_rows(df, buffer, write_header=write_header)
+        return buffer.getvalue().encode(self.encoding)
+    
+    def header_bytes(self) -> bytes:
+        """テンプレートのヘッダー行をエンコード済みのバイト列で取得"""
+        if self.writer == "bytes":
+            return self._byte_writer().encode_header()
+        
+        buffer = io.StringIO(newline='')
+        csv.writer(buffer).writerow(get_template_headers())
+        return buffer.getvalue().encode(self.encoding)
+    
+    def export_chunks_to_csv(self, chunks: Iterable[pd.DataFrame],
+                             output_path: str) -> Tuple[str, int]:
+        """
+        変換済みのチャンクを順に1つのCSVファイルへ書き込み（ヘッダーは先頭に1回のみ）
+        
+        Args:
+            chunks: 出力するDataFrameのイテラブル
+            output_path: 出力ファイルパス
             
-            # データ行を書き込み
-            for _, row in df.iterrows():
-                data_row = []
-                for col in template_headers:
-                    if col in df.columns:
-                        value = row[col]
-                        # NaNや空文字は空文字に統一
-                        try:
-                            if pd.isna(value) or value is None or value == "":
-                                data_row.append("")
-                            elif isinstance(value, pd.Series):
-                                # Seriesオブジェクトの場合は最初の値を取得
-                                data_row.append(str(value.iloc[0]) if len(value) > 0 and not pd.isna(value.iloc[0]) else "")
-                            else:
-                                data_row.append(str(value))
-                        except (TypeError, ValueError, AttributeError):
-                            # その他のエラーは空文字として処理
+        Returns:
+            (出力したファイルのパス, レコード数)
+        """
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        
+        row_count = 0
+        if self.writer == "bytes":
+            byte_writer = self._byte_writer()
+            with open(output_path, 'wb') as f:
+                f.write(byte_writer.encode_header())
+                for chunk in chunks:
+                    byte_writer.write(chunk, f, write_header=False)
+                    row_count += len(chunk)
+            return output_path, row_count
+        
+        with open(output_path, 'w', newline='', encoding=self.encoding) as csvfile:
+            csv.writer(csvfile).writerow(get_template_headers())
+            for chunk in chunks:
+                self._write_csv_rows(chunk, csvfile, write_header=False)
+                row_count += len(chunk)
+        
+        return output_path, row_count
+    
+    def _write_csv_rows(self, df: pd.DataFrame, csvfile, write_header: bool = True):
+        """
+        テンプレートのヘッダーとデータ行をテキストストリームに書き込み（csv方式）
+        
+        Args:
+            df: 出力するDataFrame
+            csvfile: 書き込み先（newline=''で開いたテキストストリーム）
+            write_header: Falseの場合はデータ行のみを書き込む（チャンクの追記用）
+        """
+        # テンプレートから正確なヘッダーを取得
+        template_headers = get_template_headers()
+        
+        writer = csv.writer(csvfile)
+        
+        # テンプレートの正確なヘッダーを書き込み
+        if write_header:
+            writer.writerow(template_headers)
+        
+        # データ行を書き込み
+        for _, row in df.iterrows():
+            data_row = []
+            for col in template_headers:
+                if col in df.columns:
+                    value = row[col]
+                    # NaNや空文字は空文字に統一
+                    try:
+                        if pd.isna(value) or value is None or value == "":
                             data_row.append("")
-                    else:
+                        elif isinstance(value, pd.Series):
+                            # Seriesオブジェクトの場合は最初の値を取得
+                            data_row.append(str(value.iloc[0]) if len(value) > 0 and not pd.isna(value.iloc[0]) else "")
+                        else:
+                            data_row.append(str(value))
+                    except (TypeError, ValueError, AttributeError):
+                        # その他のエラーは空文字として処理
                         data_row.append("")
-                writer.writerow(data_row)
+                else:
+                    data_row.append("")
+            writer.writerow(data_row)
     
-    def export_error_log(self, error_log: list, 
-                        output_dir: str = ".") -> Optional[str]:
+    def export_error_log(self, error_sink: ErrorSink) -> Optional[str]:
         """
-        エラーログをファイルに出力
+        エラーログ（JSON Lines）からテキスト形式のエラーログを出力
         
         Args:
-            error_log: エラーログのリスト
-            output_dir: 出力ディレクトリ
+            error_sink: 処理中のエラーを書き込んだエラーログ
             
         Returns:
-            出力したファイルのパス（エラーがない場合はNone）
+            出力したファイルのパス（エラーがない・ファイルに書き込んでいない場合はNone）
         """
-        if not error_log:
+        if error_sink.total == 0 or error_sink.path is None:
             return None
         
-        # エラーログファイル名を生成
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        error_file = os.path.join(output_dir, f"error_log_{timestamp}.txt")
-        
         try:
-            with open(error_file, "w", encoding="utf-8") as f:
-                f.write("データ変換エラーログ\n")
-                f.write("=" * 50 + "\n")
-                f.write(f"生成日時: {datetime.now().strftime('%Y/%m/%d %H:%M:%S')}\n")
-                f.write("=" * 50 + "\n\n")
-                
-                for i, error in enumerate(error_log, 1):
-                    f.write(f"エラー {i}:\n")
-                    for key, value in error.items():
-                        f.write(f"  {key}: {value}\n")
-                    f.write("\n")
-            
-            print(f"\nエラーログを出力しました: {error_file}")
+            error_sink.flush()
+            error_file = summarize_error_log(error_sink.path)
+            print(f"\nエラーログを出力しました: {error_file}（{error_sink.total}件）")
             return error_file
             
         except Exception as e:
             print(f"エラーログ出力失敗: {e}")
             return None
     
-    def create_summary_report(self, df: pd.DataFrame, 
+    def create_summary_report(self, df: Optional[pd.DataFrame], 
                             validation_summary: dict,
-                            output_dir: str = ".") -> str:
+                            output_dir: str = ".",
+                            preview: Optional[dict] = None,
+                            column_count: Optional[int] = None,
+                            memory_budget: Optional[dict] = None,
+                            output_parts: Optional[List[str]] = None,
+                            output_format: str = "csv") -> str:
         """
         処理サマリーレポートを作成
         
+        統計値は検証結果サマリーの "report_stats"（変換時にチャンクごとに集計済み）から
+        作成し、ない場合のみdfを集計する。
+        
         Args:
-            df: 出力データ
+            df: 出力データ（report_statsがある場合はNoneでもよい）
             validation_summary: 検証結果サマリー
             output_dir: 出力ディレクトリ
+            preview: プレビュー実行の情報（method, source_rows, source_rows_estimated,
+                estimated_seconds, output_filename）。
+                指定した場合はプレビュー用のレポート（preview_report_*.txt）を作成
+            column_count: 出力ファイルのカラム数（dfを指定しない場合に指定）
+            memory_budget: メモリ上限によるチャンク行数の調整結果（AdaptiveChunkSizer.summary()）
+            output_parts: 出力を分割した場合のファイル名のリスト
+            output_format: 出力形式（"csv" または "xlsx"）
             
         Returns:
             レポートファイルのパス
         """
+        if validation_summary.get("report_stats"):
+            stats = ReportStats(validation_summary["report_stats"])
+        else:
+            stats = ReportStats.from_dataframe(df)
+        
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        report_file = os.path.join(output_dir, f"processing_report_{timestamp}.txt")
+        prefix = "preview_report" if preview else "processing_report"
+        report_file = os.path.join(output_dir, f"{prefix}_{timestamp}.txt")
         
         try:
             with open(report_file, "w", encoding="utf-8") as f:
-                f.write("アーク新規登録データ変換 処理レポート\n")
+                f.write("アーク新規登録データ変換 処理レポート" + ("（プレビュー）" if preview else "") + "\n")
                 f.write("=" * 60 + "\n")
                 f.write(f"処理日時: {datetime.now().strftime('%Y/%m/%d %H:%M:%S')}\n")
                 f.write("=" * 60 + "\n\n")
                 
+                if preview:
+                    f.write("【プレビュー】\n")
+                    f.write(f"抽出方法: {preview['method']}\n")
+                    f.write(f"処理件数: {validation_summary.get('original_count', 0)}件"
+                            f"（全{'約' if preview.get('source_rows_estimated') else ''}"
+                            f"{preview['source_rows']}件中）\n")
+                    if preview.get("estimated_seconds") is not None:
+                        f.write(f"全件の推定処理時間: 約{preview['estimated_seconds']:,.0f}秒"
+                                f"（検証・変換・出力、読み込みを除く）\n")
+                    f.write("\n")
+                
                 f.write("【処理結果サマリー】\n")
                 f.write(f"元データレコード数: {validation_summary.get('original_count', 0)}件\n")
                 f.write(f"除外レコード数: {validation_summary.get('excluded_count', 0)}件\n")
                 f.write(f"  - 重複による除外: {validation_summary.get('duplicate_count', 0)}件\n")
                 f.write(f"  - 検証エラーによる除外: {validation_summary.get('excluded_count', 0) - validation_summary.get('duplicate_count', 0)}件\n")
-                f.write(f"出力レコード数: {len(df)}件\n\n")
+                if validation_summary.get("unencodable_count"):
+                    f.write(f"{self.encoding}で表現できない文字を含むセル数: {validation_summary['unencodable_count']}件\n")
+                    if validation_summary.get("unencodable_rejected_count"):
+                        f.write(f"  - 表現できない文字による除外: {validation_summary['unencodable_rejected_count']}件\n")
+                f.write(f"出力レコード数: {stats.rows}件\n\n")
                 
                 f.write("【出力ファイル情報】\n")
-                f.write(f"ファイル名: {get_output_filename()}\n")
-                f.write(f"カラム数: {len(df.columns)}列\n")
-                f.write(f"エンコーディング: {self.encoding}\n\n")
+                output_filename = preview["output_filename"] if preview else get_output_filename(f".{output_format}")
+                f.write(f"ファイル名: {output_filename}\n")
+                if output_parts:
+                    f.write(f"分割ファイル: {len(output_parts)}件（{'、'.join(output_parts)}）\n")
+                f.write(f"カラム数: {column_count or len(get_template_headers() if df is None else df.columns)}列\n")
+                if output_format == "xlsx":
+                    f.write("形式: Excelブック（全セル文字列）\n\n")
+                else:
+                    f.write(f"エンコーディング: {self.encoding}\n\n")
+                
+                if memory_budget:
+                    f.write("【メモリ予算】\n")
+                    f.write(f"メモリ上限: {format_bytes(memory_budget['max_memory_bytes'])}\n")
+                    if memory_budget.get("bytes_per_row") is not None:
+                        f.write(f"1件あたりのメモリ（計測値）: {format_bytes(int(memory_budget['bytes_per_row']))}\n")
+                    sizes = "、".join(f"{rows}件×{count}" for rows, count in memory_budget["used_sizes"])
+                    f.write(f"チャンク行数: {sizes or '-'}\n")
+                    peak = memory_budget["peak_rss_bytes"]
+                    exceeded = "（上限超過）" if peak and peak > memory_budget["max_memory_bytes"] else ""
+                    f.write(f"最大メモリ（RSS）: {format_bytes(peak)}{exceeded}\n\n")
                 
-                # 金額情報のサマリー
-                if "月額賃料" in df.columns:
+                # 金額情報のサマリー（空欄・数値以外は0円として平均）
+                if "月額賃料" in stats.non_empty:
                     f.write("【金額情報サマリー】\n")
-                    numeric_columns = ["月額賃料", "管理費", "駐車場代", "その他費用1", "その他費用2", "管理前滞納額"]
-                    for col in numeric_columns:
-                        if col in df.columns:
-                            # 数値に変換してから計算
-                            numeric_series = pd.to_numeric(df[col], errors='coerce').fillna(0)
-                            total = numeric_series.sum()
-                            avg = numeric_series.mean()
-                            f.write(f"{col}: 合計 {total:,.0f}円, 平均 {avg:,.0f}円\n")
+                    for col in SUMMARY_AMOUNT_COLUMNS:
+                        if col in stats.non_empty:
+                            amount = stats.amounts[col]
+                            line = f"{col}: 合計 {amount['sum']:,.0f}円, 平均 {stats.amount_mean(col):,.0f}円"
+                            if amount["count"]:
+                                line += f", 最小 {amount['min']:,.0f}円, 最大 {amount['max']:,.0f}円"
+                            f.write(line + "\n")
+                    f.write("\n")
+                
+                f.write("【保証人・緊急連絡人】\n")
+                f.write(f"保証人: {stats.roles.get('guarantor', 0)}件\n")
+                f.write(f"緊急連絡人: {stats.roles.get('emergency', 0)}件\n\n")
+                
+                counts = stats.transform_counts
+                f.write("【変換処理】\n")
+                f.write(f"自宅TELを携帯TELに移動（契約者）: {counts.get('phone_moved', 0)}件\n")
+                f.write(f"自宅TELを携帯TELに移動（保証人・緊急連絡人）: {counts.get('contact_phone_moved', 0)}件\n")
+                f.write(f"物件名から部屋番号を抽出: {counts.get('room_extracted', 0)}件\n\n")
+                
+                f.write("【カラム別空欄率】\n")
+                for col in stats.report_columns():
+                    f.write(f"{col}: {stats.empty_rate(col):.1%}\n")
                 
             print(f"\n処理レポートを出力しました: {report_file}")
             return report_file
             
+        except Exception as e:
+            print(f"レポート出力失敗: {e}")
+            return None
+    
+    def create_batch_summary_report(self, results: list,
+                                   output_dir: str = ".") -> Optional[str]:
+        """
+        一括処理（支店別）の統合サマリーレポートを作成
+        
+        Args:
+            results: 支店ごとの処理結果のリスト
+            output_dir: 出力ディレクトリ
+            
+        Returns:
+            レポートファイルのパス
+        """
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        report_file = os.path.join(output_dir, f"batch_summary_{timestamp}.txt")
+        
+        try:
+            os.makedirs(output_dir, exist_ok=True)
+            with open(report_file, "w", encoding="utf-8") as f:
+                f.write("アーク新規登録データ変換 一括処理レポート\n")
+                f.write("=" * 60 + "\n")
+                f.write(f"処理日時: {datetime.now().strftime('%Y/%m/%d %H:%M:%S')}\n")
+                f.write("=" * 60 + "\n\n")
+                
+                for result in results:
+                    f.write(f"【{result['branch']}】\n")
+                    f.write(f"入力ファイル: {os.path.basename(result['report_path'])}\n")
+                    if result.get("error"):
+                        f.write(f"エラー: {result['error']}\n\n")
+                        continue
+                    f.write(f"元データレコード数: {result['original_count']}件\n")
+                    f.write(f"  - 重複による除外: {result['duplicate_count']}件\n")
+                    f.write(f"  - 検証エラーによる除外: {result['excluded_count'] - result['duplicate_count']}件\n")
+                    f.write(f"出力レコード数: {result['output_count']}件\n")
+                    f.write(f"出力ファイル: {result['output_path'] or '（なし）'}\n")
+                    f.write(f"処理時間: {result['elapsed_seconds']:.1f}秒\n\n")
+                
+                f.write("【合計】\n")
+                f.write(f"支店数: {len(results)}件（エラー: {sum(1 for r in results if r.get('error'))}件）\n")
+                f.write(f"元データレコード数: {sum(r['original_count'] for r in results)}件\n")
+                f.write(f"出力レコード数: {sum(r['output_count'] for r in results)}件\n")
+            
+            print(f"\n一括処理レポートを出力しました: {report_file}")
+            return report_file
+            
         except Exception as e:
             print(f"レポート出力失敗: {e}")
             return None
\ No newline at end of file
@@ -1,28 +1,84 @@
 """
 データ読み込みモジュール
+
+pandas・chardetは読み込み時にのみインポートし、ファイル検索だけを行う場合
+（引数エラーやファイル未検出時など）の起動を速くする。
 """
-import pandas as pd
+import fnmatch
 import glob
+import io
 import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from pathlib import Path
-from typing import Tuple, Optional
-import chardet
+from typing import TYPE_CHECKING, Callable, Tuple, Optional, Set, Union, List, Dict, Iterator
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# ContractListの重複判定キー
+CONTRACT_KEY_COLUMN = "引継番号"
+
+# ContractListをストリーミングで読み込む際のチャンク行数
+CONTRACT_KEY_CHUNK_SIZE = 50000
+
+# プレビューの無作為抽出でレポートを走査する際のチャンク行数
+PREVIEW_SAMPLE_CHUNK_SIZE = 50000
+
+# 先頭のみのプレビューで列の型の推論と全件数の概算に使用する先頭の行数
+PREVIEW_HEAD_SAMPLE_ROWS = 10000
+
+# ファイル名から支店名（【東京支店】など）を取得するパターン
+BRANCH_NAME_PATTERN = re.compile(r"【(.+?)】")
+
+# ファイル名に埋め込まれた日付（例: 20250710）を検出するパターン
+FILENAME_DATE_PATTERN = re.compile(r"(?<!\d)(\d{8})")
+
+
+def extract_date_from_filename(filename: str) -> Optional[str]:
+    """
+    ファイル名に含まれる日付（YYYYMMDD）を取得
+    
+    Args:
+        filename: ファイル名（例: "ContractList_20250725.csv"）
+        
+    Returns:
+        日付文字列（YYYYMMDD）、含まれない場合はNone
+    """
+    for match in FILENAME_DATE_PATTERN.finditer(filename):
+        candidate = match.group(1)
+        try:
+            datetime.strptime(candidate, "%Y%m%d")
+            return candidate
+        except ValueError:
+            continue
+    return None
 
 
 class DataLoader:
     """CSVファイルの読み込みを管理するクラス"""
     
-    def __init__(self, encoding: str = "cp932"):
+    def __init__(self, encoding: str = "cp932", stability_wait: float = 0.5):
         self.encoding = encoding
+        # ダウンロード中のファイルを判定するためのサイズ再確認までの待機秒数
+        self.stability_wait = stability_wait
     
     def detect_encoding(self, file_path: str) -> str:
         """ファイルのエンコーディングを検出"""
+        import chardet
         with open(file_path, 'rb') as f:
             result = chardet.detect(f.read())
             return result['encoding']
     
-    def load_csv(self, file_path: str, encoding: Optional[str] = None) -> pd.DataFrame:
-        """CSVファイルを読み込む"""
+    def load_csv(self, file_path: str, encoding: Optional[str] = None,
+                 **read_options) -> "pd.DataFrame":
+        """CSVファイルを読み込む（read_optionsはpandas.read_csvに渡す。例: nrows）"""
+        import pandas as pd
+        
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"ファイルが見つかりません: {file_path}")
         
@@ -32,17 +88,222 @@ class DataLoader:
         
         try:
             # まずは指定されたエンコーディングで読み込み
-            return pd.read_csv(file_path, encoding=encoding)
+            return pd.read_csv(file_path, encoding=encoding, **read_options)
         except UnicodeDecodeError:
             # エラーが発生した場合は、エンコーディングを検出して再試行
             detected_encoding = self.detect_encoding(file_path)
             print(f"エンコーディングエラー。{detected_encoding}で再試行します。")
-            return pd.read_csv(file_path, encoding=detected_encoding)
+            return pd.read_csv(file_path, encoding=detected_encoding, **read_options)
+    
+    def infer_csv_dtypes(self, file_path: str, chunk_size: int,
+                         encoding: Optional[str] = None) -> Dict[str, object]:
+        """
+        ファイル全体を一括で読み込んだ場合と同じ列の型をチャンク単位の走査で求める
+        
+        チャンクごとの型推論では、空欄のみのチャンクが数値型になるなど一括読み込みと
+        型が食い違い、変換結果が変わるため、各チャンクの型を統合して列の型を決定する。
+        
+        Args:
+            file_path: CSVファイルのパス
+            chunk_size: 1チャンクの行数
+            encoding: 文字エンコーディング（Noneの場合はデフォルト）
+            
+        Returns:
+            列名と型の辞書
+        """
+        import pandas as pd
+        from pandas.api.types import is_float_dtype, is_integer_dtype
+        
+        resolved = {}
+        for chunk in pd.read_csv(file_path, encoding=encoding or self.encoding, chunksize=chunk_size):
+            for column, dtype in chunk.dtypes.items():
+                current = resolved.get(column)
+                if current is None or current == dtype:
+                    resolved[column] = dtype
+                elif (is_integer_dtype(current) or is_float_dtype(current)) and \
+                        (is_integer_dtype(dtype) or is_float_dtype(dtype)):
+                    # 整数と欠損値（浮動小数点）の混在は浮動小数点
+                    resolved[column] = "float64"
+                elif is_integer_dtype(current) or is_float_dtype(current):
+                    # 数値と文字列の混在は文字列
+                    resolved[column] = dtype
+        return resolved
+    
+    def iter_csv_chunks(self, file_path: str, chunk_size: int,
+                        encoding: Optional[str] = None,
+                        next_size: Optional[Callable[[], int]] = None) -> Iterator["pd.DataFrame"]:
+        """
+        CSVファイルを指定行数ずつ読み込む（ストリーミング処理用）
+        
+        列の型は一括で読み込んだ場合と一致させる（型の確認のためファイルを2回走査する）。
+        
+        Args:
+            file_path: CSVファイルのパス
+            chunk_size: 1チャンクの行数
+            encoding: 文字エンコーディング（Noneの場合はデフォルト）
+            next_size: 指定した場合は各チャンクの読み込み直前に呼び出し、戻り値を行数とする
+                （処理状況に応じてチャンク行数を変更する場合）
+            
+        Yields:
+            チャンクごとのDataFrame
+        """
+        import pandas as pd
+        
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"ファイルが見つかりません: {file_path}")
+        
+        encoding = encoding or self.encoding
+        dtypes = self.infer_csv_dtypes(file_path, chunk_size, encoding)
+        if next_size is None:
+            yield from pd.read_csv(file_path, encoding=encoding, chunksize=chunk_size, dtype=dtypes)
+            return
+        
+        with pd.read_csv(file_path, encoding=encoding, iterator=True, dtype=dtypes) as reader:
+            while True:
+                try:
+                    yield reader.get_chunk(next_size())
+                except StopIteration:
+                    return
+    
+    def estimate_data_rows(self, file_path: str, sample_rows: int) -> int:
+        """
+        CSVファイルのデータ行数をファイルサイズと先頭の行の平均バイト数から概算（ヘッダー行を除く）
+        
+        ファイル全体を走査せずに件数を求めるための概算で、先頭の行と以降の行の長さが
+        異なる場合や、値に改行を含む行がある場合は誤差が大きくなる。
+        
+        Args:
+            file_path: CSVファイルのパス
+            sample_rows: 平均バイト数の計算に使用する先頭の行数
+            
+        Returns:
+            データ行数の概算
+        """
+        file_size = os.path.getsize(file_path)
+        sampled_rows = 0
+        sampled_bytes = 0
+        with open(file_path, "rb") as f:
+            header_bytes = len(f.readline())
+            for line in f:
+                sampled_rows += 1
+                sampled_bytes += len(line)
+                if sampled_rows >= sample_rows:
+                    break
+        if sampled_bytes == 0:
+            return 0
+        return round((file_size - header_bytes) * sampled_rows / sampled_bytes)
+    
+    def load_report_preview(self, file_path: str,
+                            head: Optional[int] = None,
+                            sample: Optional[int] = None,
+                            seed: Optional[int] = None) -> "pd.DataFrame":
+        """
+        案件取込用レポートの一部のみを読み込む（プレビュー用）
+        
+        headを指定した場合は先頭の行のみを読み込み、sampleを指定した場合はファイル全体を
+        チャンク単位で走査しながらリザーバーサンプリングで無作為に抽出する（元の行順を維持）。
+        
+        headの場合はファイル全体を走査しないため、列の型は先頭の PREVIEW_HEAD_SAMPLE_ROWS 行
+        （headの方が多い場合はhead行）から推論し、ファイル全体の件数はファイルサイズから概算する。
+        sampleの場合は列の型をファイル全体を読み込んだ場合と一致させる。
+        ファイル全体の件数は DataFrame.attrs["source_rows"] に設定し、概算の場合は
+        DataFrame.attrs["source_rows_estimated"] をTrueにする。
+        
+        Args:
+            file_path: 案件取込用レポートのパス
+            head: 先頭から読み込む行数
+            sample: 無作為に抽出する行数
+            seed: 無作為抽出の乱数シード（Noneの場合は毎回異なる）
+            
+        Returns:
+            抽出した行のDataFrame
+        """
+        if head is not None:
+            sample_rows = max(head, PREVIEW_HEAD_SAMPLE_ROWS)
+            leading_df = self.load_csv(file_path, nrows=sample_rows)
+            report_df = leading_df.head(head)
+            if len(leading_df) < sample_rows:
+                # ファイル全体を読み込めた場合は件数が確定
+                report_df.attrs["source_rows"] = len(leading_df)
+                report_df.attrs["source_rows_estimated"] = False
+            else:
+                report_df.attrs["source_rows"] = self.estimate_data_rows(file_path, sample_rows)
+                report_df.attrs["source_rows_estimated"] = True
+            return report_df
+        
+        import random
+        import pandas as pd
+        
+        rng = random.Random(seed)
+        # 抽出中の行番号（リザーバー）と、その行を保持するDataFrame（インデックスは行番号）
+        slots: List[int] = []
+        sampled_df = None
+        total_rows = 0
+        for chunk in self.iter_csv_chunks(file_path, PREVIEW_SAMPLE_CHUNK_SIZE):
+            picked = []
+            for position in range(len(chunk)):
+                row_number = total_rows + position
+                if row_number < sample:
+                    slots.append(row_number)
+                    picked.append(position)
+                    continue
+                slot = rng.randint(0, row_number)
+                if slot < sample:
+                    slots[slot] = row_number
+                    picked.append(position)
+            
+            selected = chunk.iloc[picked]
+            selected.index = [total_rows + position for position in picked]
+            sampled_df = selected if sampled_df is None else pd.concat([sampled_df, selected])
+            # 置き換えられた行を破棄し、保持する行数を抽出件数以内に抑える
+            sampled_df = sampled_df[sampled_df.index.isin(slots)]
+            total_rows += len(chunk)
+        
+        if sampled_df is None:
+            # データ行がない（ヘッダーのみの）ファイル
+            report_df = self.load_csv(file_path, nrows=0)
+        else:
+            # インデックスはファイル上の行番号のまま（エラーログの index に使用）
+            report_df = sampled_df.sort_index()
+        report_df.attrs["source_rows"] = total_rows
+        report_df.attrs["source_rows_estimated"] = False
+        return report_df
+    
+    def load_contract_list(self, file_path: str) -> "pd.DataFrame":
+        """
+        ContractListを読み込む（引継番号は先頭の0が失われないよう文字列として読み込む）
+        
+        Args:
+            file_path: ContractListのパス
+            
+        Returns:
+            ContractListのDataFrame
+        """
+        return self.load_csv(file_path, dtype={CONTRACT_KEY_COLUMN: str})
+    
+    def load_csv_bytes(self, data: bytes, encoding: Optional[str] = None) -> "pd.DataFrame":
+        """CSVのバイト列（アップロードされたファイルなど）を読み込む"""
+        import pandas as pd
+        
+        if encoding is None:
+            encoding = self.encoding
+        
+        try:
+            return pd.read_csv(io.BytesIO(data), encoding=encoding)
+        except UnicodeDecodeError:
+            import chardet
+            detected_encoding = chardet.detect(data)['encoding']
+            print(f"エンコーディングエラー。{detected_encoding}で再試行します。")
+            return pd.read_csv(io.BytesIO(data), encoding=detected_encoding)
     
     def find_latest_file(self, pattern: str, directory: str = ".") -> Optional[str]:
         """
         パターンに一致する最新のファイルを検索
         
+        ファイル名に埋め込まれた日付（例: 20250710）が新しいものを優先し、
+        同じ日付（または日付なし）の場合は更新時刻で比較する。
+        サイズが変化中（ダウンロード中）のファイルはスキップする。
+        
         Args:
             pattern: ファイル名のパターン（例: "【東京支店】①案件取込用レポート*.csv"）
             directory: 検索ディレクトリ
@@ -50,32 +311,242 @@ class DataLoader:
         Returns:
             最新ファイルのパス、見つからない場合はNone
         """
-        search_pattern = os.path.join(directory, pattern)
-        files = glob.glob(search_pattern)
+        return self._select_latest(self.scan_directory(pattern, directory))
+    
+    def find_branch_reports(self, patterns: List[str], directory: str = ".") -> Dict[str, str]:
+        """
+        パターンに一致する案件取込用レポートを支店ごとに検索
         
-        if not files:
+        ファイル名の【】内（例: 東京支店）を支店名とし、支店ごとに最新のファイルを選択する。
+        【】を含まないファイルはパターンごとに最新のファイルを選択し、そのファイル名（拡張子を除く）を
+        支店名とする（支店名は出力先のサブディレクトリ名に使用するため、パターンの * などは含めない）。
+        
+        Args:
+            patterns: ファイル名のパターンのリスト（例: ["【*】①案件取込用レポート*.csv"]）
+            directory: 検索ディレクトリ
+            
+        Returns:
+            {支店名: 最新ファイルのパス} の辞書
+        """
+        # 【】の支店名、または【】を含まないファイルの場合は (パターン,) をキーとして分類
+        grouped = {}
+        seen_paths = set()
+        for pattern in patterns:
+            for candidate in self.scan_directory(pattern, directory):
+                if candidate[0] in seen_paths:
+                    continue
+                seen_paths.add(candidate[0])
+                match = BRANCH_NAME_PATTERN.search(os.path.basename(candidate[0]))
+                key = match.group(1) if match else (pattern,)
+                grouped.setdefault(key, []).append(candidate)
+        
+        reports = {}
+        for key, candidates in grouped.items():
+            latest = self._select_latest(candidates)
+            if latest is None:
+                continue
+            branch = key if isinstance(key, str) else os.path.splitext(os.path.basename(latest))[0]
+            reports[branch] = latest
+        return dict(sorted(reports.items()))
+    
+    def _select_latest(self, candidates: list) -> Optional[str]:
+        """
+        候補ファイルから書き込みが完了している最新のファイルを選択
+        
+        Args:
+            candidates: scan_directoryが返す (パス, ファイル名の日付, stat結果) のリスト
+            
+        Returns:
+            最新ファイルのパス、該当なしの場合はNone
+        """
+        if not candidates:
             return None
         
-        # ファイルを更新時刻でソート（最新が最後）
-        files.sort(key=lambda x: os.path.getmtime(x))
-        return files[-1]
+        # ファイル名の日付 → 更新時刻の順でソート（最新が先頭）
+        candidates.sort(key=lambda c: (c[1] or "", c[2].st_mtime), reverse=True)
+        
+        for path, file_date, stat_result in candidates:
+            if not self.is_stable(path, stat_result):
+                print(f"書き込み中のためスキップ: {os.path.basename(path)}")
+                continue
+            
+            if file_date:
+                reason = f"ファイル名の日付 {file_date} が最新"
+            else:
+                reason = "ファイル名に日付がないため更新日時が最新のものを選択"
+            same_date = [c for c in candidates if c[1] == file_date]
+            if file_date and len(same_date) > 1:
+                reason += "（同日付のファイルは更新日時で判定）"
+            print(f"選択ファイル: {os.path.basename(path)} - {reason}")
+            return path
+        
+        return None
     
-    def load_input_files(self, 
-                        report_path: Optional[str] = None,
-                        contract_list_path: Optional[str] = None,
-                        downloads_dir: str = r"C:\Users\user04\Downloads") -> Tuple[pd.DataFrame, pd.DataFrame]:
+    def scan_directory(self, pattern: str, directory: str) -> list:
         """
-        入力ファイルを読み込む
+        ディレクトリを走査してパターンに一致するファイルを収集
+        
+        Returns:
+            (パス, ファイル名の日付, stat結果) のリスト
+        """
+        if not os.path.isdir(directory):
+            return []
+        
+        candidates = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if not fnmatch.fnmatch(entry.name, pattern):
+                    continue
+                try:
+                    if not entry.is_file():
+                        continue
+                    # DirEntry.stat() の結果はキャッシュされるため再利用する
+                    stat_result = entry.stat()
+                except OSError:
+                    continue
+                candidates.append((entry.path, extract_date_from_filename(entry.name), stat_result))
+        
+        return candidates
+    
+    def is_stable(self, path: str, stat_result: os.stat_result) -> bool:
+        """
+        ファイルサイズが変化していない（書き込みが完了している）かを確認
+        
+        直近に更新されたファイルはstability_wait秒待機してサイズを再確認するため、
+        リクエスト処理などの待機できない処理からは呼び出さないこと。
+        
+        Args:
+            path: ファイルのパス
+            stat_result: 確認前に取得したstat結果
+            
+        Returns:
+            書き込みが完了している場合True
+        """
+        if self.stability_wait <= 0:
+            return True
+        
+        # 直近に更新されていないファイルは待機せずに完了とみなす
+        if time.time() - stat_result.st_mtime > self.stability_wait:
+            return True
+        
+        time.sleep(self.stability_wait)
+        try:
+            return os.stat(path).st_size == stat_result.st_size
+        except OSError:
+            return False
+    
+    def _read_contract_keys(self, file_path: str) -> Optional[Set[str]]:
+        """
+        1つのContractListから引継番号のみをストリーミングで抽出
+        
+        Args:
+            file_path: ContractListのパス
+            
+        Returns:
+            引継番号の集合（引継番号列がない場合はNone）
+        """
+        import pandas as pd
+        
+        def read_keys(encoding: str) -> Optional[Set[str]]:
+            # 列の有無はヘッダーで判定し、読み込みエラー（破損・文字コード）はそのまま送出する
+            header = pd.read_csv(file_path, encoding=encoding, nrows=0)
+            if CONTRACT_KEY_COLUMN not in header.columns:
+                return None
+            
+            keys = set()
+            reader = pd.read_csv(
+                file_path,
+                encoding=encoding,
+                usecols=[CONTRACT_KEY_COLUMN],
+                dtype=str,
+                chunksize=CONTRACT_KEY_CHUNK_SIZE
+            )
+            for chunk in reader:
+                keys.update(chunk[CONTRACT_KEY_COLUMN].dropna().str.strip())
+            keys.discard("")
+            return keys
+        
+        try:
+            return read_keys(self.encoding)
+        except UnicodeDecodeError:
+            detected_encoding = self.detect_encoding(file_path)
+            print(f"エンコーディングエラー。{detected_encoding}で再試行します: {os.path.basename(file_path)}")
+            return read_keys(detected_encoding)
+    
+    def find_contract_lists(self, pattern: str, directory: str = ".") -> List[str]:
+        """
+        パターンに一致するすべてのContractListを検索
+        
+        Args:
+            pattern: ファイル名のパターン（例: "ContractList_*.csv"）
+            directory: 検索ディレクトリ（パターンが絶対パスの場合は無視）
+            
+        Returns:
+            ファイルパスのリスト（名前順）
+        """
+        files = sorted(glob.glob(os.path.join(directory, pattern)))
+        if not files:
+            raise FileNotFoundError(
+                f"ContractListが見つかりません: {os.path.join(directory, pattern)}"
+            )
+        return files
+    
+    def load_contract_keys(self, files: List[str],
+                          max_workers: Optional[int] = None) -> Set[str]:
+        """
+        複数のContractListから引継番号を集約
+        
+        各ファイルは引継番号列のみをチャンク単位で読み込むため、
+        メモリ使用量はファイルの列数ではなくキー数に比例する。
+        
+        Args:
+            files: ContractListのパスのリスト
+            max_workers: 読み込みスレッド数（Noneの場合は自動）
+            
+        Returns:
+            重複を除いた引継番号の集合
+        """
+        print(f"ContractListを{len(files)}件検出しました。引継番号を集約中...")
+        
+        contract_keys = set()
+        skipped_files = []
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(self._read_contract_keys, path): path for path in files}
+            for future, path in futures.items():
+                keys = future.result()
+                if keys is None:
+                    # 引継番号列が存在しないファイル
+                    skipped_files.append(path)
+                else:
+                    contract_keys.update(keys)
+        
+        for path in skipped_files:
+            print(f"  引継番号列がないためスキップ: {os.path.basename(path)}")
+        
+        return contract_keys
+    
+    def resolve_input_paths(self,
+                           report_path: Optional[str] = None,
+                           contract_list_path: Optional[str] = None,
+                           downloads_dir: str = r"C:\Users\user04\Downloads",
+                           contract_list_glob: Optional[str] = None) -> Tuple[str, List[str]]:
+        """
+        入力ファイルのパスを決定（指定がない場合は自動検索）
         
         Args:
             report_path: 案件取込用レポートのパス（Noneの場合は自動検索）
             contract_list_path: ContractListのパス（Noneの場合は自動検索）
             downloads_dir: ダウンロードディレクトリ
+            contract_list_glob: 指定した場合は一致するすべてのContractListを対象とする
             
         Returns:
-            (案件取込用レポート, ContractList) のDataFrameタプル
+            (案件取込用レポートのパス, ContractListのパスのリスト)
         """
-        # 案件取込用レポートを読み込み
+        # 指定されたファイルの存在を読み込み前に確認
+        for path in (report_path, contract_list_path if contract_list_glob is None else None):
+            if path is not None and not os.path.exists(path):
+                raise FileNotFoundError(f"ファイルが見つかりません: {path}")
+        
         if report_path is None:
             report_path = self.find_latest_file(
                 "【東京支店】①案件取込用レポート*.csv",
@@ -87,7 +558,9 @@ class DataLoader:
                 )
             print(f"案件取込用レポートを検出: {os.path.basename(report_path)}")
         
-        # ContractListを読み込み
+        if contract_list_glob is not None:
+            return report_path, self.find_contract_lists(contract_list_glob, downloads_dir)
+        
         if contract_list_path is None:
             contract_list_path = self.find_latest_file(
                 "ContractList_*.csv",
@@ -99,18 +572,74 @@ class DataLoader:
                 )
             print(f"ContractListを検出: {os.path.basename(contract_list_path)}")
         
+        return report_path, [contract_list_path]
+    
+    def load_input_files(self, 
+                        report_path: Optional[str] = None,
+                        contract_list_path: Optional[str] = None,
+                        downloads_dir: str = r"C:\Users\user04\Downloads",
+                        contract_list_glob: Optional[str] = None,
+                        head: Optional[int] = None,
+                        sample: Optional[int] = None,
+                        seed: Optional[int] = None
+                        ) -> "Tuple[pd.DataFrame, Union[pd.DataFrame, Set[str]]]":
+        """
+        入力ファイルを読み込む
+        
+        Args:
+            report_path: 案件取込用レポートのパス（Noneの場合は自動検索）
+            contract_list_path: ContractListのパス（Noneの場合は自動検索）
+            downloads_dir: ダウンロードディレクトリ
+            contract_list_glob: 指定した場合は一致するすべてのContractListから
+                引継番号の集合を作成する
+            head: 指定した場合はレポートの先頭の行のみを読み込む（プレビュー用）
+            sample: 指定した場合はレポートから無作為に抽出した行のみを読み込む（プレビュー用）
+            seed: 無作為抽出の乱数シード
+            
+        Returns:
+            (案件取込用レポート, ContractList) のタプル
+            （contract_list_glob指定時はContractListの代わりに引継番号の集合）
+        """
+        report_path, contract_list_paths = self.resolve_input_paths(
+            report_path, contract_list_path, downloads_dir, contract_list_glob
+        )
+        
+        # 複数のContractListを集約する場合
+        if contract_list_glob is not None:
+            contract_keys = self.load_contract_keys(contract_list_paths)
+            
+            print("ファイルを読み込み中...")
+            report_df = self._load_report(report_path, head, sample, seed)
+            print(f"ContractList引継番号（重複除去後）: {len(contract_keys)}件")
+            
+            return report_df, contract_keys
+        
         # ファイルを読み込み
         print("ファイルを読み込み中...")
-        report_df = self.load_csv(report_path)
-        contract_list_df = self.load_csv(contract_list_path)
+        report_df = self._load_report(report_path, head, sample, seed)
+        contract_list_df = self.load_contract_list(contract_list_paths[0])
         
-        print(f"案件取込用レポート: {len(report_df)}件")
         print(f"ContractList: {len(contract_list_df)}件")
         
         return report_df, contract_list_df
     
+    def _load_report(self, report_path: str, head: Optional[int],
+                     sample: Optional[int], seed: Optional[int]) -> "pd.DataFrame":
+        """案件取込用レポートを読み込んで件数を表示（head・sample指定時は一部のみ）"""
+        if head is None and sample is None:
+            report_df = self.load_csv(report_path)
+            print(f"案件取込用レポート: {len(report_df)}件")
+            return report_df
+        
+        report_df = self.load_report_preview(report_path, head=head, sample=sample, seed=seed)
+        method = "先頭" if head is not None else "無作為抽出"
+        approximate = "約" if report_df.attrs["source_rows_estimated"] else ""
+        print(f"案件取込用レポート: {len(report_df)}件"
+              f"（プレビュー: {method}、全{approximate}{report_df.attrs['source_rows']}件）")
+        return report_df
+    
     def load_sample_output(self, sample_path: Optional[str] = None,
-                          downloads_dir: str = r"C:\Users\user04\Downloads") -> Optional[pd.DataFrame]:
+                          downloads_dir: str = r"C:\Users\user04\Downloads") -> "Optional[pd.DataFrame]":
         """
         サンプル出力ファイルを読み込む（カラム構造の参照用）
         
@@ -128,4 +657,111 @@ class DataLoader:
             print(f"サンプルファイルを読み込み: {os.path.basename(sample_path)}")
             return self.load_csv(sample_path)
         
-        return None
\ No newline at end of file
+        return None
+
+
+class ContractKeyIndex:
+    """ContractListの引継番号インデックスを常駐保持するクラス"""
+    
+    def __init__(self, loader: DataLoader, directory: str,
+                 pattern: Optional[str] = None):
+        """
+        初期化
+        
+        Args:
+            loader: ファイル読み込みに使用するDataLoader
+            directory: ContractListの配置ディレクトリ
+            pattern: 指定した場合は一致するすべてのContractListを使用
+                （Noneの場合は最新のContractListのみを初期読み込み）
+        """
+        self.loader = loader
+        self.directory = directory
+        self.pattern = pattern or "ContractList_*.csv"
+        self.use_all = pattern is not None
+        self.loaded_paths: Set[str] = set()
+        self.keys: frozenset = frozenset()
+        self._lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._stop_refresh = threading.Event()
+    
+    def load(self):
+        """初期インデックスを作成"""
+        if self.use_all:
+            paths = self.loader.find_contract_lists(self.pattern, self.directory)
+        else:
+            latest = self.loader.find_latest_file(self.pattern, self.directory)
+            if latest is None:
+                raise FileNotFoundError(
+                    f"ContractListが見つかりません。{self.directory}に配置してください。"
+                )
+            paths = [latest]
+        self.add_files(paths)
+        
+        # 起動時に存在するContractListは読み込み済みとして扱い、以降は新規配置分のみ追加する
+        with self._lock:
+            for path, _, _ in self.loader.scan_directory(self.pattern, self.directory):
+                self.loaded_paths.add(path)
+    
+    def add_files(self, paths: List[str]):
+        """
+        ContractListの引継番号をインデックスに追加
+        
+        読み取り側が一貫した集合を参照できるよう、新しい集合に差し替える。
+        """
+        with self._lock:
+            new_paths = [path for path in paths if path not in self.loaded_paths]
+            if not new_paths:
+                return
+            self.keys = self.keys | self.loader.load_contract_keys(new_paths)
+            self.loaded_paths.update(new_paths)
+        print(f"ContractListインデックスを更新しました: 引継番号 {len(self.keys)}件")
+    
+    def find_new_files(self) -> List[Tuple[str, os.stat_result]]:
+        """未読み込みのContractListを (パス, stat結果) のリストで取得"""
+        return [
+            (path, stat_result)
+            for path, _, stat_result in self.loader.scan_directory(self.pattern, self.directory)
+            if path not in self.loaded_paths
+        ]
+    
+    def refresh(self):
+        """書き込みが完了した新しいContractListをインデックスに追加（書き込み中の確認で待機する場合あり）"""
+        ready = [
+            path for path, stat_result in self.find_new_files()
+            if stat_result.st_size > 0 and self.loader.is_stable(path, stat_result)
+        ]
+        if ready:
+            self.add_files(ready)
+    
+    def start_refresh(self, interval: float):
+        """
+        バックグラウンドのスレッドで一定間隔ごとにrefresh()を実行
+        
+        書き込み中の確認の待機や読み込みを呼び出し元（リクエスト処理など）で行わないため、
+        インデックスの参照側は keys を読むだけでよい。
+        
+        Args:
+            interval: 実行間隔（秒）
+        """
+        if self._refresh_thread is not None:
+            return
+        self._stop_refresh.clear()
+        
+        def run():
+            while not self._stop_refresh.wait(interval):
+                try:
+                    self.refresh()
+                except Exception as e:
+                    # 読み込みに失敗したファイルは次回の実行で再度確認する
+                    print(f"ContractListインデックスの更新に失敗しました: {e}")
+        
+        self._refresh_thread = threading.Thread(target=run, name="contract-index-refresh", daemon=True)
+        self._refresh_thread.start()
+    
+    def stop_refresh(self):
+        """start_refresh()で開始したスレッドを停止"""
+        if self._refresh_thread is None:
+            return
+        self._stop_refresh.set()
+        self._refresh_thread.join()
+        self._refresh_thread = None
\ No newline at end of file
@@ -1,6 +1,8 @@
 """
 データ変換モジュール
 """
+import logging
+from collections import Counter
 import pandas as pd
 from typing import Dict, Any, Optional
 from config import OUTPUT_COLUMNS, FIXED_VALUES, COLUMN_MAPPINGS, ADDRESS_SPLIT_TARGETS
@@ -11,6 +13,8 @@ from utils import (
     safe_str_convert, safe_int_convert, convert_room_number, extract_room_number_from_property_name
 )
 from address_splitter import AddressSplitter
+from event_log import get_event_log
+from error_sink import get_error_sink, STAGE_TRANSFORM
 
 
 class DataTransformer:
@@ -54,8 +58,9 @@ class DataTransformer:
         
         return value
     
-    def process_phone_numbers(self, row: pd.Series) -> Dict[str, str]:
-        """電話番号の条件付き処理"""
+    def process_phone_numbers(self, row: pd.Series,
+                              events: Optional[Counter] = None) -> Dict[str, str]:
+        """電話番号の条件付き処理（eventsを指定した場合は携帯TELへの移動を件数に加算）"""
         home_tel = safe_str_convert(row.get("自宅TEL1", ""))
         mobile_tel = safe_str_convert(row.get("携帯TEL1", ""))
         
@@ -65,23 +70,29 @@ class DataTransformer:
         
         # 自宅TELのみの場合、携帯TELに移動
         if home_tel and not mobile_tel:
+            if events is not None:
+                events["phone_moved"] += 1
             return {"home": "", "mobile": home_tel}
         
         return {"home": home_tel, "mobile": mobile_tel}
     
-    def process_phone_numbers_for_contact(self, home_tel: str, mobile_tel: str) -> Dict[str, str]:
-        """保証人・緊急連絡人用の電話番号処理"""
+    def process_phone_numbers_for_contact(self, home_tel: str, mobile_tel: str,
+                                          events: Optional[Counter] = None) -> Dict[str, str]:
+        """保証人・緊急連絡人用の電話番号処理（eventsを指定した場合は携帯TELへの移動を件数に加算）"""
         # 電話番号を正規化
         home_tel = normalize_phone_number(home_tel)
         mobile_tel = normalize_phone_number(mobile_tel)
         
         # 自宅TELのみの場合、携帯TELに移動
         if home_tel and not mobile_tel:
+            if events is not None:
+                events["contact_phone_moved"] += 1
             return {"home": "", "mobile": home_tel}
         
         return {"home": home_tel, "mobile": mobile_tel}
     
-    def process_guarantor_emergency(self, row: pd.Series) -> Dict[str, Dict[str, str]]:
+    def process_guarantor_emergency(self, row: pd.Series,
+                                    events: Optional[Counter] = None) -> Dict[str, Dict[str, str]]:
         """保証人/緊急連絡人の判定と処理"""
         result = {
             "guarantor1": {},
@@ -95,7 +106,8 @@ class DataTransformer:
             # 保証人の電話番号処理（主契約者と同じロジック）
             phone_numbers = self.process_phone_numbers_for_contact(
                 safe_str_convert(row.get("自宅TEL2", "")),
-                safe_str_convert(row.get("携帯TEL2", ""))
+                safe_str_convert(row.get("携帯TEL2", "")),
+                events
             )
             
             # 保証人情報を設定
@@ -124,7 +136,8 @@ class DataTransformer:
             # 緊急連絡人の電話番号処理（主契約者と同じロジック）
             phone_numbers = self.process_phone_numbers_for_contact(
                 safe_str_convert(row.get("自宅TEL2", "")),
-                safe_str_convert(row.get("携帯TEL2", ""))
+                safe_str_convert(row.get("携帯TEL2", "")),
+                events
             )
             
             # 緊急連絡人情報を設定
@@ -150,8 +163,17 @@ class DataTransformer:
         
         return result
     
-    def transform_row(self, row: pd.Series) -> Dict[str, Any]:
-        """1行のデータを変換"""
+    def transform_row(self, row: pd.Series, events: Optional[Counter] = None) -> Dict[str, Any]:
+        """
+        1行のデータを変換
+        
+        Args:
+            row: 案件取込用レポートの1行
+            events: 指定した場合は電話番号の移動・部屋番号の抽出の件数を加算（処理レポート用）
+            
+        Returns:
+            出力カラム名と値の辞書
+        """
         output_row = {}
         
         # 固定値を設定
@@ -171,7 +193,7 @@ class DataTransformer:
                     output_row[output_col] = safe_str_convert(value)
         
         # 電話番号の条件付き処理
-        phone_numbers = self.process_phone_numbers(row)
+        phone_numbers = self.process_phone_numbers(row, events)
         output_row["契約者TEL自宅"] = phone_numbers["home"]
         output_row["契約者TEL携帯"] = phone_numbers["mobile"]
         
@@ -185,6 +207,8 @@ class DataTransformer:
         # 部屋番号の決定：元の部屋番号が空の場合は抽出した部屋番号を使用
         final_room_number = original_room_number if original_room_number else extracted_room_number
         final_building_name = cleaned_building_name if extracted_room_number else original_building_name
+        if extracted_room_number and not original_room_number and events is not None:
+            events["room_extracted"] += 1
         
         # 出力に設定
         output_row["物件名"] = final_building_name
@@ -219,7 +243,7 @@ class DataTransformer:
             output_row["契約者勤務先住所3"] = work_addr_parts["remainder"]
         
         # 保証人/緊急連絡人処理
-        guarantor_emergency = self.process_guarantor_emergency(row)
+        guarantor_emergency = self.process_guarantor_emergency(row, events)
         
         # 保証人１（全角数字）
         if guarantor_emergency["guarantor1"] and guarantor_emergency["guarantor1"].get("氏名"):
@@ -271,16 +295,30 @@ class DataTransformer:
         return output_row
     
     def transform_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
-        """DataFrameを変換"""
+        """DataFrameを変換（出力のインデックスは変換元の行のインデックス）"""
         output_data = []
+        source_indices = []
+        event_log = get_event_log()
+        error_sink = get_error_sink()
+        transform_counts = Counter()
         
         for idx, row in df.iterrows():
+            # 変換に失敗した行の件数は含めないよう、行ごとに集計してから加算する
+            row_events = Counter()
             try:
-                transformed_row = self.transform_row(row)
+                transformed_row = self.transform_row(row, row_events)
                 output_data.append(transformed_row)
+                source_indices.append(idx)
+                transform_counts.update(row_events)
             except Exception as e:
-                print(f"行 {idx} の変換中にエラー: {e}")
+                error_sink.record(STAGE_TRANSFORM, f"変換中にエラー: {e}", index=idx,
+                                  contract_number=row.get("契約番号", ""))
+                event_log.event(
+                    "変換エラー", f"行 {idx} の変換中にエラー: {e}", logging.WARNING,
+                    index=idx, contract_number=row.get("契約番号", ""), error=str(e)
+                )
                 continue
+        event_log.print_omitted("変換エラー")
         
         # 出力DataFrameを作成
         output_df = pd.DataFrame(output_data)
@@ -299,11 +337,19 @@ class DataTransformer:
         
         # 一時的にカラム名を使用してDataFrameを作成
         temp_columns = [f"col_{i}" for i in range(len(self.output_columns))]
-        final_df = pd.DataFrame(final_data, columns=temp_columns)
+        final_df = pd.DataFrame(final_data, columns=temp_columns, index=source_indices)
         
         # 実際のカラム名をセット（pandasの自動リネームを回避）
         final_df.columns = self.output_columns
         
+        # 電話番号の移動・部屋番号の抽出の件数（処理レポート用）
+        final_df.attrs["transform_counts"] = dict(transform_counts)
+        # 空欄でないセルの件数（処理レポート用。値はすべて文字列のため空文字との比較のみで数える）
+        final_df.attrs["non_empty_counts"] = {
+            "rows": len(final_df),
+            "counts": [int(count) for count in (final_df.to_numpy(dtype=object) != "").sum(axis=0)]
+        }
+        
         print(f"変換完了: {len(final_df)}件のレコード")
         
         return final_df
\ No newline at end of file
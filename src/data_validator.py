@@ -3,8 +3,10 @@
 """
 import pandas as pd
 from datetime import datetime
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Set, Union
 from config import VALIDATION_RULES
+from event_log import get_event_log
+from error_sink import get_error_sink, STAGE_VALIDATE
 
 
 class DataValidator:
@@ -12,7 +14,6 @@ class DataValidator:
     
     def __init__(self):
         self.rules = VALIDATION_RULES
-        self.error_log = []
     
     def validate_birthdate(self, date_str: str) -> bool:
         """
@@ -48,22 +49,40 @@ class DataValidator:
         except Exception:
             return False
     
+    def get_existing_numbers(self, contract_list: Union[pd.DataFrame, Set[str]]) -> Set[str]:
+        """
+        ContractListから既存の引継番号の集合を取得
+        
+        Args:
+            contract_list: ContractListのDataFrame、または引継番号の集合
+            
+        Returns:
+            引継番号の集合
+        """
+        if not isinstance(contract_list, pd.DataFrame):
+            return contract_list
+        
+        if "引継番号" in contract_list.columns:
+            # 引継番号の集合（load_contract_keys）と同じく、文字列の前後の空白を除いて比較する
+            numbers = set(contract_list["引継番号"].dropna().astype(str).str.strip())
+            numbers.discard("")
+            return numbers
+        return set()
+    
     def check_duplicates(self, report_df: pd.DataFrame, 
-                        contract_list_df: pd.DataFrame) -> Tuple[pd.DataFrame, List[str]]:
+                        contract_list_df: Union[pd.DataFrame, Set[str]]) -> Tuple[pd.DataFrame, List[str]]:
         """
         重複チェックを実行
         
         Args:
             report_df: 案件取込用レポートのDataFrame
-            contract_list_df: ContractListのDataFrame
+            contract_list_df: ContractListのDataFrame、または引継番号の集合
             
         Returns:
-            (重複を除外したDataFrame, 除外された契約番号リスト)
+            (重複を除外したDataFrame（インデックスは入力のまま）, 除外された契約番号リスト)
         """
         # ContractListの引継番号リストを取得
-        existing_numbers = set()
-        if "引継番号" in contract_list_df.columns:
-            existing_numbers = set(contract_list_df["引継番号"].dropna().astype(str))
+        existing_numbers = self.get_existing_numbers(contract_list_df)
         
         # 案件取込用レポートの契約番号をチェック
         duplicates = []
@@ -84,13 +103,14 @@ class DataValidator:
         
         if duplicates:
             print(f"重複データを{len(duplicates)}件除外しました")
-            for num in duplicates[:5]:  # 最初の5件を表示
-                print(f"  - 契約番号: {num}")
-            if len(duplicates) > 5:
-                print(f"  ... 他{len(duplicates) - 5}件")
+            # 全件はログファイル、コンソールには先頭の数件のみ表示
+            event_log = get_event_log()
+            for num in duplicates:
+                event_log.event("重複除外", f"契約番号: {num}", contract_number=num)
+            event_log.print_omitted("重複除外")
         
         # 重複を除外したDataFrameを返す
-        filtered_df = report_df.loc[keep_indices].reset_index(drop=True)
+        filtered_df = report_df.loc[keep_indices]
         
         return filtered_df, duplicates
     
@@ -102,7 +122,7 @@ class DataValidator:
             df: 検証するDataFrame
             
         Returns:
-            有効なレコードのみのDataFrame
+            有効なレコードのみのDataFrame（インデックスは入力のまま）
         """
         required_fields = self.rules["required_fields"]
         
@@ -116,8 +136,9 @@ class DataValidator:
             raise ValueError(f"必須カラムが不足しています: {missing_columns}")
         
         # 必須フィールドが空でないレコードのみ抽出
-        valid_mask = pd.Series([True] * len(df))
+        valid_mask = pd.Series(True, index=df.index)
         invalid_records = []
+        error_sink = get_error_sink()
         
         for field in required_fields:
             field_mask = df[field].notna() & (df[field] != "")
@@ -126,18 +147,18 @@ class DataValidator:
             for idx in invalid_indices:
                 if idx not in invalid_records:
                     invalid_records.append(idx)
-                    self.error_log.append({
-                        "index": idx,
-                        "field": field,
-                        "reason": "必須フィールドが空"
-                    })
+                    error_sink.record(
+                        STAGE_VALIDATE, "必須フィールドが空", index=idx,
+                        contract_number=df.at[idx, "契約番号"] if "契約番号" in df.columns else None,
+                        field=field, value=df.at[idx, field]
+                    )
             
             valid_mask &= field_mask
         
         if invalid_records:
             print(f"必須フィールドが空のレコードを{len(invalid_records)}件除外しました")
         
-        return df[valid_mask].reset_index(drop=True)
+        return df[valid_mask]
     
     def validate_birthdates(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -186,24 +207,40 @@ class DataValidator:
         
         if corrected_records:
             print(f"異常な生年月日を持つ{len(corrected_records)}件のフィールドを空白に修正しました")
-            for record in corrected_records:  # 全件表示
-                print(f"  - 契約番号: {record['contract_number']}, 元の値: {record['original_birthdate']}, フィールド: {record['field']}")
+            # 全件はログファイル、コンソールには先頭の数件のみ表示
+            event_log = get_event_log()
+            error_sink = get_error_sink()
+            for record in corrected_records:
+                error_sink.record(
+                    STAGE_VALIDATE, "異常な生年月日を空白に修正", index=record["index"],
+                    contract_number=record["contract_number"], field=record["field"],
+                    value=record["original_birthdate"]
+                )
+                event_log.event(
+                    "生年月日修正",
+                    f"契約番号: {record['contract_number']}, 元の値: {record['original_birthdate']}, フィールド: {record['field']}",
+                    **record
+                )
+            event_log.print_omitted("生年月日修正")
         
         return df_corrected
     
     def validate_all(self, report_df: pd.DataFrame, 
-                    contract_list_df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+                    contract_list_df: Union[pd.DataFrame, Set[str]]) -> Tuple[pd.DataFrame, Dict[str, Any]]:
         """
         すべての検証を実行
         
+        検証済みDataFrameのインデックスは入力のまま保持する。入力のインデックスを
+        ファイル上の行番号（0始まり、ヘッダーを除く）としておくと、エラーログの
+        index は入力ファイルの行番号になる（チャンク単位の変換でも同じ）。
+        
         Args:
             report_df: 案件取込用レポートのDataFrame
-            contract_list_df: ContractListのDataFrame
+            contract_list_df: ContractListのDataFrame、または引継番号の集合
             
         Returns:
             (検証済みDataFrame, 検証結果サマリー)
         """
-        self.error_log = []
         original_count = len(report_df)
         
         # 1. 必須フィールドの検証
@@ -220,8 +257,7 @@ class DataValidator:
             "original_count": original_count,
             "validated_count": len(validated_df),
             "excluded_count": original_count - len(validated_df),
-            "duplicate_count": len(duplicates),
-            "error_log": self.error_log
+            "duplicate_count": len(duplicates)
         }
         
         print(f"\n検証結果サマリー:")
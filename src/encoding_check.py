@@ -0,0 +1,157 @@
+"""
+文字エンコーディング検査モジュール
+
+出力前に、出力の文字エンコーディング（cp932）で表現できない文字を含むセルを
+カラム単位でまとめて検出し、指定した方式（--unencodable）で置換・除外する。
+書き込みの途中で UnicodeEncodeError により出力全体が失敗することを防ぎ、
+該当した引継番号・カラム・元の値はエラーログと処理ログに記録する。
+"""
+import logging
+from typing import Dict, Optional, Tuple
+import numpy as np
+import pandas as pd
+from config import CP932_SUBSTITUTIONS, DEFAULT_UNENCODABLE_POLICY, UNENCODABLE_POLICIES
+from event_log import get_event_log
+from error_sink import get_error_sink, STAGE_EXPORT
+
+
+# 置換表にない文字・questionで使用する代替文字
+REPLACEMENT_CHAR = "?"
+
+# 処理ログの区分
+EVENT_CATEGORIES = {
+    "substitute": "文字コード置換",
+    "question": "文字コード置換",
+    "reject": "文字コード除外"
+}
+
+
+def _is_encodable(text: str, encoding: str) -> bool:
+    try:
+        text.encode(encoding)
+        return True
+    except UnicodeEncodeError:
+        return False
+
+
+def find_unencodable(df: pd.DataFrame, encoding: str = "cp932") -> np.ndarray:
+    """
+    出力の文字エンコーディングで表現できない文字を含むセルを検出
+    
+    カラムごとに重複を除いた値をまとめてエンコードし、失敗したカラムのみ値ごとに判定する。
+    数値型のカラムは検査しない。
+    
+    Args:
+        df: 出力するDataFrame（カラム名の重複を含んでもよい）
+        encoding: 出力の文字エンコーディング
+    
+    Returns:
+        該当するセルをTrueとした (行数, カラム数) の真偽値配列
+    """
+    mask = np.zeros(df.shape, dtype=bool)
+    for position in range(df.shape[1]):
+        series = df.iloc[:, position]
+        if pd.api.types.is_numeric_dtype(series.dtype) or pd.api.types.is_bool_dtype(series.dtype):
+            continue
+        values = series.dropna().unique()
+        texts = [value if isinstance(value, str) else str(value) for value in values]
+        # ほとんどのカラムは全件まとめたエンコードが成功するため値ごとの判定を省略
+        if _is_encodable("".join(texts), encoding):
+            continue
+        invalid = [value for value, text in zip(values, texts) if not _is_encodable(text, encoding)]
+        mask[:, position] = series.isin(invalid).to_numpy()
+    return mask
+
+
+def replace_unencodable(text: str, policy: str = DEFAULT_UNENCODABLE_POLICY,
+                        encoding: str = "cp932",
+                        substitutions: Optional[Dict[str, str]] = None) -> str:
+    """
+    表現できない文字を置き換えた文字列を取得
+    
+    Args:
+        text: 元の文字列
+        policy: "substitute"（置換表の文字、置換表にない場合は"?"）または "question"（"?"）
+        encoding: 出力の文字エンコーディング
+        substitutions: 置換表（Noneの場合はconfig.pyのCP932_SUBSTITUTIONS）
+    
+    Returns:
+        置き換え後の文字列
+    """
+    if substitutions is None:
+        substitutions = CP932_SUBSTITUTIONS
+    replaced = []
+    for char in text:
+        if _is_encodable(char, encoding):
+            replaced.append(char)
+        elif policy == "substitute" and char in substitutions:
+            replaced.append(substitutions[char])
+        else:
+            replaced.append(REPLACEMENT_CHAR)
+    return "".join(replaced)
+
+
+def apply_unencodable_policy(df: pd.DataFrame,
+                             policy: str = DEFAULT_UNENCODABLE_POLICY,
+                             encoding: str = "cp932",
+                             substitutions: Optional[Dict[str, str]] = None) -> Tuple[pd.DataFrame, int]:
+    """
+    表現できない文字を含むセルを置換、またはそのレコードを除外
+    
+    Args:
+        df: 出力するDataFrame
+        policy: "substitute"・"question"・"reject" のいずれか
+        encoding: 出力の文字エンコーディング
+        substitutions: substituteで使用する置換表（Noneの場合はconfig.pyのCP932_SUBSTITUTIONS）
+    
+    Returns:
+        (処理後のDataFrame, 該当したセル数)
+    """
+    if policy not in UNENCODABLE_POLICIES:
+        raise ValueError(f"不明な方式です: {policy}")
+    
+    mask = find_unencodable(df, encoding)
+    if not mask.any():
+        return df, 0
+    
+    event_log = get_event_log()
+    error_sink = get_error_sink()
+    category = EVENT_CATEGORIES[policy]
+    columns = list(df.columns)
+    contract_numbers = df.iloc[:, columns.index("引継番号")] if "引継番号" in columns else None
+    df = df.copy()
+    # セルの置換・レコードの除外により変換時に数えた空欄でないセルの件数は使えなくなる
+    df.attrs = {key: value for key, value in df.attrs.items() if key != "non_empty_counts"}
+    affected = 0
+    
+    for row, position in zip(*np.nonzero(mask)):
+        column = df.columns[position]
+        text = str(df.iat[row, position])
+        chars = "".join(dict.fromkeys(char for char in text if not _is_encodable(char, encoding)))
+        if policy == "reject":
+            reason = f"{encoding}で表現できない文字（{chars}）を含むためレコードを除外"
+        else:
+            replaced = replace_unencodable(text, policy, encoding, substitutions)
+            df.iat[row, position] = replaced
+            reason = f"{encoding}で表現できない文字（{chars}）を置換"
+        
+        contract_number = contract_numbers.iat[row] if contract_numbers is not None else ""
+        affected += 1
+        # エラーログには変換元の行のインデックス（入力ファイルの行番号）を記録
+        index = df.index[row]
+        error_sink.record(STAGE_EXPORT, reason, index=index, contract_number=contract_number,
+                          field=column, value=text)
+        event_log.event(
+            category, f"引継番号 {contract_number} の {column}: {reason}", logging.WARNING,
+            index=index, contract_number=contract_number, field=column, chars=chars
+        )
+    
+    rejected = mask.any(axis=1)
+    if policy == "reject":
+        print(f"{encoding}で表現できない文字を含むレコードを{int(rejected.sum())}件除外しました")
+        df = df.iloc[np.flatnonzero(~rejected)]
+    else:
+        print(f"{encoding}で表現できない文字を含むセルを{affected}件置換しました")
+    event_log.print_omitted(category)
+    
+    return df, affected
@@ -0,0 +1,344 @@
+"""
+出力同一性検証モジュール
+
+同じ入力に対して2つの処理方式（エンジン構成）で変換を実行し、出力CSVを行ごとの
+ハッシュで比較する。高速化した処理方式が現行の transform_row /
+_write_csv_with_fixed_header による出力（アークへの取込データの基準）と
+完全に一致することを確認するために使用する。
+
+使用例:
+    python src/equivalence_check.py --report report.csv --contract-list ContractList.csv \\
+        --engine-a reference --engine-b parallel
+    python src/equivalence_check.py --engine-b "chunked,chunk_size=5000" ...
+    python src/equivalence_check.py --compare-files 出力A.csv 出力B.csv
+"""
+import argparse
+import contextlib
+import csv
+import hashlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Any, Dict, List, Optional, Set, Union
+import pandas as pd
+from data_loader import DataLoader
+from data_validator import DataValidator
+from data_transformer import DataTransformer
+from data_exporter import DataExporter
+
+
+# エンジン構成のプリセット
+#   contract_keys: "dataframe"（ContractListをDataFrameで照合）/ "keyset"（引継番号の集合で照合）
+#   chunk_size: 指定した行数ごとに検証・変換（Noneの場合は一括）
+#   jobs: チャンクを並列に処理するプロセス数
+ENGINE_PRESETS = {
+    "reference": {"contract_keys": "dataframe", "chunk_size": None, "jobs": 1},
+    "keyset": {"contract_keys": "keyset", "chunk_size": None, "jobs": 1},
+    "chunked": {"contract_keys": "dataframe", "chunk_size": 10000, "jobs": 1},
+    "parallel": {"contract_keys": "dataframe", "chunk_size": 10000, "jobs": os.cpu_count() or 1}
+}
+
+# 差異として表示する行数の上限
+MAX_REPORTED_DIFFERENCES = 10
+
+# 行のハッシュを求める際のカラムの区切り（CSVの値には含まれない文字）
+FIELD_SEPARATOR = "\0"
+
+
+def parse_engine_config(spec: str) -> Dict[str, Any]:
+    """
+    エンジン構成の指定を解釈
+    
+    Args:
+        spec: プリセット名、または "プリセット名,キー=値,..."（例: "chunked,chunk_size=5000"）
+    
+    Returns:
+        エンジン構成
+    """
+    name, *overrides = [part.strip() for part in spec.split(",")]
+    if name not in ENGINE_PRESETS:
+        raise ValueError(f"不明なエンジン構成です: {name}（{', '.join(ENGINE_PRESETS)}）")
+    
+    config = dict(ENGINE_PRESETS[name], name=spec)
+    for override in overrides:
+        key, _, value = override.partition("=")
+        if key not in ENGINE_PRESETS[name]:
+            raise ValueError(f"不明な設定項目です: {key}")
+        if key in ("chunk_size", "jobs"):
+            config[key] = None if value.lower() == "none" else int(value)
+        else:
+            config[key] = value
+    return config
+
+
+def _convert_chunk(report_df: pd.DataFrame,
+                   contract_list: Union[pd.DataFrame, Set[str]]) -> Optional[pd.DataFrame]:
+    """1チャンク分を検証・変換（有効なレコードがない場合はNone、ワーカープロセスでも実行）"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        validated_df, _ = DataValidator().validate_all(report_df, contract_list)
+        if len(validated_df) == 0:
+            return None
+        return DataTransformer().transform_dataframe(validated_df)
+
+
+def run_engine(config: Dict[str, Any], report_path: str, contract_list_path: str,
+               output_path: str, encoding: str = "cp932") -> Dict[str, Any]:
+    """
+    指定したエンジン構成で変換を実行してCSVを出力
+    
+    Args:
+        config: エンジン構成
+        report_path: 案件取込用レポートのパス
+        contract_list_path: ContractListのパス
+        output_path: 出力ファイルパス
+        encoding: 文字エンコーディング
+    
+    Returns:
+        {"output_path": パス, "output_count": 件数, "elapsed_seconds": 秒}
+    """
+    start_time = time.perf_counter()
+    loader = DataLoader(encoding=encoding)
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        report_df = loader.load_csv(report_path)
+        if config["contract_keys"] == "keyset":
+            contract_list = loader.load_contract_keys([contract_list_path])
+        else:
+            contract_list = loader.load_contract_list(contract_list_path)
+    
+    chunk_size = config["chunk_size"]
+    if chunk_size:
+        chunks = [report_df.iloc[i:i + chunk_size] for i in range(0, len(report_df), chunk_size)]
+    else:
+        chunks = [report_df]
+    
+    if config["jobs"] and config["jobs"] > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=config["jobs"]) as executor:
+            outputs = list(executor.map(_convert_chunk, chunks, repeat(contract_list)))
+    else:
+        outputs = [_convert_chunk(chunk, contract_list) for chunk in chunks]
+    
+    outputs = [output_df for output_df in outputs if output_df is not None and len(output_df) > 0]
+    output_df = pd.concat(outputs, ignore_index=True) if outputs else pd.DataFrame()
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        DataExporter(encoding=encoding).export_to_csv(output_df, output_path=output_path)
+    
+    return {
+        "output_path": output_path,
+        "output_count": len(output_df),
+        "elapsed_seconds": time.perf_counter() - start_time
+    }
+
+
+def read_row_hashes(path: str, encoding: str = "cp932") -> List[bytes]:
+    """
+    出力CSVを行ごとのハッシュのリストとして読み込む（先頭はヘッダー行）
+    
+    ファイルは1行ずつ読み込み、値に改行を含む行も1つのレコードとしてハッシュを求める。
+    """
+    with open(path, "r", newline="", encoding=encoding) as f:
+        return [
+            hashlib.blake2b(FIELD_SEPARATOR.join(row).encode("utf-8"), digest_size=16).digest()
+            for row in csv.reader(f)
+        ]
+
+
+def _read_row_keys(path: str, encoding: str) -> List[str]:
+    """出力CSVの各データ行の引継番号（先頭カラム）を読み込む"""
+    with open(path, "r", newline="", encoding=encoding) as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        return [row[0] if row else "" for row in reader]
+
+
+def _read_rows(path: str, row_numbers: List[int], encoding: str) -> Dict[int, List[str]]:
+    """指定した行番号（0始まり、0はヘッダー）の値を読み込む"""
+    wanted = set(row_numbers)
+    found = {}
+    with open(path, "r", newline="", encoding=encoding) as f:
+        for row_number, row in enumerate(csv.reader(f)):
+            if row_number in wanted:
+                found[row_number] = row
+                if len(found) == len(wanted):
+                    break
+    return found
+
+
+def compare_outputs(path_a: str, path_b: str, encoding: str = "cp932",
+                    max_differences: int = MAX_REPORTED_DIFFERENCES) -> Dict[str, Any]:
+    """
+    2つの出力CSVを行ごとのハッシュで比較
+    
+    Args:
+        path_a: 出力CSV（基準）
+        path_b: 出力CSV（比較対象）
+        encoding: 文字エンコーディング
+        max_differences: 詳細を取得する差異行の上限
+    
+    Returns:
+        比較結果（identical, 行数, 差異行数, 一方にのみ存在する引継番号, 先頭の差異行と差異カラム）
+    """
+    hashes_a = read_row_hashes(path_a, encoding)
+    hashes_b = read_row_hashes(path_b, encoding)
+    
+    differing = [
+        row_number for row_number, (hash_a, hash_b) in enumerate(zip(hashes_a, hashes_b))
+        if hash_a != hash_b
+    ]
+    identical = not differing and len(hashes_a) == len(hashes_b)
+    
+    result = {
+        "identical": identical,
+        "rows_a": max(0, len(hashes_a) - 1),
+        "rows_b": max(0, len(hashes_b) - 1),
+        "differing_row_count": len(differing) + abs(len(hashes_a) - len(hashes_b)),
+        # 行の並び順のみが異なる場合の判定
+        "same_rows_unordered": sorted(hashes_a[1:]) == sorted(hashes_b[1:]),
+        "keys_only_in_a": [],
+        "keys_only_in_b": [],
+        "differences": []
+    }
+    if identical:
+        return result
+    
+    # 行数が異なる場合は位置による比較がずれるため、引継番号の過不足も報告
+    if len(hashes_a) != len(hashes_b):
+        keys_a = _read_row_keys(path_a, encoding)
+        keys_b = _read_row_keys(path_b, encoding)
+        set_a, set_b = set(keys_a), set(keys_b)
+        result["keys_only_in_a"] = [key for key in keys_a if key not in set_b]
+        result["keys_only_in_b"] = [key for key in keys_b if key not in set_a]
+    
+    first_rows = differing[:max_differences]
+    if len(first_rows) < max_differences and len(hashes_a) != len(hashes_b):
+        # 一方にのみ存在する末尾の行
+        extra = range(min(len(hashes_a), len(hashes_b)), max(len(hashes_a), len(hashes_b)))
+        first_rows += list(extra)[:max_differences - len(first_rows)]
+    
+    rows_a = _read_rows(path_a, first_rows + [0], encoding)
+    rows_b = _read_rows(path_b, first_rows, encoding)
+    headers = rows_a.get(0, [])
+    
+    for row_number in first_rows:
+        row_a = rows_a.get(row_number)
+        row_b = rows_b.get(row_number)
+        columns = []
+        if row_a is not None and row_b is not None:
+            for index in range(max(len(row_a), len(row_b))):
+                value_a = row_a[index] if index < len(row_a) else None
+                value_b = row_b[index] if index < len(row_b) else None
+                if value_a != value_b:
+                    columns.append({
+                        "index": index,
+                        "column": headers[index] if index < len(headers) else "",
+                        "a": value_a,
+                        "b": value_b
+                    })
+        result["differences"].append({
+            # ヘッダーを除いたデータ行の番号（1始まり）、0はヘッダー行
+            "row": row_number,
+            "key": (row_a or row_b or [""])[0],
+            "only_in": None if row_a is not None and row_b is not None else ("a" if row_a is not None else "b"),
+            "columns": columns
+        })
+    return result
+
+
+def print_comparison(result: Dict[str, Any], label_a: str = "A", label_b: str = "B"):
+    """比較結果を表示"""
+    print(f"行数: {label_a} {result['rows_a']}件 / {label_b} {result['rows_b']}件")
+    if result["identical"]:
+        print("結果: 一致（全行のハッシュが一致）")
+        return
+    
+    print(f"結果: 不一致（差異行 {result['differing_row_count']}件）")
+    if result["same_rows_unordered"]:
+        print("  ※行の内容は一致しており、並び順のみが異なります")
+    for side, label in (("a", label_a), ("b", label_b)):
+        keys = result[f"keys_only_in_{side}"]
+        if keys:
+            shown = ", ".join(keys[:MAX_REPORTED_DIFFERENCES])
+            print(f"  {label}にのみ存在する引継番号: {len(keys)}件（{shown}{' …' if len(keys) > MAX_REPORTED_DIFFERENCES else ''}）")
+    for difference in result["differences"]:
+        row_label = "ヘッダー行" if difference["row"] == 0 else f"{difference['row']}行目"
+        if difference["only_in"]:
+            only_label = label_a if difference["only_in"] == "a" else label_b
+            print(f"  - {row_label}（引継番号: {difference['key']}）: {only_label}にのみ存在")
+            continue
+        print(f"  - {row_label}（引継番号: {difference['key']}）:")
+        for column in difference["columns"]:
+            print(f"      [{column['index']}] {column['column']}: {label_a}={column['a']!r} / {label_b}={column['b']!r}")
+
+
+def run_equivalence_check(report_path: str, contract_list_path: str,
+                          engine_a: str = "reference", engine_b: str = "parallel",
+                          output_dir: Optional[str] = None,
+                          encoding: str = "cp932") -> Dict[str, Any]:
+    """
+    2つのエンジン構成で変換して出力を比較
+    
+    Args:
+        report_path: 案件取込用レポートのパス
+        contract_list_path: ContractListのパス
+        engine_a: 基準のエンジン構成
+        engine_b: 比較対象のエンジン構成
+        output_dir: 出力CSVの保存先（Noneの場合は一時ディレクトリを使用し、終了後に削除）
+        encoding: 文字エンコーディング
+    
+    Returns:
+        比較結果
+    """
+    config_a = parse_engine_config(engine_a)
+    config_b = parse_engine_config(engine_b)
+    
+    work_dir = output_dir or tempfile.mkdtemp(prefix="ark_equivalence_")
+    os.makedirs(work_dir, exist_ok=True)
+    try:
+        runs = []
+        for label, config in (("a", config_a), ("b", config_b)):
+            run = run_engine(config, report_path, contract_list_path,
+                             os.path.join(work_dir, f"output_{label}.csv"), encoding)
+            print(f"{config['name']}: {run['output_count']}件、{run['elapsed_seconds']:.2f}秒")
+            runs.append(run)
+        
+        result = compare_outputs(runs[0]["output_path"], runs[1]["output_path"], encoding)
+        print_comparison(result, config_a["name"], config_b["name"])
+        return result
+    finally:
+        if output_dir is None:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main():
+    """メイン関数 - 比較を実行（不一致の場合は終了コード1）"""
+    parser = argparse.ArgumentParser(description="2つの処理方式の出力の同一性を検証")
+    parser.add_argument("--report", help="案件取込用レポートのパス")
+    parser.add_argument("--contract-list", help="ContractListのパス")
+    parser.add_argument("--engine-a", help=f"基準のエンジン構成（{', '.join(ENGINE_PRESETS)}）", default="reference")
+    parser.add_argument("--engine-b", help="比較対象のエンジン構成（例: \"chunked,chunk_size=5000\"）", default="parallel")
+    parser.add_argument("--output-dir", help="両方式の出力CSVを保存するディレクトリ（省略時は保存しない）", default=None)
+    parser.add_argument("--compare-files", help="出力済みの2つのCSVを比較", nargs=2, metavar=("A", "B"), default=None)
+    parser.add_argument("--encoding", help="文字エンコーディング", default="cp932")
+    args = parser.parse_args()
+    
+    if args.compare_files:
+        result = compare_outputs(args.compare_files[0], args.compare_files[1], args.encoding)
+        print_comparison(result, *args.compare_files)
+    else:
+        if not args.report or not args.contract_list:
+            parser.error("--report と --contract-list を指定してください")
+        result = run_equivalence_check(
+            args.report, args.contract_list, args.engine_a, args.engine_b,
+            args.output_dir, args.encoding
+        )
+    return 0 if result["identical"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
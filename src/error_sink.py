@@ -0,0 +1,268 @@
+"""
+エラーログモジュール
+
+検証・変換・出力の各段階で発生したレコード単位のエラー（段階・行番号・契約番号・
+フィールド・理由・元の値）を、発生時にバッファ付きでJSON Lines形式のファイル
+（error_log_*.jsonl）へ書き込む。メモリには段階・理由ごとの件数のみ保持する。
+人が読むテキスト形式のエラーログ（error_log_*.txt）はJSON Linesファイルを
+先頭から読みながら作成する（summarize_error_log、単体でも実行可能）。
+
+使用例:
+    python error_sink.py output/error_log_20250725_120000.jsonl
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+
+# JSON Linesファイルへの書き込みバッファのサイズ（バイト）
+ERROR_LOG_BUFFER_SIZE = 64 * 1024
+
+# エラーの発生段階
+STAGE_VALIDATE = "検証"
+STAGE_TRANSFORM = "変換"
+STAGE_EXPORT = "出力"
+
+
+def _json_value(value: Any) -> Any:
+    """JSONで表現できない値（欠損値のNaNなど）を変換"""
+    if isinstance(value, float) and value != value:
+        return None
+    if hasattr(value, "item"):
+        # numpyのスカラー値
+        return value.item()
+    return value
+
+
+class ErrorSink:
+    """レコード単位のエラーをJSON Linesで逐次書き込み、件数のみを集計するクラス"""
+    
+    def __init__(self, path: Optional[str] = None,
+                 buffer_size: int = ERROR_LOG_BUFFER_SIZE,
+                 keep_records: bool = False):
+        """
+        初期化
+        
+        Args:
+            path: JSON Linesファイルのパス（Noneの場合はファイルに書き込まない）
+            buffer_size: 書き込みバッファのサイズ（バイト）
+            keep_records: Trueの場合は記録をメモリにも保持（チャンク単位・1リクエスト単位の収集用）
+        """
+        self.path = path
+        self.buffer_size = buffer_size
+        self.records: Optional[List[Dict[str, Any]]] = [] if keep_records else None
+        self.stage_counts = Counter()
+        self.reason_counts = Counter()
+        self._file = None
+        self._lock = threading.Lock()
+    
+    @property
+    def total(self) -> int:
+        """記録したエラーの件数"""
+        return sum(self.stage_counts.values())
+    
+    def record(self, stage: str, reason: str, index: Any = None, contract_number: Any = None,
+               field: Optional[str] = None, value: Any = None):
+        """
+        エラーを1件記録
+        
+        Args:
+            stage: 発生段階（"検証"・"変換"・"出力"）
+            reason: 理由
+            index: 段階の入力での行番号
+            contract_number: 契約番号（引継番号）
+            field: 対象のフィールド
+            value: 元の値
+        """
+        self.write({
+            "stage": stage,
+            "index": _json_value(index),
+            "contract_number": _json_value(contract_number),
+            "field": field,
+            "reason": reason,
+            "value": _json_value(value)
+        })
+    
+    def write(self, entry: Dict[str, Any]):
+        """記録済みの形式（record()と同じ項目）のエラーを1件書き込み"""
+        with self._lock:
+            self.stage_counts[entry.get("stage")] += 1
+            self.reason_counts[(entry.get("stage"), entry.get("reason"))] += 1
+            if self.records is not None:
+                self.records.append(entry)
+            if self.path is None:
+                return
+            if self._file is None:
+                # エラーがない場合はファイルを作成しない
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8", buffering=self.buffer_size)
+            self._file.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+    
+    def write_all(self, entries: Iterable[Dict[str, Any]]):
+        """複数のエラーを順に書き込み（別のチャンク・プロセスで収集した記録の転記用）"""
+        for entry in entries:
+            self.write(entry)
+    
+    def to_jsonl_bytes(self) -> bytes:
+        """メモリに保持した記録をJSON Linesのバイト列に変換"""
+        return "".join(
+            json.dumps(entry, ensure_ascii=False, default=str) + "\n" for entry in self.records or []
+        ).encode("utf-8")
+    
+    def summary(self) -> Dict[str, Any]:
+        """段階・理由ごとの件数を取得"""
+        return {
+            "total": self.total,
+            "by_stage": dict(self.stage_counts),
+            "by_reason": [
+                {"stage": stage, "reason": reason, "count": count}
+                for (stage, reason), count in self.reason_counts.most_common()
+            ]
+        }
+    
+    def flush(self):
+        """バッファ内の記録をファイルに書き込む"""
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+    
+    def close(self):
+        """ファイルを閉じる"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+_error_sink: Optional[ErrorSink] = None
+
+# capture_errors() で一時的に差し替えた記録先（スレッドごと）
+_captured = threading.local()
+
+
+def setup_error_sink(path: Optional[str] = None,
+                     buffer_size: int = ERROR_LOG_BUFFER_SIZE) -> ErrorSink:
+    """
+    エラーログを設定（既存の設定は閉じて破棄）
+    
+    Args:
+        path: JSON Linesファイルのパス（Noneの場合は件数のみ集計）
+        buffer_size: 書き込みバッファのサイズ（バイト）
+    
+    Returns:
+        エラーログ
+    """
+    global _error_sink
+    if _error_sink is not None:
+        _error_sink.close()
+    _error_sink = ErrorSink(path, buffer_size)
+    return _error_sink
+
+
+def get_error_sink() -> ErrorSink:
+    """エラーログを取得（未設定の場合は件数のみ集計する既定設定で作成）"""
+    sink = getattr(_captured, "sink", None)
+    if sink is not None:
+        return sink
+    if _error_sink is None:
+        return setup_error_sink()
+    return _error_sink
+
+
+@contextmanager
+def capture_errors(sink: Optional[ErrorSink] = None) -> Iterator[ErrorSink]:
+    """
+    このスレッドで記録されるエラーの記録先を一時的に差し替えるコンテキストマネージャー
+    
+    チャンク単位の変換（別スレッド・別プロセス）や変換サービスの1リクエストなど、
+    記録を呼び出し元へ返す場合や、支店ごとに別のファイルへ書き込む場合に使用する。
+    
+    Args:
+        sink: 記録先（Noneの場合は記録をメモリに保持するErrorSinkを作成）
+    
+    Yields:
+        記録先のErrorSink（作成した場合はrecords属性に収集される）
+    """
+    previous = getattr(_captured, "sink", None)
+    _captured.sink = sink if sink is not None else ErrorSink(keep_records=True)
+    try:
+        yield _captured.sink
+    finally:
+        _captured.sink = previous
+
+
+def read_error_log(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    JSON Linesファイルのエラーを先頭から順に読み込む
+    
+    Args:
+        path: JSON Linesファイルのパス
+    
+    Yields:
+        エラー1件の辞書
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def summarize_error_log(path: str, output_path: Optional[str] = None) -> str:
+    """
+    JSON Linesファイルからテキスト形式のエラーログを作成
+    
+    件数の集計と詳細の書き出しでファイルを2回読み、全件をメモリに保持しない。
+    
+    Args:
+        path: JSON Linesファイルのパス
+        output_path: テキストファイルのパス（Noneの場合は拡張子を.txtに変えたパス）
+    
+    Returns:
+        作成したテキストファイルのパス
+    """
+    if output_path is None:
+        output_path = os.path.splitext(path)[0] + ".txt"
+    
+    reason_counts = Counter(
+        (entry.get("stage"), entry.get("reason")) for entry in read_error_log(path)
+    )
+    
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write("データ変換エラーログ\n")
+        f.write("=" * 50 + "\n")
+        f.write(f"生成日時: {datetime.now().strftime('%Y/%m/%d %H:%M:%S')}\n")
+        f.write(f"エラー件数: {sum(reason_counts.values())}件\n")
+        for (stage, reason), count in reason_counts.most_common():
+            f.write(f"  - [{stage}] {reason}: {count}件\n")
+        f.write("=" * 50 + "\n\n")
+        
+        for i, entry in enumerate(read_error_log(path), 1):
+            f.write(f"エラー {i}:\n")
+            for key, value in entry.items():
+                if value is not None:
+                    f.write(f"  {key}: {value}\n")
+            f.write("\n")
+    
+    return output_path
+
+
+def main():
+    """メイン関数 - JSON Linesのエラーログをテキスト形式に変換"""
+    parser = argparse.ArgumentParser(description="エラーログ（error_log_*.jsonl）をテキスト形式に集計")
+    parser.add_argument("path", help="JSON Lines形式のエラーログのパス")
+    parser.add_argument("--output", help="テキストファイルのパス（デフォルト: 拡張子を.txtに変更）", default=None)
+    args = parser.parse_args()
+    
+    output_path = summarize_error_log(args.path, args.output)
+    print(f"エラーログを出力しました: {output_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
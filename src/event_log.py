@@ -0,0 +1,242 @@
+"""
+処理ログモジュール
+
+標準ライブラリのloggingを使用して、レコード単位の詳細（生年月日の修正・重複による除外・
+変換エラーなど）を区分ごとに件数を集計して記録する。コンソールには区分ごとに
+先頭の数件のみを表示し、全件はバッファリングしたJSON Lines形式のログファイルに出力する。
+"""
+import json
+import logging
+import logging.handlers
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, Optional
+
+
+# ロガー名（標準ライブラリのルートロガーとは分離）
+LOGGER_NAME = "ark_import"
+
+# コンソールに表示する区分ごとの例の件数
+DEFAULT_MAX_EXAMPLES = 5
+
+# ログファイルへの書き込みをまとめる件数
+LOG_BUFFER_CAPACITY = 1000
+
+# 指定可能なログレベル
+LOG_LEVELS = ["DEBUG", "INFO", "WARNING", "ERROR"]
+
+
+class ExampleLimitFilter(logging.Filter):
+    """区分ごとにコンソールへの表示件数を制限するフィルター"""
+    
+    def __init__(self, max_examples: int):
+        super().__init__()
+        self.max_examples = max_examples
+        self.shown = Counter()
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        category = getattr(record, "category", None)
+        if category is None:
+            return True
+        self.shown[category] += 1
+        return self.shown[category] <= self.max_examples
+
+
+class StdoutHandler(logging.StreamHandler):
+    """出力時点のsys.stdoutに書き込むハンドラー（printと同じ出力先・リダイレクトに追従）"""
+    
+    @property
+    def stream(self):
+        return sys.stdout
+    
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """ログレコードを1行のJSONに変換するフォーマッター"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "category": getattr(record, "category", None),
+            "message": record.getMessage()
+        }
+        for key, value in getattr(record, "fields", {}).items():
+            # 欠損値（NaN）はJSONで表現できないためnullとして出力
+            entry[key] = None if isinstance(value, float) and value != value else value
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class EventLog:
+    """区分ごとの件数を集計しながらレコード単位の詳細を記録するクラス"""
+    
+    def __init__(self, level: str = "INFO",
+                 quiet: bool = False,
+                 max_examples: int = DEFAULT_MAX_EXAMPLES,
+                 log_file: Optional[str] = None,
+                 logger_name: str = LOGGER_NAME):
+        """
+        初期化
+        
+        Args:
+            level: 記録するログレベル（DEBUG/INFO/WARNING/ERROR）
+            quiet: Trueの場合はコンソールにレコード単位の例を表示しない（件数のみ）
+            max_examples: コンソールに表示する区分ごとの例の件数
+            log_file: JSON Lines形式のログファイルのパス（Noneの場合は出力しない）
+            logger_name: 使用するロガー名（同時に使用する処理ログごとに別の名前を指定）
+        """
+        self.level = level
+        self.quiet = quiet
+        self.max_examples = 0 if quiet else max_examples
+        self.log_file = log_file
+        self.counts = Counter()
+        
+        self.logger = logging.getLogger(logger_name)
+        self.logger.setLevel(getattr(logging, level))
+        self.logger.propagate = False
+        self._close_handlers()
+        
+        console = StdoutHandler()
+        console.setFormatter(logging.Formatter("  - %(message)s"))
+        self.example_filter = ExampleLimitFilter(self.max_examples)
+        console.addFilter(self.example_filter)
+        self.logger.addHandler(console)
+        
+        if log_file:
+            file_handler = logging.FileHandler(log_file, encoding="utf-8", delay=True)
+            file_handler.setFormatter(JsonLinesFormatter())
+            # 1件ごとのファイル書き込みを避けるためバッファリング（ERROR以上は即時書き込み）
+            self.logger.addHandler(logging.handlers.MemoryHandler(
+                LOG_BUFFER_CAPACITY, flushLevel=logging.ERROR, target=file_handler
+            ))
+    
+    def event(self, category: str, message: str, level: int = logging.INFO, **fields):
+        """
+        レコード単位の事象を記録
+        
+        Args:
+            category: 区分（例: "生年月日修正"）
+            message: コンソール・ログファイルに出力するメッセージ
+            level: ログレベル
+            **fields: ログファイルに出力する項目（契約番号など）
+        """
+        self.counts[category] += 1
+        # ログファイルがなく表示件数も超過している場合はレコードの作成を省略
+        if self.log_file is None and self.shown(category) >= self.max_examples:
+            return
+        if self.logger.isEnabledFor(level):
+            self.logger.log(level, message, extra={"category": category, "fields": fields})
+    
+    def shown(self, category: str) -> int:
+        """コンソールに表示した件数（ログレベルにより表示しなかった事象は含めない）"""
+        return min(self.example_filter.shown[category], self.max_examples)
+    
+    def print_omitted(self, category: str):
+        """コンソールに表示しなかった件数を表示"""
+        if self.quiet:
+            return
+        omitted = self.counts[category] - self.shown(category)
+        if omitted > 0:
+            detail = f"（詳細: {self.log_file}）" if self.log_file else ""
+            print(f"  ... 他{omitted}件{detail}")
+    
+    def summary(self) -> Dict[str, int]:
+        """区分ごとの件数を取得"""
+        return dict(self.counts)
+    
+    def reset(self):
+        """件数と表示済み件数をリセット（常駐処理で1件の変換ごとに呼び出す）"""
+        self.counts.clear()
+        self.example_filter.shown.clear()
+    
+    def flush(self):
+        """バッファ内のログをファイルに書き込む"""
+        for handler in self.logger.handlers:
+            handler.flush()
+    
+    def _close_handlers(self):
+        """既存のハンドラーを書き込み・解放して取り外す"""
+        for handler in list(self.logger.handlers):
+            handler.flush()
+            handler.close()
+            self.logger.removeHandler(handler)
+    
+    def close(self):
+        """ログファイルを閉じる"""
+        self._close_handlers()
+
+
+_event_log: Optional[EventLog] = None
+
+# capture_events() で差し替えたスレッドごとの処理ログ
+_captured = threading.local()
+
+
+def setup_event_log(level: str = "INFO", quiet: bool = False,
+                    max_examples: int = DEFAULT_MAX_EXAMPLES,
+                    log_file: Optional[str] = None) -> EventLog:
+    """
+    処理ログを設定（既存の設定は破棄）
+    
+    Args:
+        level: 記録するログレベル
+        quiet: Trueの場合はコンソールにレコード単位の例を表示しない
+        max_examples: コンソールに表示する区分ごとの例の件数
+        log_file: JSON Lines形式のログファイルのパス
+    
+    Returns:
+        処理ログ
+    """
+    global _event_log
+    if _event_log is not None:
+        _event_log.close()
+    _event_log = EventLog(level, quiet, max_examples, log_file)
+    return _event_log
+
+
+def get_event_log() -> EventLog:
+    """処理ログを取得（未設定の場合はコンソールのみの既定設定で作成）"""
+    event_log = getattr(_captured, "event_log", None)
+    if event_log is not None:
+        return event_log
+    if _event_log is None:
+        return setup_event_log()
+    return _event_log
+
+
+@contextmanager
+def capture_events(event_log: Optional[EventLog] = None) -> Iterator[EventLog]:
+    """
+    このスレッドで記録される処理ログを一時的に差し替えるコンテキストマネージャー
+    
+    変換サービスの1リクエストなど、同時に実行される変換ごとに件数と表示件数を
+    数える場合に使用する（共有の処理ログはリセットしない）。
+    
+    Args:
+        event_log: 処理ログ（Noneの場合は共有の処理ログと同じ設定で、
+            ログファイルなし・スレッド専用のロガーを使用する処理ログを作成）
+    
+    Yields:
+        このスレッドで使用する処理ログ
+    """
+    created = event_log is None
+    if created:
+        shared = _event_log if _event_log is not None else setup_event_log()
+        event_log = EventLog(
+            shared.level, shared.quiet, shared.max_examples,
+            logger_name=f"{LOGGER_NAME}.{threading.current_thread().name}"
+        )
+    previous = getattr(_captured, "event_log", None)
+    _captured.event_log = event_log
+    try:
+        yield event_log
+    finally:
+        _captured.event_log = previous
+        if created:
+            event_log.close()
@@ -1,16 +1,24 @@
 """
 アーク新規登録データ変換ツール
 メイン処理モジュール
+
+pandasに依存するモジュールは、引数の解析と入力ファイルの検索が済んでから
+インポートする（--help や引数エラー、ファイル未検出時の起動を速くするため）。
 """
 import sys
 import os
 import argparse
+import importlib.util
 from datetime import datetime
 from data_loader import DataLoader
-from data_validator import DataValidator
-from data_transformer import DataTransformer
-from data_exporter import DataExporter
-from config import get_config
+from config import (get_config, STATE_DB_FILENAME, RUN_CACHE_DIRNAME, BATCH_REPORT_PATTERNS,
+                    CSV_WRITERS, DEFAULT_WRITE_BUFFER_SIZE, UNENCODABLE_POLICIES,
+                    DEFAULT_UNENCODABLE_POLICY, EXPORT_DB_FILENAME, OUTPUT_FORMATS)
+from metrics import MetricsRecorder
+from profiling import PipelineProfiler, PROFILE_STAGES
+from event_log import setup_event_log, DEFAULT_MAX_EXAMPLES, LOG_LEVELS
+from error_sink import get_error_sink, setup_error_sink
+from memory_budget import parse_memory_size
 
 
 def print_header():
@@ -22,6 +30,181 @@ def print_header():
     print()
 
 
+def run_batch_mode(args, config) -> int:
+    """一括処理（支店別の並列変換）を実行"""
+    from batch_runner import run_batch
+    from data_exporter import DataExporter
+    
+    try:
+        print("【一括処理】支店別レポートの変換")
+        print("-" * 40)
+        
+        results = run_batch(
+            patterns=args.batch_pattern or BATCH_REPORT_PATTERNS,
+            downloads_dir=args.downloads_dir,
+            output_dir=args.output_dir,
+            contract_list_path=args.contract_list,
+            contract_list_glob=args.contract_list_glob,
+            encoding=config["encoding"],
+            skip_report=args.skip_report,
+            max_workers=args.jobs
+        )
+        
+        DataExporter(encoding=config["encoding"]).create_batch_summary_report(
+            results, output_dir=args.output_dir
+        )
+        
+        failed = [r for r in results if r.get("error")]
+        print("\n" + "=" * 60)
+        if failed:
+            for result in failed:
+                print(f"エラー: [{result['branch']}] {result['error']}")
+            print(f"{len(failed)}支店でエラーが発生しました。")
+            print("=" * 60)
+            return 1
+        
+        print("一括処理が正常に完了しました！")
+        print("=" * 60)
+        return 0
+        
+    except FileNotFoundError as e:
+        print(f"\nエラー: {e}")
+        print("必要なファイルが見つかりません。ファイルパスを確認してください。")
+        return 1
+
+
+def run_watch_mode(args, config) -> int:
+    """監視モード（常駐して新規レポートを自動変換）を実行"""
+    from watcher import FolderWatcher
+    
+    watcher = FolderWatcher(
+        watch_dir=args.watch,
+        report_patterns=args.batch_pattern or BATCH_REPORT_PATTERNS,
+        output_dir=args.output_dir,
+        contract_list_dir=args.downloads_dir,
+        contract_list_glob=args.contract_list_glob,
+        encoding=config["encoding"],
+        skip_report=args.skip_report,
+        poll_interval=args.poll_interval
+    )
+    
+    try:
+        watcher.run()
+        return 0
+    except FileNotFoundError as e:
+        print(f"\nエラー: {e}")
+        print("必要なファイルが見つかりません。ファイルパスを確認してください。")
+        return 1
+
+
+def run_client_mode(args) -> int:
+    """変換サービスに変換を依頼して結果を保存"""
+    from conversion_server import request_conversion
+    from utils import get_output_filename
+    
+    if not args.report:
+        print("エラー: --server-url を使用する場合は --report を指定してください。")
+        return 1
+    
+    output_path = args.output or os.path.join(args.output_dir, get_output_filename())
+    try:
+        summary = request_conversion(args.server_url, args.report, output_path)
+    except Exception as e:
+        print(f"\n変換サービスへの依頼に失敗しました: {e}")
+        return 1
+    
+    print(f"ファイルを出力しました: {output_path}")
+    print(f"元のレコード数: {summary['original_count']}")
+    print(f"出力レコード数: {summary['output_count']}")
+    return 0
+
+
+def run_checkpoint_mode(args, config, loader, report_path, contract_list_paths, metrics) -> int:
+    """チャンク単位で変換し、チャンクごとにチェックポイントを保存（--resumeで再開）"""
+    from checkpoint import ChunkCheckpoint, compute_run_key, convert_with_checkpoints
+    from memory_budget import AdaptiveChunkSizer, ADAPTIVE_INITIAL_ROWS
+    from metrics import format_bytes
+    from pipelined_executor import PipelinedExecutor
+    from config import CHECKPOINT_DIRNAME
+    from data_exporter import DataExporter, get_template_headers
+    from utils import get_output_filename
+    
+    with metrics.stage("データ読み込み", key="load"):
+        if args.contract_list_glob is not None:
+            contract_keys = loader.load_contract_keys(contract_list_paths)
+            print(f"ContractList引継番号（重複除去後）: {len(contract_keys)}件")
+        else:
+            contract_keys = loader.load_contract_list(contract_list_paths[0])
+            print(f"ContractList: {len(contract_keys)}件")
+    
+    output_path = args.output or os.path.join(args.output_dir, get_output_filename())
+    spill_dir = os.path.join(
+        args.checkpoint_dir or os.path.join(args.output_dir, CHECKPOINT_DIRNAME),
+        os.path.splitext(os.path.basename(output_path))[0]
+    )
+    run_key = compute_run_key(contract_list_paths, {
+        "contract_list_glob": args.contract_list_glob is not None,
+        "encoding": config["encoding"],
+        "unencodable": args.unencodable
+    })
+    sizer = None
+    if args.max_memory is not None:
+        # 最初のチャンク（--chunk-size、省略時は既定の行数）で1件あたりのメモリを計測
+        sizer = AdaptiveChunkSizer(args.max_memory, args.chunk_size or ADAPTIVE_INITIAL_ROWS)
+    checkpoint = ChunkCheckpoint(spill_dir, run_key, sizer.chunk_size if sizer else args.chunk_size)
+    resumed = checkpoint.start(args.resume)
+    if resumed:
+        print(f"チェックポイントから再開します: 完了済み{resumed}チャンク（{spill_dir}）")
+    
+    if sizer is not None:
+        print(f"\n【ステップ2-4】データ検証・変換・出力（メモリ上限 {format_bytes(args.max_memory)}）")
+    else:
+        print(f"\n【ステップ2-4】データ検証・変換・出力（{checkpoint.chunk_size}件ずつ）")
+    print("-" * 40)
+    
+    executor = None
+    if args.pipelined:
+        jobs = args.jobs or 1
+        executor = PipelinedExecutor(workers=jobs, use_processes=jobs > 1)
+        print(f"読み込み・変換・書き込みを並行に実行します（変換: {f'{jobs}プロセス' if jobs > 1 else 'スレッド'}）")
+    
+    exporter = DataExporter(encoding=config["encoding"], writer=args.csv_writer,
+                            buffer_size=args.write_buffer_size)
+    with metrics.stage("チャンク変換", key="transform") as stage:
+        output_path, output_count, validation_summary = convert_with_checkpoints(
+            loader, report_path, contract_keys, output_path, checkpoint, exporter, metrics,
+            sizer=sizer, executor=executor, unencodable=args.unencodable
+        )
+        stage["rows_in"] = validation_summary["original_count"]
+        stage["rows_out"] = output_count
+    
+    print(f"\nファイルを出力しました: {output_path}")
+    print(f"レコード数: {output_count}件")
+    
+    if not args.skip_report:
+        print("\n【ステップ5】レポート生成")
+        print("-" * 40)
+        
+        with metrics.stage("レポート生成", key="report"):
+            exporter.export_error_log(get_error_sink())
+            
+            # 統計値はチャンクごとに集計済み（出力ファイルは読み直さない）
+            exporter.create_summary_report(
+                None, validation_summary, output_dir=args.output_dir,
+                column_count=len(get_template_headers()),
+                memory_budget=sizer.summary() if sizer is not None else None
+            )
+        
+        metrics.write_json(args.output_dir)
+    
+    metrics.print_summary()
+    
+    print("\n" + "=" * 60)
+    print("処理が正常に完了しました！")
+    print("=" * 60)
+    return 0
+
+
 def main():
     """メイン処理"""
     # コマンドライン引数の解析
@@ -38,6 +221,11 @@ def main():
         help="ContractListのパス",
         default=None
     )
+    parser.add_argument(
+        "--contract-list-glob", 
+        help="重複チェックに使用するContractListのパターン（一致する全ファイルを集約）",
+        default=None
+    )
     parser.add_argument(
         "--output", 
         help="出力ファイルのパス",
@@ -53,84 +241,504 @@ def main():
         help="出力ディレクトリ",
         default="."
     )
+    parser.add_argument(
+        "--incremental", 
+        help="前回出力以降の新規・変更レコードのみを処理",
+        action="store_true"
+    )
+    parser.add_argument(
+        "--state-db", 
+        help="差分処理の状態ストアのパス（デフォルト: 出力ディレクトリ内）",
+        default=None
+    )
+    preview_group = parser.add_mutually_exclusive_group()
+    preview_group.add_argument(
+        "--head", 
+        help="レポートの先頭N件のみを処理するプレビュー（重複チェックはContractList全件で実施）",
+        type=int,
+        metavar="N",
+        default=None
+    )
+    preview_group.add_argument(
+        "--sample", 
+        help="レポートから無作為に抽出したN件のみを処理するプレビュー（重複チェックはContractList全件で実施）",
+        type=int,
+        metavar="N",
+        default=None
+    )
+    parser.add_argument(
+        "--sample-seed", 
+        help="--sampleの乱数シード（同じ値で同じ行を抽出）",
+        type=int,
+        default=None
+    )
     parser.add_argument(
         "--skip-report", 
         help="処理レポートの生成をスキップ",
         action="store_true"
     )
+    parser.add_argument(
+        "--no-cache", 
+        help="実行結果キャッシュを使用しない（常に全件処理）",
+        action="store_true"
+    )
+    parser.add_argument(
+        "--cache-dir", 
+        help="実行結果キャッシュのディレクトリ（デフォルト: 出力ディレクトリ内）",
+        default=None
+    )
+    parser.add_argument(
+        "--chunk-size", 
+        help="レポートを指定行数ずつ変換し、チャンクごとにチェックポイントを保存（--resumeで再開可能）",
+        type=int,
+        default=None
+    )
+    parser.add_argument(
+        "--resume", 
+        help="前回失敗したチェックポイント付きの変換を再開（完了済みのチャンクをスキップ）",
+        action="store_true"
+    )
+    parser.add_argument(
+        "--max-memory", 
+        help="チャンク単位で変換し、最初のチャンクで計測した1件あたりのメモリから以降のチャンク行数をこの上限に収まるよう調整（例: 1GB、512MB）",
+        type=parse_memory_size,
+        default=None
+    )
+    parser.add_argument(
+        "--pipelined", 
+        help="チャンク単位の変換で読み込み・変換・書き込みを並行に実行（--jobsを2以上にすると変換を複数プロセスで実行）",
+        action="store_true"
+    )
+    parser.add_argument(
+        "--checkpoint-dir", 
+        help="チェックポイントの保存ディレクトリ（デフォルト: 出力ディレクトリ内）",
+        default=None
+    )
+    parser.add_argument(
+        "--unencodable", 
+        help="出力の文字エンコーディングで表現できない文字の扱い（substitute: 置換表の文字、置換表にない文字は?に置き換え、question: ?に置き換え、reject: レコードを除外。該当箇所はエラーログに記録。xlsx出力では使用しない）",
+        choices=UNENCODABLE_POLICIES,
+        default=DEFAULT_UNENCODABLE_POLICY
+    )
+    parser.add_argument(
+        "--max-rows-per-file", 
+        help="出力を指定したデータ行数ごとの連番ファイル（各ファイルにヘッダーを付与）に分割し、マニフェストを出力",
+        type=int,
+        default=None
+    )
+    parser.add_argument(
+        "--max-bytes-per-file", 
+        help="出力を指定したサイズ（ヘッダーを含む、例: 5MB）ごとの連番ファイルに分割し、マニフェストを出力",
+        type=parse_memory_size,
+        default=None
+    )
+    parser.add_argument(
+        "--output-format", 
+        help="出力形式（xlsx: 全セルを文字列としたExcelブック、xlsxwriterが必要）",
+        choices=OUTPUT_FORMATS,
+        default="csv"
+    )
+    parser.add_argument(
+        "--sqlite", 
+        help=f"出力CSVと同じデータを照合用のSQLiteファイルにも書き込む（パス省略時: 出力ディレクトリ内の{EXPORT_DB_FILENAME}）",
+        nargs="?",
+        const="",
+        default=None
+    )
+    parser.add_argument(
+        "--sqlite-run-id", 
+        help="SQLiteに書き込む行の実行ID（デフォルト: 実行日時、同じIDの行は置き換え）",
+        default=None
+    )
+    parser.add_argument(
+        "--csv-writer", 
+        help="CSVの書き込み方式（bytes: 固定値・空欄のセルを事前エンコードしてまとめて書き込み、csv: csv.writerで1行ずつ書き込み、出力内容は同一）",
+        choices=CSV_WRITERS,
+        default="bytes"
+    )
+    parser.add_argument(
+        "--write-buffer-size", 
+        help="bytes方式でファイルへまとめて書き込むサイズ（例: 4MB、デフォルト: 4MB）",
+        type=parse_memory_size,
+        default=DEFAULT_WRITE_BUFFER_SIZE
+    )
+    parser.add_argument(
+        "--batch", 
+        help="支店別の案件取込用レポートをすべて検出し、支店ごとに並列で変換",
+        action="store_true"
+    )
+    parser.add_argument(
+        "--batch-pattern", 
+        help="一括処理で検出するレポートのパターン（複数指定可、デフォルト: config.pyのBATCH_REPORT_PATTERNS）",
+        action="append",
+        default=None
+    )
+    parser.add_argument(
+        "--jobs", 
+        help="一括処理・--pipelinedの変換の並列プロセス数、分割出力の書き込みスレッド数（一括処理のデフォルト: 支店数とCPU数の小さい方）",
+        type=int,
+        default=None
+    )
+    parser.add_argument(
+        "--watch", 
+        help="指定ディレクトリを監視し、配置された案件取込用レポートを自動変換（常駐）",
+        metavar="DIR",
+        default=None
+    )
+    parser.add_argument(
+        "--poll-interval", 
+        help="監視モードのディレクトリ走査間隔（秒）",
+        type=float,
+        default=0.5
+    )
+    parser.add_argument(
+        "--trace-memory", 
+        help="ステップごとの最大メモリ割り当て量をtracemallocで計測（処理は遅くなる）",
+        action="store_true"
+    )
+    parser.add_argument(
+        "--profile", 
+        help="処理全体をプロファイルし、結果（.pstatsと累積時間順のサマリー）を出力ディレクトリに保存",
+        action="store_true"
+    )
+    parser.add_argument(
+        "--profile-stage", 
+        help="指定したステップのみをプロファイル（--profileを含意）",
+        choices=PROFILE_STAGES,
+        default=None
+    )
+    parser.add_argument(
+        "--profiler", 
+        help="プロファイラーの種類（sampling はpyinstrumentがインストールされている場合のみ）",
+        choices=["cprofile", "sampling"],
+        default="cprofile"
+    )
+    parser.add_argument(
+        "--quiet", 
+        help="レコード単位の詳細（生年月日の修正・重複除外など）をコンソールに表示しない（件数のみ表示）",
+        action="store_true"
+    )
+    parser.add_argument(
+        "--max-examples", 
+        help="コンソールに表示するレコード単位の詳細の件数（区分ごと）",
+        type=int,
+        default=DEFAULT_MAX_EXAMPLES
+    )
+    parser.add_argument(
+        "--log-level", 
+        help="処理ログに記録するレベル",
+        choices=LOG_LEVELS,
+        default="INFO"
+    )
+    parser.add_argument(
+        "--log-file", 
+        help="レコード単位の詳細を出力するJSON Lines形式のログファイル（デフォルト: 出力ディレクトリ内のrun_log_*.jsonl）",
+        default=None
+    )
+    parser.add_argument(
+        "--serve", 
+        help="ローカルHTTP変換サービスとして起動（常駐）",
+        action="store_true"
+    )
+    parser.add_argument(
+        "--host", 
+        help="変換サービスの待ち受けアドレス",
+        default="127.0.0.1"
+    )
+    parser.add_argument(
+        "--port", 
+        help="変換サービスの待ち受けポート",
+        type=int,
+        default=8765
+    )
+    parser.add_argument(
+        "--server-url", 
+        help="指定した変換サービスに--reportの変換を依頼（例: http://127.0.0.1:8765）",
+        default=None
+    )
     
     args = parser.parse_args()
     
+    preview = args.head is not None or args.sample is not None
+    if preview and args.incremental:
+        parser.error("--head・--sample は --incremental と同時に指定できません")
+    if preview and min(n for n in (args.head, args.sample) if n is not None) <= 0:
+        parser.error("--head・--sample には1以上の件数を指定してください")
+    checkpointed = args.chunk_size is not None or args.resume or args.max_memory is not None or args.pipelined
+    if checkpointed and (args.incremental or preview):
+        parser.error("--chunk-size・--resume・--max-memory・--pipelined は --incremental・--head・--sample と同時に指定できません")
+    if args.pipelined and args.max_memory is not None:
+        parser.error("--pipelined は --max-memory と同時に指定できません（メモリの計測は逐次処理で行うため）")
+    if args.chunk_size is not None and args.chunk_size <= 0:
+        parser.error("--chunk-size には1以上の行数を指定してください")
+    split_output = args.max_rows_per_file is not None or args.max_bytes_per_file is not None
+    output_extension = f".{args.output_format}"
+    if split_output and checkpointed:
+        parser.error("--max-rows-per-file・--max-bytes-per-file は --chunk-size・--resume・--max-memory・--pipelined と同時に指定できません")
+    if args.output_format == "xlsx":
+        if checkpointed or split_output:
+            parser.error("--output-format xlsx は --chunk-size・--resume・--max-memory・--pipelined・"
+                         "--max-rows-per-file・--max-bytes-per-file と同時に指定できません")
+        if importlib.util.find_spec("xlsxwriter") is None:
+            parser.error("--output-format xlsx にはxlsxwriterが必要です（pip install xlsxwriter）")
+    if (args.profile or args.profile_stage) and (args.batch or args.watch or args.serve or args.server_url):
+        parser.error("--profile・--profile-stage は --batch・--watch・--serve・--server-url と同時に指定できません")
+    if args.sqlite is not None and checkpointed:
+        parser.error("--sqlite は --chunk-size・--resume・--max-memory・--pipelined と同時に指定できません")
+    if args.max_rows_per_file is not None and args.max_rows_per_file <= 0:
+        parser.error("--max-rows-per-file には1以上の行数を指定してください")
+    
     # ヘッダー表示
     print_header()
     
     # 設定を取得
     config = get_config()
     
+    state_store = None
+    run_cache = None
+    profiler = None
+    
+    # 処理ログ（ログファイルは通常の変換処理でのみ出力）
+    single_run = not (args.batch or args.watch or args.serve or args.server_url)
+    log_file = args.log_file
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    if log_file is None and single_run and not args.skip_report:
+        log_file = os.path.join(args.output_dir, f"run_log_{timestamp}.jsonl")
+    if log_file:
+        os.makedirs(os.path.dirname(log_file) or ".", exist_ok=True)
+    event_log = setup_event_log(args.log_level, args.quiet, args.max_examples,
+                                log_file if single_run else None)
+    
+    # エラーログ（レコード単位のエラーを発生時に書き込み、メモリには件数のみ保持）
+    error_sink = setup_error_sink(
+        os.path.join(args.output_dir, f"error_log_{timestamp}.jsonl")
+        if single_run and not args.skip_report else None
+    )
+    
+    if args.batch:
+        return run_batch_mode(args, config)
+    
+    if args.watch:
+        return run_watch_mode(args, config)
+    
+    if args.serve:
+        from conversion_server import ConversionService, run_server
+        
+        service = ConversionService(
+            contract_list_dir=args.downloads_dir,
+            contract_list_glob=args.contract_list_glob,
+            encoding=config["encoding"],
+            max_workers=args.jobs or 2
+        )
+        try:
+            run_server(args.host, args.port, service)
+            return 0
+        except FileNotFoundError as e:
+            print(f"\nエラー: {e}")
+            return 1
+    
+    if args.server_url:
+        return run_client_mode(args)
+    
+    if args.profile or args.profile_stage:
+        profiler = PipelineProfiler(args.output_dir, args.profile_stage, args.profiler)
+        profiler.start()
+    
     try:
         # 1. データ読み込み
         print("【ステップ1】データ読み込み")
         print("-" * 40)
         
         loader = DataLoader(encoding=config["encoding"])
-        report_df, contract_list_df = loader.load_input_files(
+        report_path, contract_list_paths = loader.resolve_input_paths(
             report_path=args.report,
             contract_list_path=args.contract_list,
-            downloads_dir=args.downloads_dir
+            downloads_dir=args.downloads_dir,
+            contract_list_glob=args.contract_list_glob
         )
         
-        # 2. データ検証
-        print("\n【ステップ2】データ検証")
-        print("-" * 40)
+        # 入力・設定・実行日が前回と同一ならキャッシュから出力を復元
+        # （差分処理は状態ストアに依存するためキャッシュ対象外、プロファイル・プレビュー・分割出力・SQLite出力時は常に処理）
+        if not args.no_cache and not args.incremental and profiler is None and not preview \
+                and not checkpointed and not split_output and args.sqlite is None:
+            from run_cache import RunCache
+            from utils import get_output_filename
+            
+            output_path = args.output or os.path.join(args.output_dir, get_output_filename(output_extension))
+            run_cache = RunCache(args.cache_dir or os.path.join(args.output_dir, RUN_CACHE_DIRNAME))
+            cache_key = run_cache.compute_key(
+                [report_path] + contract_list_paths,
+                {
+                    "contract_list_glob": args.contract_list_glob is not None,
+                    "skip_report": args.skip_report,
+                    "encoding": config["encoding"],
+                    "unencodable": args.unencodable,
+                    "output_format": args.output_format
+                }
+            )
+            if run_cache.restore(cache_key, output_path, args.output_dir):
+                print("\n" + "=" * 60)
+                print("入力と設定が前回と同一のため、キャッシュを使用しました！")
+                print("=" * 60)
+                return 0
+        
+        # 入力ファイルの確認が済んでからデータ処理モジュール（pandas）を読み込む
+        from pipeline import run_pipeline, PipelineOptions
+        from data_exporter import DataExporter
+        
+        metrics = MetricsRecorder(trace_memory=args.trace_memory, profiler=profiler)
+        
+        if checkpointed:
+            return run_checkpoint_mode(args, config, loader, report_path, contract_list_paths, metrics)
+        
+        with metrics.stage("データ読み込み", key="load") as stage:
+            report_df, contract_list_df = loader.load_input_files(
+                report_path=report_path,
+                contract_list_path=contract_list_paths[0],
+                downloads_dir=args.downloads_dir,
+                contract_list_glob=args.contract_list_glob,
+                head=args.head,
+                sample=args.sample,
+                seed=args.sample_seed
+            )
+            stage["rows_out"] = len(report_df)
+        
+        # 差分処理の場合は出力済みで変更のないレコードを除外
+        if args.incremental:
+            from state_store import StateStore
+            
+            state_db = args.state_db or os.path.join(args.output_dir, STATE_DB_FILENAME)
+            state_store = StateStore(state_db)
+            source_count = len(report_df)
+            with metrics.stage("差分抽出", rows_in=source_count) as stage:
+                report_df, delta_hashes = state_store.filter_delta(report_df)
+                stage["rows_out"] = len(report_df)
+            
+            if len(report_df) == 0:
+                print("\n新規・変更レコードはありません。処理を終了します。")
+                return 0
         
-        validator = DataValidator()
-        validated_df, validation_summary = validator.validate_all(
-            report_df, contract_list_df
+        # 2-3. データ検証・変換（ライブラリAPIで実行し、進捗は表示する）
+        result = run_pipeline(
+            report_df, contract_list_df,
+            options=PipelineOptions(verbose=True, metrics=metrics, encoding=config["encoding"],
+                                    unencodable=args.unencodable, output_format=args.output_format)
         )
+        output_df, validation_summary = result.output_df, result.validation_summary
         
-        if len(validated_df) == 0:
+        if validation_summary["validated_count"] == 0:
+            if state_store is not None:
+                # 差分がすべて除外された場合は正常終了（除外したレコードは次回から再処理しない）
+                state_store.record_exported(report_df, delta_hashes, output_df, source_count)
+                print("\n新規・変更レコードに有効なレコードはありません。処理を終了します。")
+                return 0
             print("\n警告: 有効なレコードがありません。処理を終了します。")
             return 1
         
-        # 3. データ変換
-        print("\n【ステップ3】データ変換")
-        print("-" * 40)
-        
-        transformer = DataTransformer()
-        output_df = transformer.transform_dataframe(validated_df)
-        
         # 4. データ出力
         print("\n【ステップ4】データ出力")
         print("-" * 40)
         
-        exporter = DataExporter(encoding=config["encoding"])
-        output_path = exporter.export_to_csv(
-            output_df,
-            output_path=args.output,
-            output_dir=args.output_dir
-        )
+        with metrics.stage("データ出力", rows_in=len(output_df), key="export") as stage:
+            exporter = DataExporter(encoding=config["encoding"], writer=args.csv_writer,
+                                    buffer_size=args.write_buffer_size)
+            output_path = args.output
+            if output_path is None and preview:
+                from utils import get_preview_output_filename
+                output_path = os.path.join(args.output_dir, get_preview_output_filename(output_extension))
+            output_parts = None
+            if split_output:
+                part_paths, manifest_path = exporter.export_to_csv_parts(
+                    output_df,
+                    output_path=output_path,
+                    output_dir=args.output_dir,
+                    max_rows=args.max_rows_per_file,
+                    max_bytes=args.max_bytes_per_file,
+                    workers=args.jobs
+                )
+                output_parts = [os.path.basename(path) for path in part_paths]
+                output_path = manifest_path
+            elif args.output_format == "xlsx":
+                output_path = exporter.export_to_xlsx(
+                    output_df,
+                    output_path=output_path,
+                    output_dir=args.output_dir
+                )
+            else:
+                output_path = exporter.export_to_csv(
+                    output_df,
+                    output_path=output_path,
+                    output_dir=args.output_dir
+                )
+            if args.sqlite is not None:
+                exporter.export_to_sqlite(
+                    output_df,
+                    args.sqlite or os.path.join(args.output_dir, EXPORT_DB_FILENAME),
+                    run_id=args.sqlite_run_id or timestamp,
+                    # 分割出力の場合はマニフェストではなく分割したファイル名を記録
+                    output_filename=",".join(output_parts) if output_parts else os.path.basename(output_path)
+                )
+            stage["rows_out"] = len(output_df)
+        
+        # プレビューの場合は計測した1件あたりの処理時間から全件の処理時間を推定
+        preview_info = None
+        if preview:
+            source_rows = report_df.attrs["source_rows"]
+            preview_info = {
+                "method": f"先頭{args.head}件" if args.head is not None else f"無作為抽出{args.sample}件",
+                "source_rows": source_rows,
+                "source_rows_estimated": report_df.attrs["source_rows_estimated"],
+                "estimated_seconds": metrics.estimate_seconds(len(report_df), source_rows),
+                "output_filename": os.path.basename(output_path)
+            }
+            if preview_info["estimated_seconds"] is not None:
+                approximate = "約" if preview_info["source_rows_estimated"] else ""
+                print(f"\n全件（{approximate}{source_rows}件）の推定処理時間: 約{preview_info['estimated_seconds']:,.0f}秒"
+                      f"（検証・変換・出力、読み込みを除く）")
+        
+        # 差分処理の状態を更新（出力成功時のみ）
+        if state_store is not None:
+            exported_count, rejected_count = state_store.record_exported(
+                report_df, delta_hashes, output_df, source_count
+            )
+            print(f"状態ストアを更新しました: 出力{exported_count}件・除外{rejected_count}件")
         
         # 5. レポート生成（オプション）
+        report_paths = []
         if not args.skip_report:
             print("\n【ステップ5】レポート生成")
             print("-" * 40)
             
-            # エラーログ出力
-            if validation_summary.get("error_log"):
-                exporter.export_error_log(
-                    validation_summary["error_log"],
-                    output_dir=args.output_dir
-                )
+            with metrics.stage("レポート生成", key="report"):
+                # エラーログ出力（JSON Linesと集計したテキストの両方をキャッシュ対象にする）
+                error_log_file = exporter.export_error_log(error_sink)
+                if error_log_file is not None:
+                    report_paths.extend([error_sink.path, error_log_file])
+                
+                # 処理レポート生成
+                report_paths.append(exporter.create_summary_report(
+                    output_df,
+                    validation_summary,
+                    output_dir=args.output_dir,
+                    preview=preview_info,
+                    output_parts=output_parts,
+                    output_format=args.output_format
+                ))
             
-            # 処理レポート生成
-            exporter.create_summary_report(
-                output_df,
-                validation_summary,
-                output_dir=args.output_dir
-            )
+            # 計測結果（処理レポートと同じディレクトリに出力）
+            metrics.write_json(args.output_dir)
+        
+        metrics.print_summary()
+        
+        # 次回の同一条件での実行に備えて結果をキャッシュ
+        if run_cache is not None:
+            run_cache.store(cache_key, output_path, report_paths)
         
         print("\n" + "=" * 60)
-        print("処理が正常に完了しました！")
+        if preview:
+            print("プレビューが完了しました（全件の処理ではありません）。")
+        else:
+            print("処理が正常に完了しました！")
         print("=" * 60)
         
         return 0
@@ -145,6 +753,19 @@ def main():
         import traceback
         traceback.print_exc()
         return 1
+    
+    finally:
+        if state_store is not None:
+            state_store.close()
+        
+        if profiler is not None:
+            profiler.stop()
+            profiler.dump()
+
+        event_log.close()
+        if event_log.log_file and os.path.exists(event_log.log_file):
+            print(f"処理ログを出力しました: {event_log.log_file}")
+        error_sink.close()
 
 
 if __name__ == "__main__":
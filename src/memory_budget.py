@@ -0,0 +1,124 @@
+"""
+メモリ予算モジュール
+
+チャンク単位の変換（--chunk-size・--resume）で、最初のチャンクの読み込み・変換・
+CSVエンコードに要したメモリ（tracemallocの最大割り当て量）から1件あたりのメモリを求め、
+以降のチャンク行数を指定したメモリ上限（--max-memory）に収まるよう調整する。
+"""
+import re
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+from metrics import format_bytes, get_peak_rss_bytes
+
+
+# 1件あたりのメモリを計測する最初のチャンクの行数
+ADAPTIVE_INITIAL_ROWS = 1000
+
+# 調整後のチャンク行数の範囲
+MIN_ADAPTIVE_ROWS = 100
+MAX_ADAPTIVE_ROWS = 1000000
+
+# 残りのメモリ予算のうちチャンクに割り当てる割合（計測の誤差・断片化に備えた余裕）
+MEMORY_SAFETY_RATIO = 0.5
+
+# メモリサイズの単位
+MEMORY_UNITS = {"": 1, "B": 1, "KB": 1024, "MB": 1024 ** 2, "GB": 1024 ** 3, "TB": 1024 ** 4}
+
+
+def parse_memory_size(text: str) -> int:
+    """
+    メモリサイズの文字列をバイト数に変換
+    
+    Args:
+        text: メモリサイズ（例: "1GB", "512MB", "2.5G"）
+    
+    Returns:
+        バイト数
+    """
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMGT]?)B?\s*", text.upper())
+    if not match:
+        raise ValueError(f"メモリサイズを解釈できません: {text}")
+    number, unit = match.groups()
+    size = int(float(number) * MEMORY_UNITS[unit + "B" if unit else ""])
+    if size <= 0:
+        raise ValueError(f"メモリサイズには正の値を指定してください: {text}")
+    return size
+
+
+class AdaptiveChunkSizer:
+    """メモリ上限に収まるようチャンク行数を調整するクラス"""
+    
+    def __init__(self, max_memory_bytes: int, initial_rows: int = ADAPTIVE_INITIAL_ROWS):
+        """
+        初期化
+        
+        Args:
+            max_memory_bytes: プロセス全体のメモリ上限（バイト）
+            initial_rows: 1件あたりのメモリを計測する最初のチャンクの行数
+        """
+        self.max_memory_bytes = max_memory_bytes
+        self.chunk_size = initial_rows
+        self.bytes_per_row: Optional[float] = None
+        self.baseline_bytes: Optional[int] = None
+        self.used_sizes = Counter()
+    
+    @contextmanager
+    def measure(self):
+        """
+        1チャンクの読み込みから出力までのメモリを計測するコンテキストマネージャー
+        
+        計測は最初の1回のみ行う（tracemallocは処理が遅くなるため）。
+        
+        Yields:
+            計測レコード（呼び出し側で処理した行数を "rows" に設定する）
+        """
+        record = {"rows": None}
+        if self.bytes_per_row is not None:
+            yield record
+            return
+        
+        # ContractListなどチャンク以外で使用済みのメモリ
+        self.baseline_bytes = get_peak_rss_bytes() or 0
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        else:
+            tracemalloc.reset_peak()
+        try:
+            yield record
+        finally:
+            peak = tracemalloc.get_traced_memory()[1]
+            if started:
+                tracemalloc.stop()
+            if record["rows"]:
+                self._adapt(peak / record["rows"])
+    
+    def _adapt(self, bytes_per_row: float):
+        """1件あたりのメモリから以降のチャンク行数を決定"""
+        self.bytes_per_row = bytes_per_row
+        available = (self.max_memory_bytes - self.baseline_bytes) * MEMORY_SAFETY_RATIO
+        rows = int(available / bytes_per_row) if bytes_per_row > 0 else MAX_ADAPTIVE_ROWS
+        self.chunk_size = max(MIN_ADAPTIVE_ROWS, min(MAX_ADAPTIVE_ROWS, rows))
+        
+        print(f"1件あたりのメモリ: 約{format_bytes(int(bytes_per_row))}"
+              f"（使用済み {format_bytes(self.baseline_bytes)} / 上限 {format_bytes(self.max_memory_bytes)}）")
+        if rows < MIN_ADAPTIVE_ROWS:
+            print(f"警告: メモリ上限が不足しているため、最小の{MIN_ADAPTIVE_ROWS}件ずつ処理します")
+        print(f"以降のチャンク行数: {self.chunk_size}件")
+    
+    def record(self, rows: int):
+        """処理したチャンクの行数を記録"""
+        self.used_sizes[rows] += 1
+    
+    def summary(self) -> Dict[str, Any]:
+        """処理レポート用の集計結果を取得"""
+        return {
+            "max_memory_bytes": self.max_memory_bytes,
+            "baseline_bytes": self.baseline_bytes,
+            "bytes_per_row": self.bytes_per_row,
+            "chunk_size": self.chunk_size,
+            "used_sizes": sorted(self.used_sizes.items(), reverse=True),
+            "peak_rss_bytes": get_peak_rss_bytes()
+        }
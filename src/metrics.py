@@ -0,0 +1,215 @@
+"""
+処理計測モジュール
+
+ステップごとの処理時間・CPU時間・入出力件数・スループット・メモリ使用量と、
+住所分割・電話番号正規化などの主要な内部処理の累計時間を記録する。
+"""
+import functools
+import json
+import os
+import sys
+import time
+import tracemalloc
+import unicodedata
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+
+def get_peak_rss_bytes() -> Optional[int]:
+    """プロセスの最大常駐メモリ（RSS）をバイト数で取得（取得できない場合はNone）"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linuxはキロバイト、macOSはバイト単位
+        return peak if sys.platform == "darwin" else peak * 1024
+    except ImportError:
+        pass
+    
+    try:
+        import psutil
+        memory_info = psutil.Process().memory_info()
+        return getattr(memory_info, "peak_wset", memory_info.rss)
+    except ImportError:
+        return None
+
+
+def format_bytes(size: Optional[int]) -> str:
+    """バイト数を表示用に整形"""
+    if size is None:
+        return "-"
+    if size >= 1024 * 1024:
+        return f"{size / (1024 * 1024):.1f}MB"
+    return f"{size / 1024:.1f}KB"
+
+
+def pad_display(text: str, width: int) -> str:
+    """全角文字を2桁として左寄せで桁揃え"""
+    display_width = sum(2 if unicodedata.east_asian_width(c) in "WF" else 1 for c in text)
+    return text + " " * max(0, width - display_width)
+
+
+class MetricsRecorder:
+    """処理ステップの計測値を記録するクラス"""
+    
+    def __init__(self, trace_memory: bool = False, profiler: Any = None):
+        """
+        初期化
+        
+        Args:
+            trace_memory: Trueの場合はtracemallocでステップごとの最大割り当て量も計測
+                （計測中は処理が遅くなる）
+            profiler: 指定した場合はステップ単位のプロファイルに使用するPipelineProfiler
+        """
+        self.trace_memory = trace_memory
+        self.profiler = profiler
+        self.stages: List[Dict[str, Any]] = []
+        self.substeps: Dict[str, Dict[str, Any]] = {}
+        self.started_at = datetime.now()
+        self._run_start = time.perf_counter()
+        
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+    
+    @contextmanager
+    def stage(self, name: str, rows_in: Optional[int] = None, key: Optional[str] = None):
+        """
+        ステップを計測するコンテキストマネージャー
+        
+        Args:
+            name: ステップ名
+            rows_in: 入力件数
+            key: プロファイル対象の指定に使用するステップの識別子（例: "transform"）
+        
+        Yields:
+            計測レコード（呼び出し側で rows_out を設定する）
+        """
+        record = {"name": name, "key": key, "rows_in": rows_in, "rows_out": None}
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        profile_context = self.profiler.stage(key) if self.profiler and key else nullcontext()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            with profile_context:
+                yield record
+        finally:
+            record["wall_seconds"] = time.perf_counter() - wall_start
+            record["cpu_seconds"] = time.process_time() - cpu_start
+            
+            rows = record["rows_in"] if record["rows_in"] is not None else record["rows_out"]
+            if rows and record["wall_seconds"] > 0:
+                record["rows_per_second"] = rows / record["wall_seconds"]
+            else:
+                record["rows_per_second"] = None
+            
+            record["peak_traced_bytes"] = tracemalloc.get_traced_memory()[1] if self.trace_memory else None
+            record["peak_rss_bytes"] = get_peak_rss_bytes()
+            self.stages.append(record)
+    
+    def instrument(self, obj: Any, method_name: str, label: str):
+        """
+        オブジェクトのメソッドを計測用のラッパーに差し替え（インスタンス単位）
+        
+        Args:
+            obj: 対象オブジェクト
+            method_name: メソッド名
+            label: 計測結果の表示名
+        """
+        method = getattr(obj, method_name)
+        substep = self.substeps.setdefault(label, {"name": label, "calls": 0, "wall_seconds": 0.0})
+        
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                substep["wall_seconds"] += time.perf_counter() - start
+                substep["calls"] += 1
+        
+        setattr(obj, method_name, timed)
+    
+    def instrument_transformer(self, transformer: Any):
+        """DataTransformerの主要な内部処理を計測対象にする"""
+        self.instrument(transformer.address_splitter, "split_address", "住所分割")
+        self.instrument(transformer, "process_phone_numbers", "電話番号正規化（契約者）")
+        self.instrument(transformer, "process_phone_numbers_for_contact", "電話番号正規化（保証人・緊急連絡人）")
+        self.instrument(transformer, "transform_row", "行変換")
+    
+    def estimate_seconds(self, measured_rows: int, total_rows: int,
+                         keys: tuple = ("validate", "transform", "export")) -> Optional[float]:
+        """
+        計測した1件あたりの処理時間から全件の処理時間を推定（プレビュー用）
+        
+        Args:
+            measured_rows: 計測時に処理した件数
+            total_rows: 推定対象の件数
+            keys: 件数に比例するとみなすステップの識別子
+        
+        Returns:
+            推定処理時間（秒）、計測件数が0の場合はNone
+        """
+        if measured_rows <= 0:
+            return None
+        seconds = sum(record["wall_seconds"] for record in self.stages if record["key"] in keys)
+        return seconds / measured_rows * total_rows
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """計測結果を辞書に変換"""
+        return {
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "total_wall_seconds": time.perf_counter() - self._run_start,
+            "trace_memory": self.trace_memory,
+            "peak_rss_bytes": get_peak_rss_bytes(),
+            "stages": self.stages,
+            "substeps": list(self.substeps.values())
+        }
+    
+    def write_json(self, output_dir: str = ".") -> Optional[str]:
+        """
+        計測結果をJSONファイルに出力
+        
+        Args:
+            output_dir: 出力ディレクトリ
+        
+        Returns:
+            出力したファイルのパス
+        """
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        metrics_file = os.path.join(output_dir, f"metrics_{timestamp}.json")
+        try:
+            os.makedirs(output_dir, exist_ok=True)
+            with open(metrics_file, "w", encoding="utf-8") as f:
+                json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+            print(f"\n計測結果を出力しました: {metrics_file}")
+            return metrics_file
+        except Exception as e:
+            print(f"計測結果出力失敗: {e}")
+            return None
+    
+    def print_summary(self):
+        """計測結果のサマリー表を表示"""
+        print("\n【処理時間サマリー】")
+        print(f"{pad_display('ステップ', 16)}{'経過(秒)':>10}{'CPU(秒)':>10}{'入力':>9}{'出力':>9}{'件/秒':>10}{'最大メモリ':>12}")
+        for record in self.stages:
+            rows_per_second = record["rows_per_second"]
+            peak = record["peak_traced_bytes"] if self.trace_memory else record["peak_rss_bytes"]
+            print(
+                f"{pad_display(record['name'], 16)}"
+                f"{record['wall_seconds']:>10.2f}"
+                f"{record['cpu_seconds']:>10.2f}"
+                f"{'-' if record['rows_in'] is None else record['rows_in']:>9}"
+                f"{'-' if record['rows_out'] is None else record['rows_out']:>9}"
+                f"{'-' if rows_per_second is None else f'{rows_per_second:,.0f}':>10}"
+                f"{format_bytes(peak):>12}"
+            )
+        
+        for substep in self.substeps.values():
+            if substep["calls"] == 0:
+                continue
+            per_call_ms = substep["wall_seconds"] / substep["calls"] * 1000
+            print(f"  - {substep['name']}: {substep['wall_seconds']:.2f}秒"
+                  f"（{substep['calls']}回、平均{per_call_ms:.3f}ミリ秒）")
+        
+        print(f"合計経過時間: {time.perf_counter() - self._run_start:.2f}秒")
@@ -0,0 +1,175 @@
+"""
+出力ファイル分割モジュール
+
+アップロード画面の行数・サイズの上限（--max-rows-per-file・--max-bytes-per-file）に
+収まるよう、出力を連番のファイル（各ファイルにテンプレートのヘッダーを付与）に分割する。
+データ行はエンコードしながらファイルの区切りを決め、区切りが確定したファイルから
+書き込みとチェックサムの計算をスレッドプールで並行に実行する（全行をメモリに保持しない）。
+ファイル名・行の範囲・チェックサムはマニフェスト（JSON）に出力する。
+"""
+import hashlib
+import json
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+# マニフェストのファイル名の接尾辞（出力ファイル名_manifest.json）
+MANIFEST_SUFFIX = "_manifest"
+
+# 連番の最小桁数
+PART_NUMBER_WIDTH = 2
+
+
+def iter_parts(rows: Iterable[bytes], header_size: int,
+               max_rows: Optional[int] = None,
+               max_bytes: Optional[int] = None) -> Iterator[Tuple[int, int, bytes]]:
+    """
+    データ行を順に読みながら各ファイルの区切りを決定（先頭から上限まで詰める）
+    
+    保持するのは作成中の1ファイル分のデータ行のみで、上限に達した時点でそのファイルを返す。
+    
+    Args:
+        rows: エンコード済みのデータ行（改行を含む）のイテラブル
+        header_size: ヘッダー行のバイト数（各ファイルに含まれる）
+        max_rows: 1ファイルあたりのデータ行数の上限
+        max_bytes: 1ファイルあたりのバイト数の上限（ヘッダーを含む）
+    
+    Yields:
+        (開始行, 終了行, データ行のバイト列)（0始まり、終了行は含まない。
+        データ行がない場合はヘッダーのみの1ファイル）
+    """
+    if max_bytes is not None and header_size >= max_bytes:
+        raise ValueError(f"ヘッダー行（{header_size}バイト）だけで1ファイルの上限を超えています")
+    
+    start = 0
+    end = 0
+    body = bytearray()
+    for row in rows:
+        if max_bytes is not None and header_size + len(row) > max_bytes:
+            raise ValueError(f"{end + 1}行目（{len(row)}バイト）だけで1ファイルの上限を超えています")
+        full_rows = max_rows is not None and end - start >= max_rows
+        full_bytes = max_bytes is not None and header_size + len(body) + len(row) > max_bytes
+        if full_rows or full_bytes:
+            yield start, end, body
+            start = end
+            body = bytearray()
+        body += row
+        end += 1
+    yield start, end, body
+
+
+def get_part_paths(output_path: str, count: int) -> List[str]:
+    """
+    分割後のファイルパスを取得（例: 0725アーク新規登録_01.csv）
+    
+    Args:
+        output_path: 分割しない場合の出力ファイルパス
+        count: ファイル数
+    
+    Returns:
+        連番のファイルパスのリスト
+    """
+    stem, ext = os.path.splitext(output_path)
+    width = max(PART_NUMBER_WIDTH, len(str(count)))
+    return [f"{stem}_{number:0{width}d}{ext}" for number in range(1, count + 1)]
+
+
+def get_manifest_path(output_path: str) -> str:
+    """マニフェストのパスを取得（例: 0725アーク新規登録_manifest.json）"""
+    return os.path.splitext(output_path)[0] + MANIFEST_SUFFIX + ".json"
+
+
+def _write_part(path: str, header: bytes, body: bytes) -> Dict[str, Any]:
+    """1ファイルを書き込み、バイト数とチェックサムを返す"""
+    digest = hashlib.sha256(header)
+    digest.update(body)
+    with open(path, "wb") as f:
+        f.write(header)
+        f.write(body)
+    return {"bytes": len(header) + len(body), "sha256": digest.hexdigest()}
+
+
+def write_parts(output_path: str, header: bytes, rows: Iterable[bytes],
+                max_rows: Optional[int] = None,
+                max_bytes: Optional[int] = None,
+                workers: Optional[int] = None,
+                encoding: str = "cp932") -> Tuple[List[Dict[str, Any]], str]:
+    """
+    データ行を上限ごとのファイルに分割して並行に書き込み、マニフェストを出力
+    
+    ファイル数は全行を読むまで確定しないため、各ファイルは一時ファイル名で書き込み、
+    完了後に連番のファイル名（桁数はファイル数に合わせる）へリネームする。
+    書き込み待ちのファイルはスレッド数までとし、メモリに保持するデータ行を抑える。
+    
+    Args:
+        output_path: 分割しない場合の出力ファイルパス（連番・マニフェストの名前の基準）
+        header: エンコード済みのヘッダー行
+        rows: エンコード済みのデータ行（改行を含む）のイテラブル（ジェネレーターでもよい）
+        max_rows: 1ファイルあたりのデータ行数の上限
+        max_bytes: 1ファイルあたりのバイト数の上限（ヘッダーを含む）
+        workers: 書き込みのスレッド数（Noneの場合はCPU数）
+        encoding: マニフェストに記録する文字エンコーディング
+    
+    Returns:
+        (ファイルごとの情報のリスト, マニフェストのパス)
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, workers)
+    stem, ext = os.path.splitext(output_path)
+    
+    ranges = []
+    temp_paths = []
+    results = []
+    try:
+        # ファイルの書き込み・ハッシュ計算はGILを解放するためスレッドで並行に実行
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+            for start, end, body in iter_parts(rows, len(header), max_rows, max_bytes):
+                if len(pending) >= workers:
+                    results.append(pending.popleft().result())
+                temp_path = f"{stem}_{len(temp_paths) + 1}{ext}.tmp"
+                temp_paths.append(temp_path)
+                ranges.append((start, end))
+                pending.append(executor.submit(_write_part, temp_path, header, body))
+            results.extend(future.result() for future in pending)
+        
+        paths = get_part_paths(output_path, len(ranges))
+        for temp_path, path in zip(temp_paths, paths):
+            os.replace(temp_path, path)
+    except Exception:
+        # 書き込み済みの一時ファイルを削除（ファイルの上限を超える行があった場合など）
+        for temp_path in temp_paths:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        raise
+    
+    parts = []
+    for path, (start, end), result in zip(paths, ranges, results):
+        parts.append({
+            "file": os.path.basename(path),
+            "rows": end - start,
+            # 行の範囲は分割前のデータ行の通し番号（1始まり、ヘッダーを除く）
+            "first_row": start + 1 if end > start else None,
+            "last_row": end if end > start else None,
+            "bytes": result["bytes"],
+            "sha256": result["sha256"]
+        })
+    
+    manifest = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "source": os.path.basename(output_path),
+        "encoding": encoding,
+        "total_rows": ranges[-1][1],
+        "max_rows_per_file": max_rows,
+        "max_bytes_per_file": max_bytes,
+        "parts": parts
+    }
+    manifest_path = get_manifest_path(output_path)
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    
+    return parts, manifest_path
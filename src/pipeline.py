@@ -0,0 +1,212 @@
+"""
+変換パイプラインモジュール
+
+読み込み済みのDataFrameに対して検証・変換を実行するライブラリAPI。
+ファイルへの書き込みや標準出力への表示を行わないため、他のPython処理に
+組み込んで使用できる（CLIのmain.pyもこのAPIを使用する）。
+
+検証・変換・出力時のレコード単位のエラーは戻り値に含めず、error_sink.get_error_sink() の
+記録先へ書き込む。エラーを受け取る場合は capture_errors() の中で呼び出す
+（records属性に、エラーログと同じ形式の辞書のリストが入る）。
+
+使用例:
+    from pipeline import run_pipeline
+    from error_sink import capture_errors
+    with capture_errors() as captured:
+        result = run_pipeline(report_df, contract_keys)
+    result.output_df.to_csv(...)
+    errors = captured.records
+"""
+import contextlib
+import io
+from typing import Any, Dict, Iterable, Iterator, NamedTuple, Optional, Set, Union
+import pandas as pd
+from data_validator import DataValidator
+from data_transformer import DataTransformer
+from encoding_check import apply_unencodable_policy
+from report_stats import ReportStats
+from metrics import MetricsRecorder
+from config import OUTPUT_COLUMNS, DEFAULT_UNENCODABLE_POLICY, ENCODED_OUTPUT_FORMATS
+
+
+class PipelineOptions:
+    """変換パイプラインの実行オプション"""
+    
+    def __init__(self, verbose: bool = False,
+                 transformer: Optional[DataTransformer] = None,
+                 metrics: Optional[MetricsRecorder] = None,
+                 trace_memory: bool = False,
+                 profiler: Any = None,
+                 encoding: str = "cp932",
+                 unencodable: str = DEFAULT_UNENCODABLE_POLICY,
+                 output_format: str = "csv"):
+        """
+        初期化
+        
+        Args:
+            verbose: Trueの場合はCLIと同じ進捗表示を行う（Falseの場合は標準出力を破棄）
+            transformer: 再利用する変換器（Noneの場合は新規作成し、内部処理の時間も計測）
+            metrics: 計測値を追記するMetricsRecorder（Noneの場合は新規作成）
+            trace_memory: 新規作成するMetricsRecorderでtracemallocを使用する場合True
+            profiler: ステップ単位のプロファイルに使用するPipelineProfiler
+            encoding: 出力の文字エンコーディング（表現できない文字の検査に使用）
+            unencodable: 表現できない文字の扱い（"substitute"・"question"・"reject"）
+            output_format: 出力形式（"csv"以外はUnicodeで保存するため表現できない文字を検査しない）
+        """
+        self.verbose = verbose
+        self.transformer = transformer
+        self.metrics = metrics
+        self.trace_memory = trace_memory
+        self.profiler = profiler
+        self.encoding = encoding
+        self.unencodable = unencodable
+        self.output_format = output_format
+
+
+class PipelineResult(NamedTuple):
+    """変換パイプラインの実行結果"""
+    output_df: pd.DataFrame
+    validation_summary: Dict[str, Any]
+    metrics: Dict[str, Any]
+
+
+def _output_context(options: PipelineOptions):
+    """verboseでない場合は標準出力を破棄するコンテキスト（スレッド間では共有されるため注意）"""
+    if options.verbose:
+        return contextlib.nullcontext()
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def run_pipeline(report_df: pd.DataFrame,
+                 contract_keys: Union[pd.DataFrame, Set[str]],
+                 *,
+                 options: Optional[PipelineOptions] = None) -> PipelineResult:
+    """
+    読み込み済みの案件取込用レポートを検証・変換（ファイル出力なし）
+    
+    エラーは呼び出し元のスレッドの記録先（capture_errors() で差し替え可能）に記録する。
+    エラーの index は report_df のインデックス（ファイル上の行番号）で、出力DataFrameの
+    インデックスも変換元の行のインデックスとなる。
+    
+    Args:
+        report_df: 案件取込用レポートのDataFrame
+        contract_keys: ContractListのDataFrame、または引継番号の集合
+        options: 実行オプション
+    
+    Returns:
+        PipelineResult(出力DataFrame, 検証結果サマリー, 計測結果)
+        （有効なレコードがない場合、出力DataFrameは0件）
+    """
+    options = options or PipelineOptions()
+    metrics = options.metrics or MetricsRecorder(
+        trace_memory=options.trace_memory, profiler=options.profiler
+    )
+    
+    with _output_context(options):
+        print("\n【ステップ2】データ検証")
+        print("-" * 40)
+        
+        with metrics.stage("データ検証", rows_in=len(report_df), key="validate") as stage:
+            validator = DataValidator()
+            validated_df, validation_summary = validator.validate_all(report_df, contract_keys)
+            stage["rows_out"] = len(validated_df)
+        
+        if len(validated_df) == 0:
+            return PipelineResult(pd.DataFrame(columns=OUTPUT_COLUMNS), validation_summary, metrics.to_dict())
+        
+        print("\n【ステップ3】データ変換")
+        print("-" * 40)
+        
+        with metrics.stage("データ変換", rows_in=len(validated_df), key="transform") as stage:
+            transformer = options.transformer
+            if transformer is None:
+                transformer = DataTransformer()
+                metrics.instrument_transformer(transformer)
+            output_df = transformer.transform_dataframe(validated_df)
+            transformed_count = len(output_df)
+            
+            # 出力時に失敗しないよう、表現できない文字をここで置換・除外してエラーログに記録
+            unencodable_count = 0
+            if options.output_format in ENCODED_OUTPUT_FORMATS:
+                output_df, unencodable_count = apply_unencodable_policy(
+                    output_df, options.unencodable, options.encoding
+                )
+            if unencodable_count:
+                validation_summary["unencodable_count"] = unencodable_count
+                if options.unencodable == "reject":
+                    validation_summary["unencodable_rejected_count"] = transformed_count - len(output_df)
+            stage["rows_out"] = len(output_df)
+        
+        # 処理レポートの統計値はチャンクごとに集計（出力ファイルの再走査を不要にする）
+        validation_summary["report_stats"] = ReportStats.from_dataframe(output_df).to_dict()
+    
+    return PipelineResult(output_df, validation_summary, metrics.to_dict())
+
+
+def run_pipeline_stream(report_chunks: Iterable[pd.DataFrame],
+                        contract_keys: Union[pd.DataFrame, Set[str]],
+                        *,
+                        options: Optional[PipelineOptions] = None) -> Iterator[PipelineResult]:
+    """
+    案件取込用レポートのチャンクを順に検証・変換（ファイル出力なし）
+    
+    各チャンクの結果を変換が終わり次第返すため、全件をメモリに保持せずに処理できる。
+    変換器はチャンク間で再利用する。
+    
+    Args:
+        report_chunks: 案件取込用レポートのDataFrameのイテラブル（DataLoader.iter_csv_chunksなど）
+        contract_keys: ContractListのDataFrame、または引継番号の集合
+        options: 実行オプション
+    
+    Yields:
+        チャンクごとのPipelineResult
+    """
+    options = options or PipelineOptions()
+    transformer = options.transformer
+    if transformer is None:
+        transformer = DataTransformer()
+        if options.metrics is not None:
+            options.metrics.instrument_transformer(transformer)
+    
+    for chunk in report_chunks:
+        chunk_options = PipelineOptions(
+            verbose=options.verbose,
+            transformer=transformer,
+            metrics=options.metrics,
+            trace_memory=options.trace_memory,
+            profiler=options.profiler,
+            encoding=options.encoding,
+            unencodable=options.unencodable,
+            output_format=options.output_format
+        )
+        # チャンクのインデックス（ファイル先頭からの行番号）はエラーログの index として保持する
+        yield run_pipeline(chunk, contract_keys, options=chunk_options)
+
+
+def merge_validation_summaries(summaries: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    チャンクごとの検証結果サマリーを1つに集計
+    
+    Args:
+        summaries: 検証結果サマリーのイテラブル
+    
+    Returns:
+        集計した検証結果サマリー
+    """
+    merged = {
+        "original_count": 0,
+        "validated_count": 0,
+        "excluded_count": 0,
+        "duplicate_count": 0,
+        "unencodable_count": 0,
+        "unencodable_rejected_count": 0
+    }
+    report_stats = ReportStats()
+    for summary in summaries:
+        for key in ("original_count", "validated_count", "excluded_count", "duplicate_count",
+                    "unencodable_count", "unencodable_rejected_count"):
+            merged[key] += summary.get(key, 0)
+        if summary.get("report_stats"):
+            report_stats.merge(summary["report_stats"])
+    merged["report_stats"] = report_stats.to_dict()
+    return merged
@@ -0,0 +1,163 @@
+"""
+パイプライン実行モジュール
+
+読み込み・変換・書き込みを別々のステージとして並行に実行する。ステージ間は
+上限付きのキューで接続し、後段が遅い場合は前段が待機する（バックプレッシャー）。
+
+- 読み込み: 専用スレッドで入力を順に取得
+- 変換: スレッド（既定）またはプロセスプールで実行
+- 書き込み: 呼び出し元のスレッドで入力と同じ順序で実行
+
+いずれかのステージで例外が発生した場合は残りのステージを停止し、
+呼び出し元に同じ例外を送出する。
+"""
+import queue
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Optional, Tuple
+
+
+# ステージ間のキューに保持する件数（チャンク数）の既定値
+DEFAULT_QUEUE_SIZE = 2
+
+# 停止要求を確認する間隔（秒）
+CANCEL_POLL_SECONDS = 0.1
+
+# 入力の終端を示す値
+_END = object()
+
+
+class _Failure:
+    """前段のステージで発生した例外を後段に伝える入れ物"""
+    
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+class PipelinedExecutor:
+    """読み込み・変換・書き込みを上限付きキューで接続して並行実行するクラス"""
+    
+    def __init__(self, queue_size: int = DEFAULT_QUEUE_SIZE,
+                 workers: int = 1,
+                 use_processes: bool = False,
+                 initializer: Optional[Callable] = None,
+                 initargs: Tuple = ()):
+        """
+        初期化
+        
+        Args:
+            queue_size: ステージ間のキューに保持する件数（読み込み済み・変換済みの待機数の上限）
+            workers: 変換の並列数
+            use_processes: Trueの場合は変換をプロセスプールで実行（変換関数は
+                pickle可能なモジュールレベルの関数とする）
+            initializer: プロセスプールの各プロセスで最初に呼び出す関数
+            initargs: initializerの引数
+        """
+        self.queue_size = max(1, queue_size)
+        self.workers = max(1, workers)
+        self.use_processes = use_processes
+        self.initializer = initializer
+        self.initargs = initargs
+        self._cancel = threading.Event()
+    
+    def _create_executor(self) -> Executor:
+        if self.use_processes:
+            return ProcessPoolExecutor(max_workers=self.workers,
+                                       initializer=self.initializer, initargs=self.initargs)
+        return ThreadPoolExecutor(max_workers=self.workers)
+    
+    def _put(self, target: queue.Queue, item: Any) -> bool:
+        """キューに追加（満杯の場合は空くまで待機、停止要求時はFalse）"""
+        while not self._cancel.is_set():
+            try:
+                target.put(item, timeout=CANCEL_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def _get(self, source: queue.Queue) -> Any:
+        """キューから取得（空の場合は待機、停止要求時は終端）"""
+        while not self._cancel.is_set():
+            try:
+                return source.get(timeout=CANCEL_POLL_SECONDS)
+            except queue.Empty:
+                continue
+        return _END
+    
+    def run(self, source: Iterable[Any],
+            process: Callable[[Any], Any],
+            sink: Callable[[Any], None]) -> int:
+        """
+        入力を読み込み・変換・書き込みの各ステージで並行に処理
+        
+        Args:
+            source: 入力のイテラブル（読み込みスレッドで反復）
+            process: 変換関数（入力1件を受け取り結果を返す）
+            sink: 書き込み関数（変換結果を入力と同じ順序で受け取る）
+        
+        Returns:
+            書き込んだ件数
+        """
+        self._cancel.clear()
+        inputs = queue.Queue(self.queue_size)
+        # 変換中・変換済みの結果（Future）を入力順に保持
+        results = queue.Queue(self.queue_size)
+        executor = self._create_executor()
+        
+        def read():
+            try:
+                for item in source:
+                    if not self._put(inputs, item):
+                        return
+                self._put(inputs, _END)
+            except BaseException as e:
+                self._put(inputs, _Failure(e))
+        
+        def dispatch():
+            while True:
+                item = self._get(inputs)
+                if item is _END or isinstance(item, _Failure):
+                    self._put(results, item)
+                    return
+                try:
+                    future = executor.submit(process, item)
+                except BaseException as e:
+                    self._put(results, _Failure(e))
+                    return
+                if not self._put(results, future):
+                    future.cancel()
+                    return
+        
+        threads = [
+            threading.Thread(target=read, name="pipeline-reader", daemon=True),
+            threading.Thread(target=dispatch, name="pipeline-dispatcher", daemon=True)
+        ]
+        for thread in threads:
+            thread.start()
+        
+        written = 0
+        try:
+            while True:
+                item = results.get()
+                if item is _END:
+                    break
+                if isinstance(item, _Failure):
+                    raise item.error
+                sink(item.result())
+                written += 1
+        finally:
+            # 正常終了・例外のいずれでも残りのステージを停止
+            self._cancel.set()
+            while True:
+                try:
+                    pending = results.get_nowait()
+                except queue.Empty:
+                    break
+                if hasattr(pending, "cancel"):
+                    pending.cancel()
+            executor.shutdown(wait=True)
+            for thread in threads:
+                thread.join()
+        
+        return written
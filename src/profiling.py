@@ -0,0 +1,137 @@
+"""
+プロファイリングモジュール
+
+処理全体または指定したステップのみをプロファイルし、結果を出力ディレクトリに保存する。
+標準ではcProfileを使用し、サンプリング方式はpyinstrumentがインストールされている場合のみ使用できる。
+"""
+import cProfile
+import io
+import os
+import pstats
+from contextlib import contextmanager
+from datetime import datetime
+from typing import List, Optional
+
+
+# --profile-stageで指定できるステップ
+PROFILE_STAGES = ["load", "validate", "transform", "export", "report"]
+
+# テキストサマリーに出力する関数の数
+PROFILE_TOP_FUNCTIONS = 40
+
+
+class PipelineProfiler:
+    """処理のプロファイルを取得するクラス"""
+    
+    def __init__(self, output_dir: str = ".",
+                 target_stage: Optional[str] = None,
+                 mode: str = "cprofile"):
+        """
+        初期化
+        
+        Args:
+            output_dir: プロファイル結果の出力ディレクトリ
+            target_stage: 指定した場合はそのステップのみをプロファイル（Noneの場合は処理全体）
+            mode: "cprofile" または "sampling"（pyinstrumentを使用）
+        """
+        self.output_dir = output_dir
+        self.target_stage = target_stage
+        self.mode = mode
+        self._sampler = None
+        self._profile = None
+        # プロファイラーを一度でも有効化したか（対象のステップが実行されなかった場合はFalse）
+        self.recorded = False
+        
+        if mode == "sampling":
+            try:
+                from pyinstrument import Profiler
+                self._sampler = Profiler()
+            except ImportError:
+                print("pyinstrumentがインストールされていないため、cProfileでプロファイルします。")
+                self.mode = "cprofile"
+        
+        if self.mode == "cprofile":
+            self._profile = cProfile.Profile()
+    
+    def _enable(self):
+        """プロファイラーを有効化"""
+        self.recorded = True
+        if self._sampler is not None:
+            self._sampler.start()
+        else:
+            self._profile.enable()
+    
+    def _disable(self):
+        """プロファイラーを無効化"""
+        if self._sampler is not None:
+            self._sampler.stop()
+        else:
+            self._profile.disable()
+    
+    def start(self):
+        """処理全体のプロファイルを開始（ステップ指定時は何もしない）"""
+        if self.target_stage is None:
+            self._enable()
+    
+    def stop(self):
+        """処理全体のプロファイルを終了（ステップ指定時は何もしない）"""
+        if self.target_stage is None:
+            self._disable()
+    
+    @contextmanager
+    def stage(self, name: str):
+        """
+        指定ステップの実行中のみプロファイルするコンテキストマネージャー
+        
+        Args:
+            name: ステップ名（PROFILE_STAGESのいずれか）
+        """
+        active = self.target_stage == name
+        if active:
+            self._enable()
+        try:
+            yield
+        finally:
+            if active:
+                self._disable()
+    
+    def dump(self) -> List[str]:
+        """
+        プロファイル結果をファイルに出力
+        
+        cProfileの場合は .pstats と累積時間順のテキストサマリー、
+        サンプリングの場合はテキストとHTMLを出力する。
+        
+        Returns:
+            出力したファイルのパスのリスト（プロファイル結果がない場合は空）
+        """
+        if not self.recorded:
+            target = f"ステップ {self.target_stage} が実行されなかったため、" if self.target_stage else ""
+            print(f"{target}プロファイル結果はありません（no profile data）。")
+            return []
+        
+        os.makedirs(self.output_dir, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        suffix = f"_{self.target_stage}" if self.target_stage else ""
+        base_path = os.path.join(self.output_dir, f"profile{suffix}_{timestamp}")
+        written = []
+        
+        if self._sampler is not None:
+            with open(base_path + ".txt", "w", encoding="utf-8") as f:
+                f.write(self._sampler.output_text(unicode=True))
+            with open(base_path + ".html", "w", encoding="utf-8") as f:
+                f.write(self._sampler.output_html())
+            written += [base_path + ".txt", base_path + ".html"]
+        else:
+            self._profile.dump_stats(base_path + ".pstats")
+            
+            stream = io.StringIO()
+            stats = pstats.Stats(self._profile, stream=stream)
+            stats.strip_dirs().sort_stats("cumulative").print_stats(PROFILE_TOP_FUNCTIONS)
+            with open(base_path + ".txt", "w", encoding="utf-8") as f:
+                f.write(stream.getvalue())
+            written += [base_path + ".pstats", base_path + ".txt"]
+        
+        for path in written:
+            print(f"プロファイル結果を出力しました: {path}")
+        return written
@@ -0,0 +1,148 @@
+"""
+処理レポート集計モジュール
+
+処理レポートの統計値（件数・金額の合計/平均/最小/最大・カラムごとの空欄率・
+保証人/緊急連絡人の件数・変換時の電話番号の移動や部屋番号の抽出の件数）を
+変換済みのチャンクごとに集計し、チャンク間で合算する。集計結果は検証結果サマリーの
+"report_stats" に格納されるため、チャンク単位の変換やチェックポイントからの再開でも
+出力ファイルを読み直さずに処理レポートを作成できる。
+"""
+from typing import Any, Dict, Iterable, Optional
+import pandas as pd
+from config import OUTPUT_COLUMNS
+
+
+# 金額として集計するカラム
+SUMMARY_AMOUNT_COLUMNS = ["月額賃料", "管理費", "駐車場代", "その他費用1", "その他費用2", "管理前滞納額"]
+
+# 保証人・緊急連絡人の判定に使用するカラム（値がある場合に該当）
+ROLE_COLUMNS = {
+    "guarantor": "保証人１氏名",
+    "emergency": "緊急連絡人１氏名"
+}
+
+# 変換処理の件数の区分（DataTransformer.transform_dataframe の結果の attrs["transform_counts"]。
+# 空欄でないセルの件数は attrs["non_empty_counts"] に {"rows": 行数, "counts": カラム順の件数} で格納される）
+TRANSFORM_COUNT_KEYS = ["phone_moved", "contact_phone_moved", "room_extracted"]
+
+
+class ReportStats:
+    """処理レポートの統計値をチャンクごとに集計するクラス"""
+    
+    def __init__(self, stats: Optional[Dict[str, Any]] = None):
+        """
+        初期化
+        
+        Args:
+            stats: to_dict() で取得した集計結果（Noneの場合は0件から集計）
+        """
+        self.rows = 0
+        self.non_empty: Dict[str, int] = {}
+        self.amounts: Dict[str, Dict[str, Any]] = {
+            column: {"count": 0, "sum": 0.0, "min": None, "max": None} for column in SUMMARY_AMOUNT_COLUMNS
+        }
+        self.roles = {key: 0 for key in ROLE_COLUMNS}
+        self.transform_counts = {key: 0 for key in TRANSFORM_COUNT_KEYS}
+        if stats:
+            self.merge(stats)
+    
+    def add(self, df: pd.DataFrame):
+        """
+        変換済みのDataFrameを集計に追加
+        
+        Args:
+            df: 出力するDataFrame（カラム名が重複する場合は最初のカラムを集計）
+        """
+        self.rows += len(df)
+        columns = list(df.columns)
+        # 変換時に数えた空欄でないセルの件数があれば使用し、ない場合はフレーム全体を1回比較して数える
+        precomputed = df.attrs.get("non_empty_counts")
+        if precomputed and precomputed["rows"] == len(df) and len(precomputed["counts"]) == len(columns):
+            counts = precomputed["counts"]
+        else:
+            cells = df.to_numpy(dtype=object)
+            counts = ((cells != "") & pd.notna(cells)).sum(axis=0)
+        for column in dict.fromkeys(columns):
+            position = columns.index(column)
+            count = int(counts[position])
+            self.non_empty[column] = self.non_empty.get(column, 0) + count
+            
+            if column in self.amounts:
+                values = pd.to_numeric(df.iloc[:, position], errors="coerce").dropna()
+                if len(values):
+                    self._merge_amount(column, {
+                        "count": len(values), "sum": float(values.sum()),
+                        "min": float(values.min()), "max": float(values.max())
+                    })
+            
+            for key, role_column in ROLE_COLUMNS.items():
+                if column == role_column:
+                    self.roles[key] += count
+        
+        for key, count in df.attrs.get("transform_counts", {}).items():
+            self.transform_counts[key] = self.transform_counts.get(key, 0) + count
+    
+    def _merge_amount(self, column: str, other: Dict[str, Any]):
+        amount = self.amounts.setdefault(column, {"count": 0, "sum": 0.0, "min": None, "max": None})
+        amount["count"] += other["count"]
+        amount["sum"] += other["sum"]
+        for key, pick in (("min", min), ("max", max)):
+            if other[key] is not None:
+                amount[key] = other[key] if amount[key] is None else pick(amount[key], other[key])
+    
+    def merge(self, stats: Dict[str, Any]):
+        """
+        別のチャンクの集計結果（to_dict()）を合算
+        
+        Args:
+            stats: 合算する集計結果
+        """
+        self.rows += stats.get("rows", 0)
+        for column, count in stats.get("non_empty", {}).items():
+            self.non_empty[column] = self.non_empty.get(column, 0) + count
+        for column, amount in stats.get("amounts", {}).items():
+            self._merge_amount(column, amount)
+        for key, count in stats.get("roles", {}).items():
+            self.roles[key] = self.roles.get(key, 0) + count
+        for key, count in stats.get("transform_counts", {}).items():
+            self.transform_counts[key] = self.transform_counts.get(key, 0) + count
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """集計結果を辞書で取得（JSONに変換可能）"""
+        return {
+            "rows": self.rows,
+            "non_empty": dict(self.non_empty),
+            "amounts": {column: dict(amount) for column, amount in self.amounts.items()},
+            "roles": dict(self.roles),
+            "transform_counts": dict(self.transform_counts)
+        }
+    
+    def amount_mean(self, column: str) -> float:
+        """金額の平均（数値でない・空欄の値は0円として全件で平均）"""
+        return self.amounts[column]["sum"] / self.rows if self.rows else 0.0
+    
+    def empty_rate(self, column: str) -> float:
+        """カラムの空欄率（0〜1）"""
+        if not self.rows:
+            return 0.0
+        return 1 - self.non_empty.get(column, 0) / self.rows
+    
+    def report_columns(self) -> Iterable[str]:
+        """空欄率を表示するカラム（出力カラムの順序、名前のないカラムを除く）"""
+        return [column for column in dict.fromkeys(OUTPUT_COLUMNS) if column and column in self.non_empty]
+    
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> "ReportStats":
+        """DataFrame全体を集計"""
+        stats = cls()
+        stats.add(df)
+        return stats
+    
+    @classmethod
+    def merge_all(cls, stats_list: Iterable[Optional[Dict[str, Any]]]) -> "ReportStats":
+        """複数の集計結果を合算"""
+        merged = cls()
+        for stats in stats_list:
+            if stats:
+                merged.merge(stats)
+        return merged
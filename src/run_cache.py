@@ -0,0 +1,182 @@
+"""
+実行結果キャッシュモジュール
+
+入力ファイル・設定・実行日が前回と同一の場合に、前回の出力ファイルと
+レポートを再利用して変換処理全体をスキップする。
+"""
+import hashlib
+import json
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from config import get_config
+from data_exporter import get_template_headers
+from utils import get_today_formatted, get_output_filename
+
+
+# キャッシュ形式のバージョン（形式を変更した場合は更新する）
+CACHE_FORMAT_VERSION = 1
+
+# 保持するキャッシュエントリ数
+MAX_CACHE_ENTRIES = 5
+
+# ファイルハッシュ計算時の読み込みサイズ
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def hash_file(file_path: str) -> str:
+    """ファイル内容のSHA-256ハッシュを計算"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def hash_source_code() -> str:
+    """変換ロジック（srcディレクトリのPythonファイル）のハッシュを計算"""
+    digest = hashlib.sha256()
+    for source_file in sorted(Path(__file__).parent.glob("*.py")):
+        digest.update(source_file.name.encode("utf-8"))
+        digest.update(source_file.read_bytes())
+    return digest.hexdigest()
+
+
+class RunCache:
+    """実行結果キャッシュを管理するクラス"""
+    
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+    
+    def compute_key(self, input_paths: List[str], options: Dict[str, Any]) -> str:
+        """
+        入力ファイル・設定・実行日からキャッシュキーを計算
+        
+        Args:
+            input_paths: 入力ファイルのパスのリスト
+            options: 出力内容に影響する実行オプション
+        
+        Returns:
+            キャッシュキー（16進文字列）
+        """
+        fingerprint = {
+            "version": CACHE_FORMAT_VERSION,
+            "inputs": [hash_file(path) for path in input_paths],
+            "config": get_config(),
+            "template_headers": get_template_headers(),
+            "source_code": hash_source_code(),
+            "today": get_today_formatted(),
+            "output_filename": get_output_filename(),
+            "options": options
+        }
+        serialized = json.dumps(fingerprint, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+    
+    def _entry_dir(self, key: str) -> str:
+        """キャッシュエントリのディレクトリパスを取得"""
+        return os.path.join(self.cache_dir, key)
+    
+    def _load_manifest(self, key: str) -> Optional[Dict[str, Any]]:
+        """キャッシュエントリのマニフェストを読み込む（存在しない・破損時はNone）"""
+        manifest_path = os.path.join(self._entry_dir(key), "manifest.json")
+        if not os.path.exists(manifest_path):
+            return None
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def restore(self, key: str, output_path: str, output_dir: str = ".") -> bool:
+        """
+        キャッシュから出力ファイルとレポートを復元
+        
+        Args:
+            key: キャッシュキー
+            output_path: 出力ファイルのパス
+            output_dir: レポートの出力ディレクトリ
+        
+        Returns:
+            復元できた場合True（キャッシュなし・破損時はFalse）
+        """
+        manifest = self._load_manifest(key)
+        if manifest is None:
+            return False
+        
+        entry_dir = self._entry_dir(key)
+        cached_output = os.path.join(entry_dir, manifest["output"])
+        try:
+            if hash_file(cached_output) != manifest["output_sha256"]:
+                print("キャッシュが破損しているため再計算します。")
+                return False
+            
+            os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+            shutil.copy2(cached_output, output_path)
+            print(f"\nキャッシュから出力ファイルを復元しました: {output_path}")
+            
+            os.makedirs(output_dir, exist_ok=True)
+            for report_name in manifest.get("reports", []):
+                shutil.copy2(os.path.join(entry_dir, report_name),
+                             os.path.join(output_dir, report_name))
+                print(f"キャッシュからレポートを復元しました: {report_name}")
+        except OSError as e:
+            print(f"キャッシュ復元失敗: {e}")
+            return False
+        
+        # 最近使用したエントリとして更新日時を更新
+        os.utime(entry_dir)
+        return True
+    
+    def store(self, key: str, output_path: str, report_paths: List[Optional[str]]):
+        """
+        出力ファイルとレポートをキャッシュに保存
+        
+        Args:
+            key: キャッシュキー
+            output_path: 出力ファイルのパス
+            report_paths: レポートファイルのパスのリスト（Noneは無視）
+        """
+        entry_dir = self._entry_dir(key)
+        temp_dir = entry_dir + ".tmp"
+        try:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            os.makedirs(temp_dir)
+            
+            output_name = "output.csv"
+            shutil.copy2(output_path, os.path.join(temp_dir, output_name))
+            
+            reports = []
+            for report_path in report_paths:
+                if report_path and os.path.exists(report_path):
+                    shutil.copy2(report_path, os.path.join(temp_dir, os.path.basename(report_path)))
+                    reports.append(os.path.basename(report_path))
+            
+            manifest = {
+                "created_at": datetime.now().isoformat(timespec="seconds"),
+                "output": output_name,
+                "output_sha256": hash_file(output_path),
+                "reports": reports
+            }
+            with open(os.path.join(temp_dir, "manifest.json"), "w", encoding="utf-8") as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=2)
+            
+            # 完成したエントリのみが参照されるようにリネームで確定
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            os.replace(temp_dir, entry_dir)
+            
+            self._prune()
+        except OSError as e:
+            print(f"キャッシュ保存失敗: {e}")
+            shutil.rmtree(temp_dir, ignore_errors=True)
+    
+    def _prune(self):
+        """古いキャッシュエントリを削除"""
+        entries = [
+            entry for entry in os.scandir(self.cache_dir)
+            if entry.is_dir() and not entry.name.endswith(".tmp")
+        ]
+        entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+        for entry in entries[MAX_CACHE_ENTRIES:]:
+            shutil.rmtree(entry.path, ignore_errors=True)
@@ -0,0 +1,163 @@
+"""
+SQLite出力モジュール
+
+変換済みのデータを照合用のローカルSQLiteファイルに直接書き込む（出力CSVの読み直しが不要）。
+テーブルのカラムはテンプレートのヘッダーから作成し、名前のないカラムは「列{番号}」、
+名前が重複するカラムは「{名前}_{連番}」とする（元のヘッダーはexport_columnsテーブルに記録）。
+各行には実行ID（run_id）を付与し、同じ実行IDで再出力した場合は前回の行を置き換える。
+値はCSVと同一の文字列（空欄は空文字）で格納する。
+"""
+import itertools
+import sqlite3
+from collections import Counter
+from datetime import datetime
+from typing import List, Optional
+import pandas as pd
+from byte_csv_writer import column_texts
+
+
+# テーブル名
+REGISTRATIONS_TABLE = "registrations"
+COLUMNS_TABLE = "export_columns"
+RUNS_TABLE = "export_runs"
+
+# インデックスを作成するカラム
+INDEXED_COLUMN = "引継番号"
+
+
+def _quote_identifier(name: str) -> str:
+    """SQLの識別子としてダブルクォートで囲む"""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def get_column_names(headers: List[str]) -> List[str]:
+    """
+    テンプレートのヘッダーからテーブルのカラム名を作成（空欄・重複を一意な名前に変換）
+    
+    Args:
+        headers: テンプレートのヘッダー（カラム順、空欄・重複を含む）
+    
+    Returns:
+        ヘッダーと同じ順序のカラム名のリスト
+    """
+    reserved = {"run_id", "row_number"}
+    used = set()
+    seen = Counter()
+    names = []
+    for position, header in enumerate(headers, 1):
+        base = str(header).strip() or f"列{position}"
+        seen[base] += 1
+        name = base if seen[base] == 1 else f"{base}_{seen[base]}"
+        while name.lower() in used or name.lower() in reserved:
+            seen[base] += 1
+            name = f"{base}_{seen[base]}"
+        # SQLiteのカラム名は大文字・小文字を区別しない
+        used.add(name.lower())
+        names.append(name)
+    return names
+
+
+class SqliteExporter:
+    """変換済みのデータをSQLiteファイルに書き込むクラス"""
+    
+    def __init__(self, db_path: str, headers: List[str]):
+        """
+        初期化（テーブルが存在しない場合は作成）
+        
+        Args:
+            db_path: SQLiteファイルのパス
+            headers: テンプレートのヘッダー（カラム順、空欄・重複を含む）
+        """
+        self.db_path = db_path
+        self.headers = headers
+        self.columns = get_column_names(headers)
+        self.conn = sqlite3.connect(db_path)
+        # 一括書き込みのためジャーナルをWALにし、コミットごとの同期を減らす
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_tables()
+    
+    def _create_tables(self):
+        """テーブル・インデックスを作成（既存のテーブルとカラムが異なる場合はエラー）"""
+        existing = [row[1] for row in self.conn.execute(
+            f"PRAGMA table_info({_quote_identifier(REGISTRATIONS_TABLE)})"
+        )]
+        if existing and existing != ["run_id", "row_number"] + self.columns:
+            raise ValueError(
+                f"{self.db_path} の{REGISTRATIONS_TABLE}テーブルのカラムがテンプレートのヘッダーと異なります"
+                "（別のファイルを指定してください）"
+            )
+        
+        column_defs = ", ".join(f"{_quote_identifier(name)} TEXT" for name in self.columns)
+        with self.conn:
+            self.conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {REGISTRATIONS_TABLE} ("
+                f"run_id TEXT NOT NULL, row_number INTEGER NOT NULL, {column_defs}, "
+                f"PRIMARY KEY (run_id, row_number))"
+            )
+            if INDEXED_COLUMN in self.columns:
+                self.conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_{REGISTRATIONS_TABLE}_contract "
+                    f"ON {REGISTRATIONS_TABLE} ({_quote_identifier(INDEXED_COLUMN)})"
+                )
+            self.conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {COLUMNS_TABLE} (
+                    position INTEGER PRIMARY KEY,
+                    column_name TEXT NOT NULL,
+                    header TEXT NOT NULL
+                )
+                """
+            )
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO {COLUMNS_TABLE} (position, column_name, header) VALUES (?, ?, ?)",
+                [(position, name, str(header))
+                 for position, (name, header) in enumerate(zip(self.columns, self.headers), 1)]
+            )
+            self.conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {RUNS_TABLE} (
+                    run_id TEXT PRIMARY KEY,
+                    exported_at TEXT NOT NULL,
+                    output_filename TEXT,
+                    row_count INTEGER NOT NULL
+                )
+                """
+            )
+    
+    def insert(self, df: pd.DataFrame, run_id: str,
+               output_filename: Optional[str] = None) -> int:
+        """
+        DataFrameを1トランザクションで書き込み（同じ実行IDの既存の行は置き換え）
+        
+        Args:
+            df: 出力するDataFrame
+            run_id: 実行ID
+            output_filename: 同時に出力したCSVのファイル名（実行の記録用。分割出力の場合は
+                分割したファイル名のカンマ区切り）
+        
+        Returns:
+            書き込んだ行数
+        """
+        # すべての値をパラメーターとしてバインドする（値がすべて同じカラムは同じ文字列を繰り返す）
+        columns = [itertools.repeat(texts) if isinstance(texts, str) else texts
+                   for texts in column_texts(df, self.headers)]
+        placeholders = ", ".join("?" * (len(columns) + 2))
+        insert_sql = f"INSERT INTO {REGISTRATIONS_TABLE} VALUES ({placeholders})"
+        # 行のタプルはカラムごとの値をzipで組み立て、executemanyに逐次渡す（全行のリストは作らない）
+        rows = itertools.islice(zip(itertools.repeat(run_id), itertools.count(1), *columns), len(df))
+        
+        # with文により、例外発生時はロールバックされる（途中までの行は残らない）
+        with self.conn:
+            self.conn.execute(f"DELETE FROM {REGISTRATIONS_TABLE} WHERE run_id = ?", (run_id,))
+            self.conn.executemany(insert_sql, rows)
+            self.conn.execute(
+                f"INSERT OR REPLACE INTO {RUNS_TABLE} (run_id, exported_at, output_filename, row_count) "
+                f"VALUES (?, ?, ?, ?)",
+                (run_id, datetime.now().isoformat(timespec="seconds"), output_filename, len(df))
+            )
+        return len(df)
+    
+    def close(self):
+        """接続を閉じる"""
+        self.conn.close()
@@ -0,0 +1,163 @@
+"""
+処理状態ストアモジュール
+
+出力済みレコード・除外したレコード（検証エラー・重複など）の契約番号と内容ハッシュを
+SQLiteに記録し、差分（新規・変更）レコードのみを処理するために使用する。
+内容が変わっていない除外レコードは次回も除外されるため、再処理しない。
+"""
+import os
+import sqlite3
+from datetime import datetime
+from typing import Dict, Tuple
+import pandas as pd
+from utils import safe_str_convert, add_leading_zero
+
+
+# 差分判定のキー列
+STATE_KEY_COLUMN = "契約番号"
+
+# 記録するレコードの状態
+STATUS_EXPORTED = "exported"
+STATUS_REJECTED = "rejected"
+
+
+def compute_row_hashes(df: pd.DataFrame) -> pd.Series:
+    """
+    各行の内容ハッシュを計算
+    
+    型推論の揺れ（例: 101 と 101.0）の影響を抑えるため、
+    すべての値を文字列化してからハッシュ化する。
+    
+    Args:
+        df: 案件取込用レポートのDataFrame
+    
+    Returns:
+        16進文字列のハッシュ値Series（インデックスはdfと同じ）
+    """
+    if df.empty:
+        return pd.Series([], index=df.index, dtype=object)
+    
+    normalized = df.astype(object).where(df.notna(), "").astype(str)
+    hashes = pd.util.hash_pandas_object(normalized, index=False)
+    return hashes.map(lambda h: format(h, "016x"))
+
+
+class StateStore:
+    """出力済みレコードの状態を管理するクラス"""
+    
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        self._create_tables()
+    
+    def _create_tables(self):
+        """テーブルを作成（存在しない場合のみ）"""
+        with self.conn:
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS exported_rows (
+                    contract_number TEXT PRIMARY KEY,
+                    row_hash TEXT NOT NULL,
+                    exported_at TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'exported'
+                )
+                """
+            )
+            # 状態カラムがない以前の状態ストアは、記録済みのレコードをすべて出力済みとして扱う
+            columns = [row[1] for row in self.conn.execute("PRAGMA table_info(exported_rows)")]
+            if "status" not in columns:
+                self.conn.execute(
+                    "ALTER TABLE exported_rows ADD COLUMN status TEXT NOT NULL DEFAULT 'exported'"
+                )
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS runs (
+                    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    finished_at TEXT NOT NULL,
+                    source_count INTEGER NOT NULL,
+                    delta_count INTEGER NOT NULL,
+                    exported_count INTEGER NOT NULL
+                )
+                """
+            )
+    
+    def load_hashes(self) -> Dict[str, str]:
+        """記録済みの {契約番号: ハッシュ} を取得"""
+        cursor = self.conn.execute("SELECT contract_number, row_hash FROM exported_rows")
+        return dict(cursor.fetchall())
+    
+    def filter_delta(self, report_df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Series]:
+        """
+        前回までに出力済み・除外済みで内容が変わっていない行を除外
+        
+        Args:
+            report_df: 案件取込用レポートのDataFrame
+        
+        Returns:
+            (新規・変更行のDataFrame, 新規・変更行のハッシュSeries)
+            （インデックスは元の行番号のまま）
+        """
+        row_hashes = compute_row_hashes(report_df)
+        if STATE_KEY_COLUMN not in report_df.columns:
+            return report_df, row_hashes
+        
+        stored = self.load_hashes()
+        contract_numbers = report_df[STATE_KEY_COLUMN].map(safe_str_convert)
+        stored_hashes = contract_numbers.map(stored)
+        delta_mask = (contract_numbers == "") | (stored_hashes != row_hashes)
+        
+        delta_df = report_df[delta_mask]
+        delta_hashes = row_hashes[delta_mask]
+        
+        print(f"差分処理: 全{len(report_df)}件中 {len(delta_df)}件が新規・変更レコード")
+        return delta_df, delta_hashes
+    
+    def record_exported(self, delta_df: pd.DataFrame, delta_hashes: pd.Series,
+                        output_df: pd.DataFrame, source_count: int) -> Tuple[int, int]:
+        """
+        出力されたレコードと除外されたレコードを1トランザクションで記録
+        
+        Args:
+            delta_df: 処理対象とした差分レコードのDataFrame
+            delta_hashes: 差分レコードのハッシュSeries
+            output_df: 出力したDataFrame（引継番号で出力済みかを判定、出力なしの場合は0件）
+            source_count: 元データの件数
+        
+        Returns:
+            (出力済みとして記録した件数, 除外として記録した件数)
+        """
+        exported_numbers = set(output_df["引継番号"]) if "引継番号" in output_df.columns else set()
+        now = datetime.now().isoformat(timespec="seconds")
+        rows = []
+        exported_count = 0
+        if STATE_KEY_COLUMN in delta_df.columns:
+            for value, row_hash in zip(delta_df[STATE_KEY_COLUMN], delta_hashes):
+                number = safe_str_convert(value)
+                if not number:
+                    # 契約番号がないレコードは差分を判定できないため記録しない
+                    continue
+                if add_leading_zero(number) in exported_numbers:
+                    rows.append((number, row_hash, now, STATUS_EXPORTED))
+                    exported_count += 1
+                else:
+                    rows.append((number, row_hash, now, STATUS_REJECTED))
+        
+        # with文により、例外発生時はロールバックされる
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO exported_rows (contract_number, row_hash, exported_at, status) "
+                "VALUES (?, ?, ?, ?)",
+                rows
+            )
+            self.conn.execute(
+                "INSERT INTO runs (finished_at, source_count, delta_count, exported_count) "
+                "VALUES (?, ?, ?, ?)",
+                (now, source_count, len(delta_df), exported_count)
+            )
+        
+        return exported_count, len(rows) - exported_count
+    
+    def close(self):
+        """接続を閉じる"""
+        self.conn.close()
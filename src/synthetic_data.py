@@ -0,0 +1,290 @@
+"""
+合成データ生成モジュール
+
+実データを使用せずに処理性能を計測するため、案件取込用レポートとContractListの
+合成データ（cp932）を生成する。実際のカラム名を使用し、住所表記の揺れ・同一物件の
+繰り返し・保証人/緊急連絡人の行・異常な生年月日・登録済みの契約番号を含める。
+
+使用例:
+    python src/synthetic_data.py --rows 10000 --output-dir bench_data
+"""
+import argparse
+import csv
+import os
+import random
+from typing import List, Optional, Tuple
+
+
+# 案件取込用レポートのカラム（変換処理が参照するカラム）
+REPORT_COLUMNS = [
+    "契約番号", "契約元帳: 主契約者", "主契約者（カナ）", "生年月日1", "自宅TEL1", "携帯TEL1",
+    "物件名", "部屋番号", "賃料", "管理共益費", "駐車場料金", "その他料金", "決済サービス料",
+    "未収金額合計", "バーチャル口座(支店)", "バーチャル口座(口座番号)", "勤務先1", "勤務先TEL1",
+    "取引先", "物件住所", "勤務先住所1", "種別／続柄２", "名前2", "名前2（カナ）", "生年月日2",
+    "自宅TEL2", "携帯TEL2", "自宅住所2", "入居日"
+]
+
+# ContractListのカラム
+CONTRACT_LIST_COLUMNS = ["引継番号", "契約者氏名", "物件名", "部屋番号"]
+
+# 一度に書き込む行数
+WRITE_CHUNK_SIZE = 10000
+
+# 契約番号の開始値
+CONTRACT_NUMBER_START = 100000
+
+_LAST_NAMES = [("山田", "ﾔﾏﾀﾞ"), ("佐藤", "ｻﾄｳ"), ("鈴木", "ｽｽﾞｷ"), ("高橋", "ﾀｶﾊｼ"),
+               ("田中", "ﾀﾅｶ"), ("伊藤", "ｲﾄｳ"), ("渡辺", "ﾜﾀﾅﾍﾞ"), ("中村", "ﾅｶﾑﾗ")]
+_FIRST_NAMES = [("太郎", "ﾀﾛｳ"), ("花子", "ﾊﾅｺ"), ("健一", "ｹﾝｲﾁ"), ("美咲", "ﾐｻｷ"),
+                ("大輔", "ﾀﾞｲｽｹ"), ("陽子", "ﾖｳｺ"), ("翔", "ｼｮｳ"), ("結衣", "ﾕｲ")]
+
+# (都道府県, 市区町村, 町域) の組み合わせ（政令指定都市の区・郡を含む）
+_LOCALITIES = [
+    ("東京都", "新宿区", "西新宿"), ("東京都", "世田谷区", "三軒茶屋"), ("東京都", "八王子市", "旭町"),
+    ("大阪府", "大阪市北区", "梅田"), ("神奈川県", "横浜市中区", "本町"), ("埼玉県", "入間郡三芳町", "藤久保"),
+    ("北海道", "札幌市中央区", "北一条西"), ("京都府", "京都市中京区", "烏丸通"), ("福岡県", "福岡市博多区", "博多駅前"),
+    ("愛知県", "名古屋市中区", "栄")
+]
+
+_BUILDING_NAMES = ["ハイツ", "メゾン", "グランド", "コーポ", "レジデンス", "パークハウス", "ヴィラ"]
+_RELATIONSHIPS = ["保証人", "連帯保証人", "緊急連絡先", "(法)代表者１/", "", "", ""]
+_BAD_BIRTHDATES = ["1899/12/31", "1800-01-01", "不明", "abc", "0000/00/00"]
+_COMPANIES = ["株式会社テスト", "有限会社サンプル", "合同会社ダミー", ""]
+_MANAGEMENT_COMPANIES = ["テスト管理", "サンプル不動産", "ダミーハウジング"]
+
+
+class SyntheticDataGenerator:
+    """案件取込用レポートとContractListの合成データを生成するクラス"""
+    
+    def __init__(self, seed: int = 0,
+                 duplicate_ratio: float = 0.05,
+                 bad_birthdate_ratio: float = 0.02,
+                 building_count: Optional[int] = None):
+        """
+        初期化
+        
+        Args:
+            seed: 乱数シード（同じシードからは同じデータを生成）
+            duplicate_ratio: ContractListに登録済みとする契約番号の割合
+            bad_birthdate_ratio: 異常な生年月日を含める割合
+            building_count: 物件数（Noneの場合は行数の約1/20）
+        """
+        self.seed = seed
+        self.duplicate_ratio = duplicate_ratio
+        self.bad_birthdate_ratio = bad_birthdate_ratio
+        self.building_count = building_count
+    
+    def _postal_code(self, rng: random.Random) -> str:
+        """7桁の郵便番号を生成"""
+        return f"{rng.randint(100, 999)}{rng.randint(0, 9999):04d}"
+    
+    def _address(self, rng: random.Random, locality: Tuple[str, str, str]) -> str:
+        """表記揺れを含む住所を生成"""
+        prefecture, city, town = locality
+        block = f"{rng.randint(1, 9)}-{rng.randint(1, 30)}-{rng.randint(1, 20)}"
+        postal = self._postal_code(rng)
+        style = rng.randint(0, 5)
+        if style == 0:
+            return f"〒{postal[:3]}-{postal[3:]} {prefecture}{city}{town}{block}"
+        if style == 1:
+            return f"{postal}{prefecture}{city}{town}{block}"
+        if style == 2:
+            # 全角数字
+            return f"{prefecture}{city}{town}{block.translate(str.maketrans('0123456789-', '０１２３４５６７８９－'))}"
+        if style == 3:
+            # 都道府県なし
+            return f"{city}{town}{block}"
+        if style == 4:
+            return f"{postal[:3]}-{postal[3:]}　{prefecture}　{city}{town}{rng.randint(1, 9)}丁目{rng.randint(1, 30)}番地"
+        return f"{prefecture}{city}{town}{block}"
+    
+    def _phone(self, rng: random.Random, mobile: bool) -> str:
+        """電話番号を生成（一部は空欄）"""
+        if rng.random() < 0.3:
+            return ""
+        if mobile:
+            return f"0{rng.choice([70, 80, 90])}-{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}"
+        return f"0{rng.randint(3, 99)}-{rng.randint(100, 9999)}-{rng.randint(1000, 9999)}"
+    
+    def _birthdate(self, rng: random.Random) -> str:
+        """表記揺れ・異常値を含む生年月日を生成"""
+        if rng.random() < self.bad_birthdate_ratio:
+            return rng.choice(_BAD_BIRTHDATES)
+        if rng.random() < 0.1:
+            return ""
+        year, month, day = rng.randint(1940, 2004), rng.randint(1, 12), rng.randint(1, 28)
+        return rng.choice([f"{year}/{month:02d}/{day:02d}", f"{year}-{month:02d}-{day:02d}", f"{year}年{month}月{day}日"])
+    
+    def _buildings(self, rng: random.Random, rows: int) -> List[Tuple[str, str]]:
+        """物件名と物件住所の一覧を生成（同一物件が繰り返し出現する）"""
+        count = self.building_count or max(1, rows // 20)
+        buildings = []
+        for i in range(count):
+            locality = rng.choice(_LOCALITIES)
+            name = f"{rng.choice(_BUILDING_NAMES)}{locality[2]}{i + 1}"
+            buildings.append((name, self._address(rng, locality)))
+        return buildings
+    
+    def generate_report_rows(self, rows: int):
+        """
+        案件取込用レポートの行を生成（ジェネレーター）
+        
+        Args:
+            rows: 行数
+        
+        Yields:
+            1行分の値のリスト（REPORT_COLUMNSの順）
+        """
+        rng = random.Random(self.seed)
+        buildings = self._buildings(rng, rows)
+        
+        for i in range(rows):
+            last, last_kana = rng.choice(_LAST_NAMES)
+            first, first_kana = rng.choice(_FIRST_NAMES)
+            # 偏りのある物件の選択（一部の物件に行が集中する）
+            building_name, building_address = buildings[int(len(buildings) * rng.random() ** 2)]
+            room = rng.choice([str(rng.randint(101, 1205)), f"{rng.randint(101, 905)}.0", ""])
+            if rng.random() < 0.1:
+                # 物件名に部屋番号を含む表記
+                building_name = f"{building_name} {rng.randint(101, 905)}号室"
+            
+            relationship = rng.choice(_RELATIONSHIPS)
+            has_contact = relationship != ""
+            contact_last, contact_last_kana = rng.choice(_LAST_NAMES)
+            contact_first, contact_first_kana = rng.choice(_FIRST_NAMES)
+            
+            yield [
+                str(CONTRACT_NUMBER_START + i),
+                f"{last}　{first}" if rng.random() > 0.001 else "",
+                f"{last_kana} {first_kana}",
+                self._birthdate(rng),
+                self._phone(rng, mobile=False),
+                self._phone(rng, mobile=True),
+                building_name,
+                room,
+                str(rng.randint(30, 150) * 1000),
+                str(rng.choice([0, 3000, 5000, 8000])),
+                rng.choice(["", "0", "10000", "15000"]),
+                rng.choice(["0", "1000", ""]),
+                "300",
+                rng.choice(["0", "0", "0", str(rng.randint(1, 300) * 1000)]),
+                rng.choice(["アオバ", "サクラ", "ツバキ"]),
+                f"{rng.randint(0, 9999999):07d}",
+                rng.choice(_COMPANIES),
+                self._phone(rng, mobile=False),
+                rng.choice(_MANAGEMENT_COMPANIES),
+                building_address,
+                self._address(rng, rng.choice(_LOCALITIES)) if rng.random() < 0.6 else "",
+                relationship,
+                f"{contact_last} {contact_first}" if has_contact else "",
+                f"{contact_last_kana} {contact_first_kana}" if has_contact else "",
+                self._birthdate(rng) if has_contact else "",
+                self._phone(rng, mobile=False) if has_contact else "",
+                self._phone(rng, mobile=True) if has_contact else "",
+                self._address(rng, rng.choice(_LOCALITIES)) if has_contact else "",
+                f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+            ]
+    
+    def registered_contract_numbers(self, rows: int) -> List[str]:
+        """ContractListに登録済みとする契約番号（レポートの契約番号から選択）"""
+        rng = random.Random(self.seed + 1)
+        count = int(rows * self.duplicate_ratio)
+        return [str(CONTRACT_NUMBER_START + i) for i in sorted(rng.sample(range(rows), count))]
+    
+    def write_report(self, path: str, rows: int, encoding: str = "cp932") -> str:
+        """
+        案件取込用レポートのCSVを出力
+        
+        Args:
+            path: 出力ファイルパス
+            rows: 行数
+            encoding: 文字エンコーディング
+        
+        Returns:
+            出力したファイルのパス
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", newline="", encoding=encoding) as f:
+            writer = csv.writer(f)
+            writer.writerow(REPORT_COLUMNS)
+            chunk = []
+            for row in self.generate_report_rows(rows):
+                chunk.append(row)
+                if len(chunk) >= WRITE_CHUNK_SIZE:
+                    writer.writerows(chunk)
+                    chunk = []
+            writer.writerows(chunk)
+        return path
+    
+    def write_contract_list(self, path: str, rows: int, encoding: str = "cp932") -> str:
+        """
+        ContractListのCSVを出力（引継番号は契約番号の先頭に0を付与した形式）
+        
+        Args:
+            path: 出力ファイルパス
+            rows: レポートの行数（登録済みの件数はduplicate_ratioから算出）
+            encoding: 文字エンコーディング
+        
+        Returns:
+            出力したファイルのパス
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        rng = random.Random(self.seed + 2)
+        with open(path, "w", newline="", encoding=encoding) as f:
+            writer = csv.writer(f)
+            writer.writerow(CONTRACT_LIST_COLUMNS)
+            for number in self.registered_contract_numbers(rows):
+                last, _ = rng.choice(_LAST_NAMES)
+                first, _ = rng.choice(_FIRST_NAMES)
+                writer.writerow(["0" + number, f"{last}{first}", "", ""])
+        return path
+
+
+def generate_dataset(output_dir: str, rows: int, seed: int = 0,
+                     duplicate_ratio: float = 0.05,
+                     encoding: str = "cp932",
+                     overwrite: bool = False) -> Tuple[str, str]:
+    """
+    指定サイズの合成データ一式を出力（同一条件のファイルが存在する場合は再利用）
+    
+    Args:
+        output_dir: 出力ディレクトリ
+        rows: レポートの行数
+        seed: 乱数シード
+        duplicate_ratio: ContractListに登録済みとする契約番号の割合
+        encoding: 文字エンコーディング
+        overwrite: Trueの場合は既存のファイルを上書き
+    
+    Returns:
+        (案件取込用レポートのパス, ContractListのパス)
+    """
+    suffix = f"{rows}_seed{seed}"
+    report_path = os.path.join(output_dir, f"synthetic_report_{suffix}.csv")
+    contract_list_path = os.path.join(output_dir, f"ContractList_synthetic_{suffix}.csv")
+    
+    generator = SyntheticDataGenerator(seed=seed, duplicate_ratio=duplicate_ratio)
+    if overwrite or not os.path.exists(report_path):
+        generator.write_report(report_path, rows, encoding)
+    if overwrite or not os.path.exists(contract_list_path):
+        generator.write_contract_list(contract_list_path, rows, encoding)
+    return report_path, contract_list_path
+
+
+def main():
+    """メイン関数 - 合成データを出力"""
+    parser = argparse.ArgumentParser(description="案件取込用レポートとContractListの合成データを生成")
+    parser.add_argument("--rows", help="行数（複数指定可）", type=int, action="append", required=True)
+    parser.add_argument("--output-dir", help="出力ディレクトリ", default="synthetic_data")
+    parser.add_argument("--seed", help="乱数シード", type=int, default=0)
+    parser.add_argument("--duplicate-ratio", help="ContractListに登録済みとする割合", type=float, default=0.05)
+    args = parser.parse_args()
+    
+    for rows in args.rows:
+        report_path, contract_list_path = generate_dataset(
+            args.output_dir, rows, args.seed, args.duplicate_ratio, overwrite=True
+        )
+        print(f"{rows}行: {report_path}, {contract_list_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -241,7 +241,13 @@ def get_today_formatted() -> str:
     return datetime.now().strftime("%Y/%m/%d")
 
 
-def get_output_filename() -> str:
-    """出力ファイル名を生成（MMDDアーク新規登録.csv）"""
+def get_output_filename(extension: str = ".csv") -> str:
+    """出力ファイル名を生成（MMDDアーク新規登録.csv、Excel出力時は.xlsx）"""
     today = datetime.now()
-    return f"{today.strftime('%m%d')}アーク新規登録.csv"
\ No newline at end of file
+    return f"{today.strftime('%m%d')}アーク新規登録{extension}"
+
+
+def get_preview_output_filename(extension: str = ".csv") -> str:
+    """プレビュー出力ファイル名を生成（MMDDアーク新規登録_プレビュー.csv）"""
+    today = datetime.now()
+    return f"{today.strftime('%m%d')}アーク新規登録_プレビュー{extension}"
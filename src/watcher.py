@@ -0,0 +1,160 @@
+"""
+フォルダ監視モジュール
+
+指定ディレクトリを常駐監視し、新しく配置された（上書きされた）案件取込用レポートを即座に変換する。
+変換器・住所分割器・ContractListの引継番号インデックスはメモリ上に保持し、
+新しいContractListが配置された場合はバックグラウンドのスレッドでそのファイル分のみを追加で読み込む。
+"""
+import fnmatch
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from data_loader import DataLoader, ContractKeyIndex
+from data_transformer import DataTransformer
+from data_exporter import get_template_headers
+from batch_runner import process_branch
+
+
+# 新しいContractListの配置を確認する間隔（秒、レポートの監視とは別のスレッドで確認）
+CONTRACT_INDEX_REFRESH_SECONDS = 5.0
+
+
+class FolderWatcher:
+    """案件取込用レポートの配置を監視して変換するクラス"""
+    
+    def __init__(self, watch_dir: str,
+                 report_patterns: List[str],
+                 output_dir: str,
+                 contract_list_dir: Optional[str] = None,
+                 contract_list_glob: Optional[str] = None,
+                 encoding: str = "cp932",
+                 skip_report: bool = False,
+                 poll_interval: float = 0.5,
+                 refresh_interval: float = CONTRACT_INDEX_REFRESH_SECONDS):
+        self.watch_dir = watch_dir
+        self.report_patterns = report_patterns
+        self.output_dir = output_dir
+        self.encoding = encoding
+        self.skip_report = skip_report
+        self.poll_interval = poll_interval
+        self.refresh_interval = refresh_interval
+        
+        # 常駐させる処理オブジェクト（変換器は住所分割器を内包）
+        self.transformer = DataTransformer()
+        self.contract_index = ContractKeyIndex(
+            DataLoader(encoding=encoding),
+            contract_list_dir or watch_dir,
+            contract_list_glob
+        )
+        
+        # 監視状態: 未処理ファイルの前回観測 (サイズ, 更新時刻) と
+        # 処理済みファイルの処理時点の (サイズ, 更新時刻)（上書きされた場合は再処理する）
+        self.pending: Dict[str, Tuple[int, float]] = {}
+        self.processed: Dict[str, Tuple[int, float]] = {}
+    
+    def warm_up(self):
+        """テンプレートヘッダーとContractListのインデックスを事前に読み込み、インデックスの定期更新を開始"""
+        get_template_headers()
+        self.contract_index.load()
+        self.contract_index.start_refresh(self.refresh_interval)
+        
+        # 起動時に存在するレポートは処理済みとして扱う
+        self.processed.update(self._scan_reports())
+        
+        print(f"監視準備完了: 引継番号 {len(self.contract_index.keys)}件、既存レポート {len(self.processed)}件をスキップ")
+    
+    def _scan_reports(self) -> Dict[str, Tuple[int, float]]:
+        """監視ディレクトリ内のレポートの (サイズ, 更新時刻) を取得"""
+        reports = {}
+        try:
+            with os.scandir(self.watch_dir) as entries:
+                for entry in entries:
+                    if not self._is_report(entry.name):
+                        continue
+                    try:
+                        stat_result = entry.stat()
+                    except OSError:
+                        continue
+                    reports[entry.path] = (stat_result.st_size, stat_result.st_mtime)
+        except FileNotFoundError:
+            pass
+        return reports
+    
+    def poll_once(self) -> List[str]:
+        """
+        監視ディレクトリを1回走査し、書き込みが完了した新規レポートを処理
+        
+        前回の走査時からサイズと更新時刻が変化していないファイルを書き込み完了とみなす。
+        処理済みのファイルも、サイズまたは更新時刻が変化した（上書きされた）場合は再処理する。
+        新しいContractListの読み込みはstart_refresh()のスレッドで行うため、ここでは扱わない。
+        
+        Returns:
+            処理したレポートのパスのリスト
+        """
+        current = self._scan_reports()
+        
+        handled = []
+        for path, observed in current.items():
+            if self.processed.get(path) == observed:
+                continue
+            if not self._is_ready(path, observed):
+                continue
+            
+            self.processed[path] = observed
+            self.process_report(path)
+            handled.append(path)
+        
+        # 削除されたファイルの監視状態を破棄
+        for state in (self.pending, self.processed):
+            for path in list(state):
+                if path not in current:
+                    del state[path]
+        
+        return handled
+    
+    def _is_report(self, path: str) -> bool:
+        """案件取込用レポートのパターンに一致するか"""
+        name = os.path.basename(path)
+        return any(fnmatch.fnmatch(name, pattern) for pattern in self.report_patterns)
+    
+    def _is_ready(self, path: str, observed: Tuple[int, float]) -> bool:
+        """前回の走査時からサイズと更新時刻が変化していなければ書き込み完了とみなす"""
+        if self.pending.get(path) != observed or observed[0] == 0:
+            # 初回観測または書き込み中
+            self.pending[path] = observed
+            return False
+        self.pending.pop(path, None)
+        return True
+    
+    def process_report(self, report_path: str):
+        """1件のレポートを変換"""
+        output_dir = os.path.join(self.output_dir, Path(report_path).stem)
+        result = process_branch(
+            Path(report_path).stem,
+            report_path,
+            output_dir,
+            self.encoding,
+            self.skip_report,
+            contract_keys=self.contract_index.keys,
+            transformer=self.transformer
+        )
+        if result.get("error"):
+            print(f"エラー: {os.path.basename(report_path)}: {result['error']}")
+        else:
+            print(f"変換完了: {os.path.basename(report_path)} → {result['output_path']}")
+    
+    def run(self):
+        """監視ループを実行（Ctrl+Cで終了）"""
+        self.warm_up()
+        print(f"{self.watch_dir} を監視中...（Ctrl+Cで終了）")
+        try:
+            while True:
+                started = time.monotonic()
+                self.poll_once()
+                elapsed = time.monotonic() - started
+                time.sleep(max(0.0, self.poll_interval - elapsed))
+        except KeyboardInterrupt:
+            print("\n監視を終了しました。")
+        finally:
+            self.contract_index.stop_refresh()
@@ -0,0 +1,90 @@
+"""
+Excel出力モジュール
+
+変換済みのデータをExcelブック（.xlsx）に出力する。xlsxwriterの省メモリモード
+（constant_memory）で行ごとにファイルへ書き出し、DataFrameも一定の行数ごとに文字列化するため、
+書き込み中のメモリ使用量は行数によらない。すべてのセルを文字列として書き込み、列の書式も
+文字列（@）とするため、先頭が0の引継番号・電話番号などが数値に変換されない。
+xlsxwriterがインストールされている場合のみ使用できる。
+"""
+import itertools
+from typing import List
+import pandas as pd
+from byte_csv_writer import column_texts
+
+
+# シート名
+XLSX_SHEET_NAME = "新規登録"
+
+# 1回に文字列化する行数
+XLSX_ROW_BLOCK_SIZE = 10000
+
+# 1シートの最大行数（ヘッダーを含む）
+XLSX_MAX_ROWS = 1048576
+
+
+class XlsxWriter:
+    """固定ヘッダーのExcelブックを行ごとに書き込むクラス"""
+    
+    def __init__(self, output_path: str, headers: List[str],
+                 sheet_name: str = XLSX_SHEET_NAME):
+        """
+        初期化（ブックを作成してヘッダー行を書き込む）
+        
+        Args:
+            output_path: 出力ファイルパス
+            headers: 出力するヘッダー（テンプレートのカラム順、重複を含む）
+            sheet_name: シート名
+        """
+        try:
+            import xlsxwriter
+        except ImportError:
+            raise ImportError("xlsxwriterがインストールされていないため、.xlsxを出力できません（pip install xlsxwriter）")
+        
+        self.headers = headers
+        self.row_count = 0
+        # 文字列を数値・数式・URLに変換しない（既定の動作を明示）
+        self.workbook = xlsxwriter.Workbook(output_path, {
+            "constant_memory": True,
+            "strings_to_numbers": False,
+            "strings_to_formulas": False,
+            "strings_to_urls": False
+        })
+        self.worksheet = self.workbook.add_worksheet(sheet_name)
+        self.text_format = self.workbook.add_format({"num_format": "@"})
+        if headers:
+            # 空欄のセルに後から入力した値も文字列として扱われるよう列の書式を設定
+            self.worksheet.set_column(0, len(headers) - 1, None, self.text_format)
+        for column, header in enumerate(headers):
+            self.worksheet.write_string(0, column, str(header), self.text_format)
+    
+    def write(self, df: pd.DataFrame) -> int:
+        """
+        DataFrameのデータ行を追記（複数回の呼び出しでチャンクを順に書き込める）
+        
+        Args:
+            df: 出力するDataFrame
+        
+        Returns:
+            書き込んだ行数
+        """
+        if self.row_count + len(df) + 1 > XLSX_MAX_ROWS:
+            raise ValueError(f"Excelの1シートの最大行数（{XLSX_MAX_ROWS}行）を超えるため出力できません")
+        
+        write_string = self.worksheet.write_string
+        text_format = self.text_format
+        for start in range(0, len(df), XLSX_ROW_BLOCK_SIZE):
+            block = df.iloc[start:start + XLSX_ROW_BLOCK_SIZE]
+            columns = [itertools.repeat(texts) if isinstance(texts, str) else texts
+                       for texts in column_texts(block, self.headers)]
+            for cells in itertools.islice(zip(*columns), len(block)):
+                self.row_count += 1
+                for column, text in enumerate(cells):
+                    # 空欄のセルは書き込まない（列の書式は文字列）
+                    if text:
+                        write_string(self.row_count, column, text, text_format)
+        return len(df)
+    
+    def close(self):
+        """ブックを閉じてファイルを確定"""
+        self.workbook.close()
@@ -0,0 +1,9 @@
+"""
+テスト共通設定
+
+src/のモジュールはフラットにインポートする構成のため、srcをインポートパスに追加する。
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
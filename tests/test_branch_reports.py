@@ -0,0 +1,25 @@
+"""
+支店ごとの案件取込用レポートの検索のテスト
+"""
+import os
+from data_loader import DataLoader
+
+
+def touch(directory, name: str) -> str:
+    path = os.path.join(directory, name)
+    with open(path, "wb") as f:
+        f.write("契約番号\n1\n".encode("cp932"))
+    return path
+
+
+def test_branch_name_from_brackets_or_file_stem(tmp_path):
+    """【】の支店名がないファイルは、パターンではなくファイル名を支店名とする"""
+    tokyo = touch(tmp_path, "【東京支店】①案件取込用レポート20250710.csv")
+    touch(tmp_path, "report_20250709.csv")
+    latest = touch(tmp_path, "report_20250710.csv")
+    
+    reports = DataLoader(stability_wait=0).find_branch_reports(
+        ["【*】①案件取込用レポート*.csv", "report_*.csv"], str(tmp_path)
+    )
+    
+    assert reports == {"report_20250710": latest, "東京支店": tokyo}
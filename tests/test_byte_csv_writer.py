@@ -0,0 +1,42 @@
+"""
+バイト列CSV出力のテスト
+"""
+import csv
+import io
+import numpy as np
+import pandas as pd
+import pytest
+from data_exporter import DataExporter, get_template_headers
+
+
+# 等しいと判定されるが文字列が異なる値の混在・欠損値・数値・改行を含む値
+MIXED_COLUMNS = [
+    [1, True, 1],
+    [1, 1.0, 1],
+    [0, False, 0.0],
+    [None, np.nan, ""],
+    ["あ", 2, None],
+    ["a,b", 'c"d', "e\r\nf"],
+    [1.5, 2.5, np.nan],
+    ["固定", "固定", "固定"],
+]
+
+
+@pytest.fixture
+def mixed_df():
+    headers = get_template_headers()
+    unique_headers = [header for header in dict.fromkeys(headers) if header and headers.count(header) == 1]
+    df = pd.DataFrame({header: [""] * 3 for header in unique_headers}, dtype=object)
+    for header, values in zip(unique_headers, MIXED_COLUMNS):
+        df[header] = pd.Series(values, dtype=object)
+    return df
+
+
+def test_byte_writer_matches_csv_writer(mixed_df):
+    """値の型が混在するカラムも、csv.writerと同一のバイト列を出力する"""
+    expected = DataExporter(writer="csv").to_csv_bytes(mixed_df)
+    
+    assert DataExporter(writer="bytes").to_csv_bytes(mixed_df) == expected
+    
+    rows = list(csv.reader(io.StringIO(expected.decode("cp932"), newline="")))
+    assert [row[0] for row in rows[1:]] == ["1", "True", "1"]
@@ -0,0 +1,131 @@
+"""
+チェックポイント（checkpoint）による中断・再開のテスト
+"""
+import pytest
+import checkpoint
+from checkpoint import ChunkCheckpoint, compute_run_key, convert_with_checkpoints
+from data_exporter import DataExporter
+from data_loader import DataLoader
+from error_sink import capture_errors
+from event_log import capture_events
+
+
+CHUNK_SIZE = 10
+
+CONTRACT_KEYS = {"0105", "0117"}
+
+
+def write_csv(path, text: str) -> str:
+    """cp932でCSVを書き込む"""
+    path.write_bytes(text.encode("cp932"))
+    return str(path)
+
+
+def report_text(changed_row=None) -> str:
+    """35件のレポート（5件ごとに主契約者が空欄、2件はContractListと重複）"""
+    lines = ["契約番号,契約元帳: 主契約者,物件名"]
+    for i in range(35):
+        name = "" if i % 5 == 4 else f"契約者{i}"
+        building = f"物件{i}" + ("（変更）" if i == changed_row else "")
+        lines.append(f"{100 + i},{name},{building}")
+    return "\n".join(lines) + "\n"
+
+
+class CrashAfter:
+    """指定した件数のチャンクを変換した後に失敗する convert_chunk"""
+    
+    def __init__(self, limit=None):
+        self.limit = limit
+        self.converted = []
+    
+    def __call__(self, item):
+        if self.limit is not None and len(self.converted) >= self.limit:
+            raise RuntimeError("中断")
+        self.converted.append(item[0])
+        return CONVERT_CHUNK(item)
+
+
+CONVERT_CHUNK = checkpoint.convert_chunk
+
+
+def run(report, output, spill_dir, resume, run_key="key", convert=None, monkeypatch=None):
+    """チェックポイント付きで変換し、(再開したチャンク数, 出力バイト列, エラーの記録) を返す"""
+    if convert is not None:
+        monkeypatch.setattr(checkpoint, "convert_chunk", convert)
+    chunk_checkpoint = ChunkCheckpoint(str(spill_dir), run_key, CHUNK_SIZE)
+    resumed = chunk_checkpoint.start(resume)
+    with capture_errors() as captured, capture_events():
+        convert_with_checkpoints(DataLoader(stability_wait=0), report, CONTRACT_KEYS, str(output),
+                                 chunk_checkpoint, DataExporter())
+    return resumed, output.read_bytes(), captured.records
+
+
+def test_resume_after_crash_matches_uninterrupted_run(tmp_path, monkeypatch):
+    """途中で失敗した変換を再開すると、中断しなかった場合と同じ出力・エラーログになる"""
+    report = write_csv(tmp_path / "report.csv", report_text())
+    _, expected_bytes, expected_errors = run(report, tmp_path / "expected.csv", tmp_path / "spill0", False)
+    
+    crash = CrashAfter(limit=2)
+    with pytest.raises(RuntimeError):
+        run(report, tmp_path / "out.csv", tmp_path / "spill", False, convert=crash, monkeypatch=monkeypatch)
+    assert crash.converted == [0, 1]
+    assert not (tmp_path / "out.csv").exists()
+    
+    resume = CrashAfter()
+    resumed, output_bytes, errors = run(report, tmp_path / "out.csv", tmp_path / "spill", True,
+                                        convert=resume, monkeypatch=monkeypatch)
+    
+    assert resumed == 2
+    assert resume.converted == [2, 3]
+    assert output_bytes == expected_bytes
+    assert len(errors) == len(expected_errors) == 7
+    assert [(e["index"], e["contract_number"], e["reason"]) for e in errors] == \
+        [(e["index"], e["contract_number"], e["reason"]) for e in expected_errors]
+    assert not (tmp_path / "spill").exists()
+
+
+def test_changed_input_chunk_is_converted_again(tmp_path, monkeypatch):
+    """再開時に入力内容が変わったチャンクは保存済みの結果を使用しない"""
+    report = write_csv(tmp_path / "report.csv", report_text())
+    with pytest.raises(RuntimeError):
+        run(report, tmp_path / "out.csv", tmp_path / "spill", False,
+            convert=CrashAfter(limit=2), monkeypatch=monkeypatch)
+    
+    write_csv(tmp_path / "report.csv", report_text(changed_row=3))
+    resume = CrashAfter()
+    resumed, output_bytes, _ = run(report, tmp_path / "out.csv", tmp_path / "spill", True,
+                                   convert=resume, monkeypatch=monkeypatch)
+    monkeypatch.undo()
+    _, expected_bytes, _ = run(report, tmp_path / "expected.csv", tmp_path / "spill0", False)
+    
+    assert resumed == 2
+    assert resume.converted == [0, 2, 3]
+    assert output_bytes == expected_bytes
+    assert "物件3（変更）".encode("cp932") in output_bytes
+
+
+def test_changed_run_key_discards_checkpoint(tmp_path, monkeypatch):
+    """ContractList・設定などが変わった場合（実行キーが異なる場合）は最初から処理する"""
+    report = write_csv(tmp_path / "report.csv", report_text())
+    with pytest.raises(RuntimeError):
+        run(report, tmp_path / "out.csv", tmp_path / "spill", False, run_key="before",
+            convert=CrashAfter(limit=2), monkeypatch=monkeypatch)
+    
+    resume = CrashAfter()
+    resumed, _, _ = run(report, tmp_path / "out.csv", tmp_path / "spill", True, run_key="after",
+                        convert=resume, monkeypatch=monkeypatch)
+    
+    assert resumed == 0
+    assert resume.converted == [0, 1, 2, 3]
+
+
+def test_run_key_depends_on_contract_list_and_options(tmp_path):
+    """実行キーはContractListの内容と実行オプションが変わると変わる"""
+    contract_list = write_csv(tmp_path / "ContractList_20250725.csv", "引継番号\n0105\n")
+    base = compute_run_key([contract_list], {"unencodable": "substitute"})
+    
+    assert compute_run_key([contract_list], {"unencodable": "substitute"}) == base
+    assert compute_run_key([contract_list], {"unencodable": "reject"}) != base
+    
+    write_csv(tmp_path / "ContractList_20250725.csv", "引継番号\n0106\n")
+    assert compute_run_key([contract_list], {"unencodable": "substitute"}) != base
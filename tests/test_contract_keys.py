@@ -0,0 +1,60 @@
+"""
+ContractListの引継番号の読み込みのテスト
+"""
+import pandas as pd
+import pytest
+from data_loader import DataLoader
+from data_validator import DataValidator
+
+
+def write_csv(path, text: str):
+    """cp932でCSVを書き込む"""
+    path.write_bytes(text.encode("cp932"))
+    return str(path)
+
+
+@pytest.fixture
+def loader():
+    return DataLoader(stability_wait=0)
+
+
+@pytest.fixture
+def contract_list(tmp_path):
+    # 先頭が0の引継番号・前後に空白を含む引継番号・空欄を含む
+    return write_csv(tmp_path / "ContractList_20250725.csv",
+                     "引継番号,契約者氏名\n"
+                     "0100,山田太郎\n"
+                     "0200 ,佐藤花子\n"
+                     ",鈴木一郎\n"
+                     "0300,田中次郎\n")
+
+
+def test_dataframe_and_keyset_give_same_duplicates(loader, contract_list):
+    """DataFrameと引継番号の集合のどちらで重複判定しても同じ結果になる"""
+    validator = DataValidator()
+    report_df = pd.DataFrame({"契約番号": ["100", "200", "300", "400"]})
+    
+    contract_list_df = loader.load_contract_list(contract_list)
+    contract_keys = loader.load_contract_keys([contract_list])
+    
+    assert validator.get_existing_numbers(contract_list_df) == contract_keys == {"0100", "0200", "0300"}
+    
+    _, df_duplicates = validator.check_duplicates(report_df, contract_list_df)
+    _, key_duplicates = validator.check_duplicates(report_df, contract_keys)
+    assert df_duplicates == key_duplicates == ["100", "200", "300"]
+
+
+def test_contract_list_without_key_column_is_skipped(loader, contract_list, tmp_path):
+    """引継番号列がないContractListはスキップする"""
+    other = write_csv(tmp_path / "ContractList_20250726.csv", "契約番号,契約者氏名\n1,山田太郎\n")
+    
+    assert loader.load_contract_keys([contract_list, other]) == {"0100", "0200", "0300"}
+
+
+def test_corrupt_contract_list_raises(loader, tmp_path):
+    """読み込みエラーは列がない場合と区別してそのまま送出する"""
+    corrupt = write_csv(tmp_path / "ContractList_20250727.csv",
+                        '引継番号,契約者氏名\n"0100,山田太郎\n')
+    
+    with pytest.raises(pd.errors.ParserError):
+        loader.load_contract_keys([corrupt])
@@ -0,0 +1,86 @@
+"""
+変換サービス（conversion_server）のテスト
+"""
+import threading
+from http.server import ThreadingHTTPServer
+import pytest
+from conversion_server import ConversionService, ConversionRequestHandler, request_conversion
+from data_exporter import DataExporter
+from data_loader import DataLoader
+from error_sink import capture_errors
+from pipeline import run_pipeline
+
+
+REPORT_TEXT = (
+    "契約番号,契約元帳: 主契約者,物件名\n"
+    "100,山田太郎,物件A\n"
+    "200,佐藤花子,物件B\n"
+    "300,,物件C\n"
+)
+
+
+def write_csv(path, text: str) -> str:
+    """cp932でCSVを書き込む"""
+    path.write_bytes(text.encode("cp932"))
+    return str(path)
+
+
+@pytest.fixture
+def server_url(tmp_path):
+    """ポート0で変換サービスを起動してURLを返す"""
+    contract_dir = tmp_path / "downloads"
+    contract_dir.mkdir()
+    write_csv(contract_dir / "ContractList_20250725.csv", "引継番号\n0200\n")
+    
+    service = ConversionService(str(contract_dir), refresh_interval=60.0)
+    service.warm_up()
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), ConversionRequestHandler)
+    httpd.service = service
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{httpd.server_port}"
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+        service.shutdown()
+
+
+def test_convert_returns_csv_and_error_log(server_url, tmp_path):
+    """POSTしたレポートの変換結果がCLIと同じCSVになり、エラーがサマリーに含まれる"""
+    report = write_csv(tmp_path / "report.csv", REPORT_TEXT)
+    output = tmp_path / "out.csv"
+    
+    summary = request_conversion(server_url, report, str(output))
+    
+    with capture_errors():
+        expected = run_pipeline(DataLoader().load_csv(report), {"0200"})
+    assert output.read_bytes() == DataExporter().to_csv_bytes(expected.output_df)
+    
+    assert summary["original_count"] == 3
+    assert summary["duplicate_count"] == 1
+    assert summary["output_count"] == 1
+    assert [(error["stage"], error["contract_number"]) for error in summary["error_log"]] == [
+        ("検証", 300)
+    ]
+
+
+def test_concurrent_requests_keep_separate_error_logs(server_url, tmp_path):
+    """同時に実行したリクエストのエラーが互いに混ざらない"""
+    reports = [
+        write_csv(tmp_path / f"report{i}.csv", REPORT_TEXT.replace("300,", f"{300 + i},"))
+        for i in range(4)
+    ]
+    summaries = [None] * len(reports)
+    
+    def convert(i):
+        summaries[i] = request_conversion(server_url, reports[i], str(tmp_path / f"out{i}.csv"))
+    
+    threads = [threading.Thread(target=convert, args=(i,)) for i in range(len(reports))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    for i, summary in enumerate(summaries):
+        assert [error["contract_number"] for error in summary["error_log"]] == [300 + i]
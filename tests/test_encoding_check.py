@@ -0,0 +1,96 @@
+"""
+出力の文字エンコーディングで表現できない文字の検査（encoding_check）のテスト
+"""
+import pandas as pd
+import pytest
+from encoding_check import apply_unencodable_policy, find_unencodable
+from error_sink import capture_errors
+from event_log import capture_events
+from pipeline import PipelineOptions, run_pipeline
+
+
+@pytest.fixture
+def output_df():
+    # 𠮷は置換表にあり、絵文字は置換表にない
+    return pd.DataFrame({
+        "引継番号": ["0100", "0200", "0300"],
+        "契約者氏名": ["\U00020bb7田太郎", "山田\U0001f600", "佐藤花子"],
+        "賃料": [1000, 2000, 3000]
+    }, index=[5, 6, 7])
+
+
+def test_find_unencodable_marks_only_unencodable_cells(output_df):
+    """表現できない文字を含むセルのみを検出する（数値のカラムは検査しない）"""
+    mask = find_unencodable(output_df)
+    
+    assert mask.tolist() == [[False, True, False], [False, True, False], [False, False, False]]
+
+
+@pytest.mark.parametrize("policy, names, category", [
+    ("substitute", ["吉田太郎", "山田?", "佐藤花子"], "文字コード置換"),
+    ("question", ["?田太郎", "山田?", "佐藤花子"], "文字コード置換"),
+    ("reject", ["佐藤花子"], "文字コード除外"),
+])
+def test_apply_policy_records_each_cell(output_df, policy, names, category):
+    """方式ごとにセルを置換・レコードを除外し、該当したセルをエラーログと処理ログに記録する"""
+    with capture_errors() as captured, capture_events() as event_log:
+        result_df, affected = apply_unencodable_policy(output_df, policy)
+    
+    assert result_df["契約者氏名"].tolist() == names
+    assert affected == 2
+    assert [(error["index"], error["contract_number"], error["field"]) for error in captured.records] == [
+        (5, "0100", "契約者氏名"), (6, "0200", "契約者氏名")
+    ]
+    assert event_log.summary() == {category: 2}
+    # 元のDataFrameは変更しない
+    assert output_df["契約者氏名"].iat[0] == "\U00020bb7田太郎"
+
+
+def test_apply_policy_without_unencodable_returns_same_frame(output_df):
+    """表現できない文字がない場合はそのまま返す"""
+    clean_df = output_df.iloc[[2]]
+    with capture_errors() as captured:
+        result_df, affected = apply_unencodable_policy(clean_df, "reject")
+    
+    assert result_df is clean_df
+    assert affected == 0
+    assert captured.records == []
+
+
+REPORT_DF = pd.DataFrame({
+    "契約番号": [100, 200],
+    "契約元帳: 主契約者": ["\U00020bb7田太郎", "佐藤花子"],
+    "物件名": ["物件A", "物件B"]
+})
+
+
+def contains(df: pd.DataFrame, text: str) -> bool:
+    """いずれかのセルがtextを含むか"""
+    return df.astype(str).apply(lambda column: column.str.contains(text, regex=False)).any().any()
+
+
+@pytest.mark.parametrize("policy, output_count, rejected_count", [
+    ("substitute", 2, None),
+    ("reject", 1, 1),
+])
+def test_pipeline_summary_counts(policy, output_count, rejected_count):
+    """CSV出力では方式を適用し、該当セル数と除外件数を検証結果サマリーに設定する"""
+    with capture_errors(), capture_events():
+        result = run_pipeline(REPORT_DF, set(), options=PipelineOptions(unencodable=policy))
+    
+    assert len(result.output_df) == output_count
+    assert not contains(result.output_df, "\U00020bb7")
+    assert result.validation_summary["unencodable_count"] == 1
+    assert result.validation_summary.get("unencodable_rejected_count") == rejected_count
+
+
+def test_pipeline_skips_policy_for_xlsx():
+    """xlsx出力はUnicodeで保存するため、表現できない文字をそのまま出力する"""
+    with capture_errors() as captured, capture_events():
+        result = run_pipeline(REPORT_DF, set(),
+                              options=PipelineOptions(unencodable="reject", output_format="xlsx"))
+    
+    assert len(result.output_df) == 2
+    assert contains(result.output_df, "\U00020bb7田")
+    assert "unencodable_count" not in result.validation_summary
+    assert captured.records == []
@@ -0,0 +1,30 @@
+"""
+出力同一性検証のテスト
+"""
+from equivalence_check import compare_outputs, read_row_hashes
+
+
+def write_csv(path, text: str):
+    """cp932でCSVを書き込む"""
+    path.write_bytes(text.encode("cp932"))
+    return str(path)
+
+
+def test_row_hashes_follow_quoted_line_breaks(tmp_path):
+    """値に改行を含むセルは分割せず、1つのレコードとしてハッシュを求める"""
+    path = write_csv(tmp_path / "a.csv", '引継番号,備考\r\n0100,"1行目\r\n2行目"\r\n0200,なし\r\n')
+    
+    assert len(read_row_hashes(path)) == 3
+
+
+def test_compare_reports_logical_row(tmp_path):
+    """改行を含むセルの後の差異も、CSVのレコード番号で報告する"""
+    path_a = write_csv(tmp_path / "a.csv", '引継番号,備考\r\n0100,"1行目\r\n2行目"\r\n0200,なし\r\n')
+    path_b = write_csv(tmp_path / "b.csv", '引継番号,備考\r\n0100,"1行目\r\n2行目"\r\n0200,あり\r\n')
+    
+    result = compare_outputs(path_a, path_b)
+    
+    assert not result["identical"]
+    assert result["rows_a"] == result["rows_b"] == 2
+    assert result["differing_row_count"] == 1
+    assert compare_outputs(path_a, path_a)["identical"]
@@ -0,0 +1,23 @@
+"""
+エラーログのテスト
+"""
+import pandas as pd
+from error_sink import capture_errors, STAGE_VALIDATE
+from pipeline import run_pipeline
+
+
+def test_error_index_is_source_row_in_chunk():
+    """チャンク単位の変換でも、エラーの index は入力ファイル上の行番号になる"""
+    # 2番目のチャンク（ファイル上の行番号 100〜102）。重複と必須フィールドの空欄で行が除外される
+    chunk = pd.DataFrame({
+        "契約番号": ["100", "200", "300"],
+        "契約元帳: 主契約者": ["山田太郎", "佐藤花子", ""],
+    }, index=pd.RangeIndex(100, 103))
+    
+    with capture_errors() as captured:
+        result = run_pipeline(chunk, {"0100"})
+    
+    assert [(record["stage"], record["index"], record["contract_number"]) for record in captured.records] == [
+        (STAGE_VALIDATE, 102, "300")
+    ]
+    assert list(result.output_df.index) == [101]
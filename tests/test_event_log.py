@@ -0,0 +1,22 @@
+"""
+処理ログのテスト
+"""
+import logging
+from event_log import EventLog
+
+
+def test_omitted_count_excludes_only_shown_examples(capsys):
+    """ログレベルで表示しなかった事象も「他N件」に含める"""
+    event_log = EventLog(level="WARNING", max_examples=2)
+    for number in range(3):
+        event_log.event("変換エラー", f"情報 {number}", logging.INFO)
+    for number in range(3):
+        event_log.event("変換エラー", f"警告 {number}", logging.WARNING)
+    event_log.print_omitted("変換エラー")
+    event_log.close()
+    
+    assert capsys.readouterr().out.splitlines() == [
+        "  - 警告 0",
+        "  - 警告 1",
+        "  ... 他4件"
+    ]
@@ -0,0 +1,55 @@
+"""
+差分処理（--incremental）のテスト
+"""
+import sys
+import main
+
+
+REPORT_HEADER = "契約番号,契約元帳: 主契約者,物件名\n"
+
+
+def write_csv(path, text: str) -> str:
+    """cp932でCSVを書き込む"""
+    path.write_bytes(text.encode("cp932"))
+    return str(path)
+
+
+def run_incremental(monkeypatch, report: str, contract_list: str, output_dir) -> int:
+    """--incremental付きでCLIを実行して終了コードを返す"""
+    monkeypatch.setattr(sys, "argv", [
+        "main.py", "--report", report, "--contract-list", contract_list,
+        "--output-dir", str(output_dir), "--incremental", "--no-cache", "--skip-report"
+    ])
+    return main.main()
+
+
+def test_rerun_skips_exported_and_rejected_rows(monkeypatch, tmp_path, capsys):
+    """出力済み・除外済みのレコードは再処理せず、変更したレコードのみを処理する"""
+    contract_list = write_csv(tmp_path / "ContractList_20250725.csv", "引継番号\n0200\n")
+    # 100: 出力、200: 重複で除外、300: 必須フィールドが空で除外
+    rows = "100,山田太郎,物件A\n200,佐藤花子,物件B\n300,,物件C\n"
+    report = write_csv(tmp_path / "report.csv", REPORT_HEADER + rows)
+    
+    assert run_incremental(monkeypatch, report, contract_list, tmp_path / "run1") == 0
+    assert "状態ストアを更新しました: 出力1件・除外2件" in capsys.readouterr().out
+    
+    # 同一内容の再実行は何も処理せずに正常終了
+    assert run_incremental(monkeypatch, report, contract_list, tmp_path / "run1") == 0
+    assert "全3件中 0件が新規・変更レコード" in capsys.readouterr().out
+    
+    # 変更した1件のみを処理
+    write_csv(tmp_path / "report.csv", REPORT_HEADER + rows.replace("物件A", "物件A2"))
+    assert run_incremental(monkeypatch, report, contract_list, tmp_path / "run1") == 0
+    output = capsys.readouterr().out
+    assert "全3件中 1件が新規・変更レコード" in output
+    assert "状態ストアを更新しました: 出力1件・除外0件" in output
+
+
+def test_delta_without_valid_rows_succeeds(monkeypatch, tmp_path, capsys):
+    """差分がすべて除外された場合も正常終了し、次回は再処理しない"""
+    contract_list = write_csv(tmp_path / "ContractList_20250725.csv", "引継番号\n0200\n")
+    report = write_csv(tmp_path / "report.csv", REPORT_HEADER + "200,佐藤花子,物件B\n300,,物件C\n")
+    
+    assert run_incremental(monkeypatch, report, contract_list, tmp_path / "out") == 0
+    assert run_incremental(monkeypatch, report, contract_list, tmp_path / "out") == 0
+    assert "全2件中 0件が新規・変更レコード" in capsys.readouterr().out
@@ -0,0 +1,89 @@
+"""
+メモリ予算によるチャンク行数の調整（memory_budget）のテスト
+"""
+import pytest
+import memory_budget
+from memory_budget import (AdaptiveChunkSizer, MAX_ADAPTIVE_ROWS, MEMORY_SAFETY_RATIO,
+                           MIN_ADAPTIVE_ROWS, parse_memory_size)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("1GB", 1024 ** 3),
+    ("512MB", 512 * 1024 ** 2),
+    ("2.5G", int(2.5 * 1024 ** 3)),
+    ("64kb", 64 * 1024),
+    (" 1 TB ", 1024 ** 4),
+    ("4096", 4096),
+    ("4096B", 4096),
+])
+def test_parse_memory_size(text, expected):
+    """単位（大文字・小文字、Bの省略）と小数を解釈する"""
+    assert parse_memory_size(text) == expected
+
+
+@pytest.mark.parametrize("text", ["", "GB", "1XB", "-1GB", "0", "0.0001B", "1,024MB"])
+def test_parse_memory_size_rejects_invalid(text):
+    """解釈できない文字列・0バイトになるサイズはエラー"""
+    with pytest.raises(ValueError):
+        parse_memory_size(text)
+
+
+@pytest.fixture
+def sizer(monkeypatch):
+    """使用済みのメモリを0とした10MBの上限のAdaptiveChunkSizer"""
+    monkeypatch.setattr(memory_budget, "get_peak_rss_bytes", lambda: 0)
+    chunk_sizer = AdaptiveChunkSizer(10 * 1024 ** 2, initial_rows=500)
+    chunk_sizer.baseline_bytes = 0
+    return chunk_sizer
+
+
+@pytest.mark.parametrize("bytes_per_row, expected", [
+    (1024, int(10 * 1024 ** 2 * MEMORY_SAFETY_RATIO / 1024)),
+    (1024 ** 2, MIN_ADAPTIVE_ROWS),
+    (0.001, MAX_ADAPTIVE_ROWS),
+    (0, MAX_ADAPTIVE_ROWS),
+])
+def test_adapt_clamps_chunk_size(sizer, bytes_per_row, expected):
+    """メモリ予算から求めた行数を MIN_ADAPTIVE_ROWS〜MAX_ADAPTIVE_ROWS の範囲に収める"""
+    sizer._adapt(bytes_per_row)
+    
+    assert sizer.chunk_size == expected
+    assert sizer.bytes_per_row == bytes_per_row
+
+
+def test_baseline_over_budget_uses_minimum(sizer):
+    """使用済みのメモリが上限を超えている場合は最小の行数で処理する"""
+    sizer.baseline_bytes = 20 * 1024 ** 2
+    sizer._adapt(100)
+    
+    assert sizer.chunk_size == MIN_ADAPTIVE_ROWS
+
+
+def test_measure_only_first_chunk(sizer):
+    """最初のチャンクのみ計測して行数を調整し、以降は計測しない"""
+    with sizer.measure() as record:
+        data = [bytearray(1024) for _ in range(500)]
+        record["rows"] = len(data)
+    first_chunk_size = sizer.chunk_size
+    
+    assert sizer.bytes_per_row >= 1024
+    assert MIN_ADAPTIVE_ROWS <= first_chunk_size < 10 * 1024
+    
+    with sizer.measure() as record:
+        record["rows"] = 1
+    assert sizer.chunk_size == first_chunk_size
+    
+    for rows in (500, first_chunk_size, first_chunk_size, 7):
+        sizer.record(rows)
+    assert sizer.summary()["used_sizes"] == sorted(
+        {500: 1, first_chunk_size: 2, 7: 1}.items(), reverse=True
+    )
+
+
+def test_measure_without_rows_does_not_adapt(sizer):
+    """行数が設定されなかった（入力が終わった）場合は調整しない"""
+    with sizer.measure():
+        pass
+    
+    assert sizer.bytes_per_row is None
+    assert sizer.chunk_size == 500
@@ -0,0 +1,95 @@
+"""
+出力ファイル分割（output_splitter）のテスト
+"""
+import hashlib
+import json
+import os
+import pandas as pd
+import pytest
+from data_exporter import DataExporter
+from error_sink import capture_errors
+from event_log import capture_events
+from output_splitter import iter_parts, write_parts
+from pipeline import run_pipeline
+
+
+@pytest.fixture(scope="module")
+def output_df():
+    """25件の変換済みデータ（物件名の長さを変えて行ごとのバイト数を変える）"""
+    report_df = pd.DataFrame({
+        "契約番号": [100 + i for i in range(25)],
+        "契約元帳: 主契約者": [f"契約者{i}" for i in range(25)],
+        "物件名": ["物件" + "あ" * (i % 7) for i in range(25)]
+    })
+    with capture_errors(), capture_events():
+        return run_pipeline(report_df, set()).output_df
+
+
+def split(tmp_path, df, **limits):
+    """分割出力し、(単一ファイルの出力, マニフェスト, 分割したファイルの内容のリスト) を返す"""
+    exporter = DataExporter()
+    part_paths, manifest_path = exporter.export_to_csv_parts(
+        df, output_path=str(tmp_path / "out.csv"), workers=2, **limits
+    )
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    parts = [open(path, "rb").read() for path in part_paths]
+    return exporter.to_csv_bytes(df), manifest, parts
+
+
+@pytest.mark.parametrize("limits", [{"max_rows": 7}, {"max_bytes": 3000}, {"max_rows": 3, "max_bytes": 2600}])
+def test_parts_concatenate_to_single_file_output(tmp_path, output_df, limits):
+    """ヘッダーを除いて連結した分割ファイルが単一ファイルの出力とバイト単位で一致し、マニフェストが正しい"""
+    single, manifest, parts = split(tmp_path, output_df, **limits)
+    header = DataExporter().header_bytes()
+    
+    assert len(parts) > 1
+    assert all(part.startswith(header) for part in parts)
+    assert header + b"".join(part[len(header):] for part in parts) == single
+    
+    assert manifest["total_rows"] == len(output_df) == 25
+    assert [entry["file"] for entry in manifest["parts"]] == [f"out_{n:02d}.csv" for n in range(1, len(parts) + 1)]
+    first_row = 1
+    for entry, part in zip(manifest["parts"], parts):
+        rows = part.count(b"\r\n") - 1
+        assert entry["rows"] == rows
+        assert (entry["first_row"], entry["last_row"]) == (first_row, first_row + rows - 1)
+        assert entry["bytes"] == len(part) == os.path.getsize(tmp_path / entry["file"])
+        assert entry["sha256"] == hashlib.sha256(part).hexdigest()
+        assert rows <= limits.get("max_rows", rows)
+        assert len(part) <= limits.get("max_bytes", len(part))
+        first_row += rows
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_empty_output_is_single_header_only_part(tmp_path, output_df):
+    """データ行がない場合はヘッダーのみの1ファイルを出力する"""
+    single, manifest, parts = split(tmp_path, output_df.iloc[:0], max_rows=10)
+    
+    assert parts == [single]
+    assert manifest["parts"][0]["rows"] == 0
+    assert manifest["parts"][0]["first_row"] is None
+
+
+def test_parts_are_planned_while_streaming():
+    """ファイルの区切りは行を読みながら決定し、全行を読む前に最初のファイルを返す"""
+    consumed = []
+    
+    def rows():
+        for number in range(100):
+            consumed.append(number)
+            yield b"row%02d\r\n" % number
+    
+    parts = iter_parts(rows(), header_size=10, max_rows=3)
+    
+    assert next(parts) == (0, 3, b"row00\r\nrow01\r\nrow02\r\n")
+    assert len(consumed) == 4
+
+
+def test_oversized_row_removes_written_parts(tmp_path):
+    """上限を超える行があった場合はエラーとし、書き込み済みのファイルを残さない"""
+    rows = [b"a" * 10 + b"\r\n"] * 5 + [b"b" * 100 + b"\r\n"]
+    
+    with pytest.raises(ValueError, match="6行目"):
+        write_parts(str(tmp_path / "out.csv"), b"h\r\n", iter(rows), max_bytes=30, workers=1)
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,113 @@
+"""
+読み込み・変換・書き込みの並行実行（pipelined_executor）のテスト
+"""
+import threading
+import time
+import pytest
+from pipelined_executor import PipelinedExecutor
+
+
+class Source:
+    """読み込んだ件数を記録する入力（fail_atを指定した場合はその位置で失敗）"""
+    
+    def __init__(self, count: int, fail_at=None):
+        self.count = count
+        self.fail_at = fail_at
+        self.consumed = 0
+    
+    def __iter__(self):
+        for number in range(self.count):
+            if number == self.fail_at:
+                raise OSError("読み込みエラー")
+            self.consumed += 1
+            yield number
+
+
+def pipeline_threads_alive() -> bool:
+    """読み込み・受け渡しのスレッドが残っているか"""
+    return any(thread.name.startswith("pipeline-") and thread.is_alive()
+               for thread in threading.enumerate())
+
+
+def test_out_of_order_completion_is_written_in_input_order():
+    """変換の完了順が入力順と異なっても、書き込みは入力と同じ順序で行う"""
+    written = []
+    
+    def process(number):
+        # 先の入力ほど変換に時間がかかる
+        time.sleep((8 - number % 8) * 0.005)
+        return number * 10
+    
+    executor = PipelinedExecutor(queue_size=4, workers=4)
+    
+    assert executor.run(Source(24), process, written.append) == 24
+    assert written == [number * 10 for number in range(24)]
+    assert not pipeline_threads_alive()
+
+
+def test_empty_source_writes_nothing():
+    """入力がない場合は何も書き込まずに終了する"""
+    written = []
+    
+    assert PipelinedExecutor().run(Source(0), lambda number: number, written.append) == 0
+    assert written == []
+
+
+def test_process_error_propagates_and_stops_reader():
+    """変換で発生した例外を呼び出し元に送出し、読み込みを停止する"""
+    source = Source(1000)
+    written = []
+    
+    def process(number):
+        if number == 5:
+            raise ValueError("変換エラー")
+        return number
+    
+    with pytest.raises(ValueError, match="変換エラー"):
+        PipelinedExecutor(queue_size=2, workers=2).run(source, process, written.append)
+    
+    assert written == [0, 1, 2, 3, 4]
+    assert source.consumed < 20
+    assert not pipeline_threads_alive()
+
+
+def test_source_error_propagates_after_earlier_items():
+    """読み込みで発生した例外は、それまでの入力を書き込んだ後に送出する"""
+    written = []
+    
+    with pytest.raises(OSError, match="読み込みエラー"):
+        PipelinedExecutor(queue_size=2, workers=2).run(Source(100, fail_at=7), lambda n: n, written.append)
+    
+    assert written == list(range(7))
+    assert not pipeline_threads_alive()
+
+
+def test_sink_error_propagates_and_stops_reader():
+    """書き込みで発生した例外を送出し、読み込みを停止する"""
+    source = Source(1000)
+    
+    def sink(number):
+        if number == 3:
+            raise RuntimeError("書き込みエラー")
+    
+    with pytest.raises(RuntimeError, match="書き込みエラー"):
+        PipelinedExecutor(queue_size=2, workers=1).run(source, lambda n: n, sink)
+    
+    assert source.consumed < 20
+    assert not pipeline_threads_alive()
+
+
+def test_reader_waits_for_slow_sink():
+    """書き込みが遅い場合、読み込みはキューの上限までしか先行しない（バックプレッシャー）"""
+    source = Source(30)
+    queue_size, workers = 2, 2
+    lead = []
+    
+    def sink(number):
+        time.sleep(0.01)
+        lead.append(source.consumed - (number + 1))
+    
+    PipelinedExecutor(queue_size=queue_size, workers=workers).run(source, lambda n: n, sink)
+    
+    # 入力キュー・結果キューの上限と、読み込み中・受け渡し中の各1件
+    assert max(lead) <= 2 * queue_size + 2
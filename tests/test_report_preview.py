@@ -0,0 +1,60 @@
+"""
+案件取込用レポートのプレビュー読み込みのテスト
+"""
+import pytest
+import data_loader
+from data_loader import DataLoader
+
+
+@pytest.fixture
+def loader():
+    return DataLoader(stability_wait=0)
+
+
+def write_csv(path, text: str):
+    """cp932でCSVを書き込む"""
+    path.write_bytes(text.encode("cp932"))
+    return str(path)
+
+
+def test_head_uses_dtypes_of_leading_rows(loader, tmp_path):
+    """先頭の行のみ読み込んだ場合も、型の推論に使用する範囲の行で列の型を決定する"""
+    report = write_csv(tmp_path / "report.csv",
+                       "契約番号,部屋番号\n100,101\n200,102\n300,A-103\n400,\n")
+    
+    preview_df = loader.load_report_preview(report, head=2)
+    full_df = loader.load_csv(report)
+    
+    assert preview_df.dtypes.to_dict() == full_df.dtypes.to_dict()
+    assert preview_df.equals(full_df.head(2))
+    assert preview_df.attrs["source_rows"] == 4
+    assert preview_df.attrs["source_rows_estimated"] is False
+
+
+def test_head_estimates_row_count_without_reading_whole_file(loader, tmp_path, monkeypatch):
+    """型の推論に使用する範囲を超えるファイルは、全件数をファイルサイズから概算する"""
+    monkeypatch.setattr(data_loader, "PREVIEW_HEAD_SAMPLE_ROWS", 100)
+    rows = "".join(f"{10000 + i},{i % 1000:03d}\n" for i in range(5000))
+    report = write_csv(tmp_path / "report.csv", "契約番号,部屋番号\n" + rows)
+    
+    def fail(*args, **kwargs):
+        raise AssertionError("ファイル全体を走査しています")
+    monkeypatch.setattr(loader, "infer_csv_dtypes", fail)
+    monkeypatch.setattr(loader, "iter_csv_chunks", fail)
+    
+    preview_df = loader.load_report_preview(report, head=10)
+    
+    assert len(preview_df) == 10
+    assert preview_df.attrs["source_rows_estimated"] is True
+    assert abs(preview_df.attrs["source_rows"] - 5000) <= 5000 * 0.05
+
+
+def test_sample_of_header_only_file_is_empty(loader, tmp_path):
+    """データ行がないファイルの無作為抽出は、カラムのみの空のDataFrameを返す"""
+    report = write_csv(tmp_path / "report.csv", "契約番号,部屋番号\n")
+    
+    preview_df = loader.load_report_preview(report, sample=10, seed=0)
+    
+    assert list(preview_df.columns) == ["契約番号", "部屋番号"]
+    assert len(preview_df) == 0
+    assert preview_df.attrs["source_rows"] == 0
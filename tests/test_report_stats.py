@@ -0,0 +1,71 @@
+"""
+処理レポートの統計値（report_stats）のチャンク集計のテスト
+"""
+import pandas as pd
+import pytest
+from data_loader import DataLoader
+from error_sink import capture_errors
+from event_log import capture_events
+from pipeline import PipelineOptions, run_pipeline_stream, merge_validation_summaries, run_pipeline
+from report_stats import ReportStats
+from synthetic_data import SyntheticDataGenerator
+
+
+ROWS = 600
+
+CHUNK_SIZE = 170
+
+
+@pytest.fixture(scope="module")
+def report(tmp_path_factory):
+    """保証人/緊急連絡人・電話番号の移動・部屋番号の抽出を含む合成データ"""
+    path = tmp_path_factory.mktemp("report") / "report.csv"
+    return SyntheticDataGenerator(seed=3).write_report(str(path), ROWS)
+
+
+def convert_whole(report: str):
+    """ファイル全体を一括で変換"""
+    with capture_errors(), capture_events():
+        return run_pipeline(DataLoader().load_csv(report), set(), options=PipelineOptions())
+
+
+def convert_chunks(report: str):
+    """チャンク単位で変換"""
+    chunks = DataLoader().iter_csv_chunks(report, CHUNK_SIZE)
+    with capture_errors(), capture_events():
+        return list(run_pipeline_stream(chunks, set(), options=PipelineOptions()))
+
+
+def test_merged_chunk_stats_equal_whole_file_stats(report):
+    """チャンクごとの集計結果を合算した値は、ファイル全体を集計した値と一致する"""
+    whole_result = convert_whole(report)
+    whole = whole_result.validation_summary["report_stats"]
+    results = convert_chunks(report)
+    merged = merge_validation_summaries(result.validation_summary for result in results)["report_stats"]
+    
+    assert len(results) == -(-ROWS // CHUNK_SIZE)
+    assert merged == whole
+    
+    # 比較が意味を持つよう、各区分に該当するレコードが含まれていることを確認
+    stats = ReportStats(merged)
+    assert stats.rows == len(whole_result.output_df) > 0
+    assert all(stats.roles.values())
+    assert all(stats.transform_counts.values())
+    assert stats.amounts["月額賃料"]["count"] > 0
+    assert 0 < stats.empty_rate("保証人１氏名") < 1
+
+
+def test_merge_equals_from_dataframe_on_concatenated_frame(report):
+    """チャンクごとに from_dataframe した結果の合算は、連結したDataFrameの集計と一致する"""
+    outputs = [result.output_df for result in convert_chunks(report)]
+    merged = ReportStats.merge_all(ReportStats.from_dataframe(df).to_dict() for df in outputs)
+    # 連結すると変換時の件数（attrs）がなくなるため、空欄でないセルはフレームから数え直す
+    concatenated = pd.concat(outputs)
+    concatenated.attrs = {}
+    whole = ReportStats.from_dataframe(concatenated)
+    
+    for key in ("rows", "non_empty", "amounts", "roles"):
+        assert merged.to_dict()[key] == whole.to_dict()[key]
+    for column in whole.report_columns():
+        assert merged.empty_rate(column) == whole.empty_rate(column)
+    assert merged.amount_mean("月額賃料") == whole.amount_mean("月額賃料")
@@ -0,0 +1,99 @@
+"""
+実行結果キャッシュ（run_cache）のテスト
+"""
+import os
+import sys
+import main
+import run_cache
+from run_cache import RunCache
+
+
+REPORT_TEXT = "契約番号,契約元帳: 主契約者,物件名\n100,山田太郎,物件A\n200,佐藤花子,物件B\n"
+
+CACHE_HIT_MESSAGE = "キャッシュを使用しました"
+
+
+def write_csv(path, text: str) -> str:
+    """cp932でCSVを書き込む"""
+    path.write_bytes(text.encode("cp932"))
+    return str(path)
+
+
+def run_main(monkeypatch, tmp_path, *options) -> int:
+    """キャッシュを有効にしてCLIを実行して終了コードを返す"""
+    monkeypatch.setattr(sys, "argv", [
+        "main.py", "--report", str(tmp_path / "report.csv"),
+        "--contract-list", str(tmp_path / "ContractList_20250725.csv"),
+        "--output-dir", str(tmp_path / "out"), "--output", str(tmp_path / "out" / "out.csv"),
+        "--skip-report", *options
+    ])
+    return main.main()
+
+
+def test_rerun_hits_cache_until_input_or_option_changes(monkeypatch, tmp_path, capsys):
+    """同一の入力・オプションでの再実行はキャッシュから復元し、1バイトの変更やオプションの変更で再計算する"""
+    write_csv(tmp_path / "ContractList_20250725.csv", "引継番号\n0200\n")
+    write_csv(tmp_path / "report.csv", REPORT_TEXT)
+    output = tmp_path / "out" / "out.csv"
+    
+    assert run_main(monkeypatch, tmp_path) == 0
+    assert CACHE_HIT_MESSAGE not in capsys.readouterr().out
+    expected = output.read_bytes()
+    
+    output.unlink()
+    assert run_main(monkeypatch, tmp_path) == 0
+    assert CACHE_HIT_MESSAGE in capsys.readouterr().out
+    assert output.read_bytes() == expected
+    
+    write_csv(tmp_path / "report.csv", REPORT_TEXT.replace("物件A", "物件B"))
+    assert run_main(monkeypatch, tmp_path) == 0
+    assert CACHE_HIT_MESSAGE not in capsys.readouterr().out
+    
+    assert run_main(monkeypatch, tmp_path, "--unencodable", "reject") == 0
+    assert CACHE_HIT_MESSAGE not in capsys.readouterr().out
+
+
+def test_key_changes_with_one_input_byte_or_option(tmp_path):
+    """キャッシュキーは入力ファイルの1バイトの変更・オプションの変更で変わる"""
+    cache = RunCache(str(tmp_path / "cache"))
+    report = write_csv(tmp_path / "report.csv", REPORT_TEXT)
+    key = cache.compute_key([report], {"unencodable": "substitute"})
+    
+    assert cache.compute_key([report], {"unencodable": "substitute"}) == key
+    assert cache.compute_key([report], {"unencodable": "question"}) != key
+    
+    with open(report, "r+b") as f:
+        f.seek(len(REPORT_TEXT.encode("cp932")) - 2)
+        f.write(b"C")
+    assert cache.compute_key([report], {"unencodable": "substitute"}) != key
+
+
+def test_corrupted_entry_is_not_restored(tmp_path):
+    """保存後に出力が変更されたエントリは復元しない"""
+    cache = RunCache(str(tmp_path / "cache"))
+    output = write_csv(tmp_path / "out.csv", REPORT_TEXT)
+    cache.store("key", output, [])
+    write_csv(tmp_path / "cache" / "key" / "output.csv", "壊れたファイル\n")
+    
+    assert not cache.restore("key", str(tmp_path / "restored.csv"))
+    assert not (tmp_path / "restored.csv").exists()
+
+
+def test_prune_keeps_most_recently_used_entries(tmp_path, monkeypatch):
+    """保持件数を超えたエントリは、最後に保存・復元した日時が古いものから削除する"""
+    monkeypatch.setattr(run_cache, "MAX_CACHE_ENTRIES", 3)
+    cache = RunCache(str(tmp_path / "cache"))
+    output = write_csv(tmp_path / "out.csv", REPORT_TEXT)
+    
+    def store(key: str, mtime: float):
+        cache.store(key, output, [])
+        os.utime(tmp_path / "cache" / key, (mtime, mtime))
+    
+    for number in range(3):
+        store(f"key{number}", 1_000_000 + number)
+    # 最も古いkey0を復元すると最近使用したエントリとして残る
+    assert cache.restore("key0", str(tmp_path / "restored.csv"))
+    store("key3", 2_000_000_000)
+    store("key4", 2_000_000_001)
+    
+    assert sorted(os.listdir(tmp_path / "cache")) == ["key0", "key3", "key4"]
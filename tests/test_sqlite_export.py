@@ -0,0 +1,90 @@
+"""
+SQLite出力（sqlite_export）のテスト
+"""
+import csv
+import io
+import sqlite3
+import pandas as pd
+import pytest
+from data_exporter import DataExporter
+from error_sink import capture_errors
+from event_log import capture_events
+from pipeline import run_pipeline
+from sqlite_export import SqliteExporter, get_column_names
+
+
+def convert(count: int, offset: int = 0) -> pd.DataFrame:
+    """count件の変換済みデータを作成"""
+    report_df = pd.DataFrame({
+        "契約番号": [100 + offset + i for i in range(count)],
+        "契約元帳: 主契約者": [f"契約者{offset + i}" for i in range(count)],
+        "物件名": [f"物件{offset + i}" for i in range(count)]
+    })
+    with capture_errors(), capture_events():
+        return run_pipeline(report_df, set()).output_df
+
+
+def test_column_names_for_blank_duplicate_and_reserved_headers():
+    """空欄・重複・予約済みのヘッダーを一意なカラム名に変換する（大文字・小文字は区別しない）"""
+    headers = ["引継番号", "", "電話", "電話", " ", "run_id", "電話_2", "Name", "name"]
+    
+    assert get_column_names(headers) == [
+        "引継番号", "列2", "電話", "電話_2", "列5", "run_id_2", "電話_2_2", "Name", "name_2"
+    ]
+
+
+def test_schema_has_primary_key_index_and_header_mapping(tmp_path):
+    """(run_id, row_number)の主キー・引継番号のインデックス・元のヘッダーの対応表を作成する"""
+    headers = ["引継番号", "", "電話", "電話"]
+    exporter = SqliteExporter(str(tmp_path / "export.sqlite3"), headers)
+    try:
+        conn = exporter.conn
+        table_info = conn.execute("PRAGMA table_info(registrations)").fetchall()
+        assert [(row[1], row[5]) for row in table_info] == [
+            ("run_id", 1), ("row_number", 2), ("引継番号", 0), ("列2", 0), ("電話", 0), ("電話_2", 0)
+        ]
+        indexes = conn.execute("PRAGMA index_list(registrations)").fetchall()
+        index_columns = {
+            row[1]: [column[2] for column in conn.execute(f"PRAGMA index_info('{row[1]}')")]
+            for row in indexes
+        }
+        assert index_columns["idx_registrations_contract"] == ["引継番号"]
+        assert conn.execute("SELECT position, column_name, header FROM export_columns ORDER BY position"
+                            ).fetchall() == [(1, "引継番号", "引継番号"), (2, "列2", ""), (3, "電話", "電話"),
+                                             (4, "電話_2", "電話")]
+    finally:
+        exporter.close()
+    
+    with pytest.raises(ValueError):
+        SqliteExporter(str(tmp_path / "export.sqlite3"), ["引継番号", "別のカラム"])
+
+
+def test_two_runs_are_kept_and_match_csv(tmp_path):
+    """2回の出力を実行IDごとに保持し、各行の値はCSVと一致する（同じ実行IDの再出力は置き換え）"""
+    db_path = str(tmp_path / "export.sqlite3")
+    exporter = DataExporter()
+    first_df, second_df = convert(3), convert(2, offset=50)
+    
+    exporter.export_to_sqlite(first_df, db_path, run_id="run1", output_filename="first.csv")
+    exporter.export_to_sqlite(second_df, db_path, run_id="run2", output_filename="second.csv")
+    exporter.export_to_sqlite(second_df, db_path, run_id="run2", output_filename="second.csv")
+    
+    conn = sqlite3.connect(db_path)
+    try:
+        assert conn.execute("SELECT run_id, output_filename, row_count FROM export_runs ORDER BY run_id"
+                            ).fetchall() == [("run1", "first.csv", 3), ("run2", "second.csv", 2)]
+        for run_id, df in (("run1", first_df), ("run2", second_df)):
+            rows = conn.execute(
+                "SELECT * FROM registrations WHERE run_id = ? ORDER BY row_number", (run_id,)
+            ).fetchall()
+            csv_rows = list(csv.reader(io.StringIO(exporter.to_csv_bytes(df).decode("cp932"))))[1:]
+            assert [row[1] for row in rows] == list(range(1, len(df) + 1))
+            assert [list(row[2:]) for row in rows] == csv_rows
+        
+        contract_number = first_df["引継番号"].iat[1]
+        assert conn.execute(
+            'SELECT run_id, row_number FROM registrations WHERE "引継番号" = ?',
+            (contract_number,)
+        ).fetchall() == [("run1", 2)]
+    finally:
+        conn.close()
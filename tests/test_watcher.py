@@ -0,0 +1,99 @@
+"""
+フォルダ監視（watcher）のテスト
+"""
+import os
+import pytest
+from watcher import FolderWatcher
+
+
+REPORT_TEXT = "契約番号,契約元帳: 主契約者,物件名\n100,山田太郎,物件A\n"
+
+
+def write_csv(path, text: str, mtime: float) -> str:
+    """cp932でCSVを書き込み、更新時刻を設定する"""
+    path.write_bytes(text.encode("cp932"))
+    os.utime(path, (mtime, mtime))
+    return str(path)
+
+
+@pytest.fixture
+def watcher(tmp_path):
+    """ContractListを配置した監視ディレクトリで監視を準備する"""
+    watch_dir = tmp_path / "watch"
+    watch_dir.mkdir()
+    write_csv(watch_dir / "ContractList_20250725.csv", "引継番号\n0200\n", 1_000_000.0)
+    
+    folder_watcher = FolderWatcher(
+        str(watch_dir), ["report_*.csv"], str(tmp_path / "output"),
+        skip_report=True, refresh_interval=3600.0
+    )
+    folder_watcher.warm_up()
+    yield folder_watcher
+    folder_watcher.contract_index.stop_refresh()
+
+
+def test_report_is_processed_after_size_and_mtime_are_stable(watcher, tmp_path):
+    """書き込み中（サイズ・更新時刻が変化中）のレポートは処理せず、変化しなくなった時点で処理する"""
+    report = tmp_path / "watch" / "report_A.csv"
+    write_csv(report, REPORT_TEXT[:20], 2_000_000.0)
+    assert watcher.poll_once() == []
+    
+    write_csv(report, REPORT_TEXT, 2_000_001.0)
+    assert watcher.poll_once() == []
+    
+    assert watcher.poll_once() == [str(report)]
+    assert os.listdir(tmp_path / "output" / "report_A")
+    assert watcher.poll_once() == []
+
+
+def test_empty_report_is_not_processed(watcher, tmp_path):
+    """0バイトのファイルは書き込み前とみなして処理しない"""
+    write_csv(tmp_path / "watch" / "report_A.csv", "", 2_000_000.0)
+    assert watcher.poll_once() == []
+    assert watcher.poll_once() == []
+
+
+def test_overwritten_report_is_reprocessed(watcher, tmp_path):
+    """処理済みのレポートが上書きされた場合は、書き込み完了後に再処理する"""
+    report = tmp_path / "watch" / "report_A.csv"
+    write_csv(report, REPORT_TEXT, 2_000_000.0)
+    watcher.poll_once()
+    assert watcher.poll_once() == [str(report)]
+    
+    write_csv(report, REPORT_TEXT + "200,佐藤花子,物件B\n", 2_000_010.0)
+    assert watcher.poll_once() == []
+    assert watcher.poll_once() == [str(report)]
+    assert watcher.poll_once() == []
+
+
+def test_existing_reports_are_skipped_until_changed(tmp_path):
+    """起動時に存在するレポートは処理せず、更新された場合のみ処理する"""
+    watch_dir = tmp_path / "watch"
+    watch_dir.mkdir()
+    write_csv(watch_dir / "ContractList_20250725.csv", "引継番号\n0200\n", 1_000_000.0)
+    report = watch_dir / "report_A.csv"
+    write_csv(report, REPORT_TEXT, 2_000_000.0)
+    
+    folder_watcher = FolderWatcher(str(watch_dir), ["report_*.csv"], str(tmp_path / "output"),
+                                   skip_report=True, refresh_interval=3600.0)
+    folder_watcher.warm_up()
+    try:
+        assert folder_watcher.poll_once() == []
+        assert folder_watcher.poll_once() == []
+        
+        write_csv(report, REPORT_TEXT, 2_000_010.0)
+        folder_watcher.poll_once()
+        assert folder_watcher.poll_once() == [str(report)]
+    finally:
+        folder_watcher.contract_index.stop_refresh()
+
+
+def test_poll_does_not_load_contract_lists(watcher, tmp_path):
+    """新しいContractListはpoll_onceでは読み込まず、定期更新のスレッドに任せる"""
+    write_csv(tmp_path / "watch" / "ContractList_20250726.csv", "引継番号\n0300\n", 1_000_000.0)
+    watcher.poll_once()
+    watcher.poll_once()
+    assert watcher.contract_index.keys == frozenset({"0200"})
+    
+    watcher.contract_index.refresh()
+    assert watcher.contract_index.keys == frozenset({"0200", "0300"})
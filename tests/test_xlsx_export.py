@@ -0,0 +1,64 @@
+"""
+Excel出力（xlsx_export）のテスト
+"""
+import zipfile
+import xml.etree.ElementTree as ET
+import pandas as pd
+import pytest
+from xlsx_export import XlsxWriter
+
+pytest.importorskip("xlsxwriter")
+
+
+NAMESPACE = {"main": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+
+
+def read_cells(path: str):
+    """ブックの最初のシートのセルを (値, 型) の行のリストで読み込む"""
+    with zipfile.ZipFile(path) as book:
+        shared = []
+        if "xl/sharedStrings.xml" in book.namelist():
+            root = ET.fromstring(book.read("xl/sharedStrings.xml"))
+            shared = ["".join(node.itertext()) for node in root.findall("main:si", NAMESPACE)]
+        sheet = ET.fromstring(book.read("xl/worksheets/sheet1.xml"))
+    
+    rows = []
+    for row in sheet.iter(f"{{{NAMESPACE['main']}}}row"):
+        cells = []
+        for cell in row.findall("main:c", NAMESPACE):
+            cell_type = cell.get("t")
+            if cell_type == "s":
+                value = shared[int(cell.find("main:v", NAMESPACE).text)]
+            elif cell_type == "inlineStr":
+                value = "".join(cell.find("main:is", NAMESPACE).itertext())
+            else:
+                value = cell.find("main:v", NAMESPACE).text
+            cells.append((value, cell_type))
+        rows.append(cells)
+    return rows
+
+
+def test_leading_zero_numbers_are_written_as_text(tmp_path):
+    """先頭が0の引継番号・電話番号や数値も、数値に変換されず文字列のセルとして書き込まれる"""
+    headers = ["引継番号", "電話番号", "賃料", "備考"]
+    df = pd.DataFrame({
+        "引継番号": ["0100", "0200"],
+        "電話番号": ["090-1111-2222", "0312345678"],
+        "賃料": [50000, 0],
+        "備考": ["=SUM(A1)", "𠮷田"]
+    })
+    output = tmp_path / "out.xlsx"
+    
+    writer = XlsxWriter(str(output), headers)
+    try:
+        assert writer.write(df) == 2
+    finally:
+        writer.close()
+    
+    rows = read_cells(str(output))
+    assert [[value for value, _ in row] for row in rows] == [
+        headers,
+        ["0100", "090-1111-2222", "50000", "=SUM(A1)"],
+        ["0200", "0312345678", "0", "𠮷田"]
+    ]
+    assert all(cell_type in ("s", "inlineStr") for row in rows for _, cell_type in row)